@@ -0,0 +1,71 @@
+/**
+ * Contract test for databases built with build-db.ts --compress.
+ *
+ * Opens a plain and a compressed build of the same seeds through the
+ * server's driver, @ansvar/mcp-sqlite, and checks that the search and
+ * provision tools answer the same on both: searching the compressed one
+ * needs provision_text() registered on that driver's connection.
+ */
+
+import { describe, it, expect, beforeAll, afterAll } from 'vitest';
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import Database from '@ansvar/mcp-sqlite';
+
+import { buildDatabase } from '../../scripts/build-db.js';
+import { searchLegislation } from '../../src/tools/search-legislation.js';
+import { getProvision, type ProvisionResult } from '../../src/tools/get-provision.js';
+
+const PROVISIONS = [
+  { article: '1', title: 'Статья 1. Сфера действия', content: 'Настоящий закон регулирует обработку персональных данных.' },
+  { article: '2', title: 'Статья 2. Цель', content: 'Целью закона является защита прав субъекта персональных данных.' },
+  { article: '3', title: 'Статья 3. Сроки', content: 'Оператор хранит персональные данные не дольше, чем требуют цели обработки.' },
+];
+
+let root: string;
+let plain: InstanceType<typeof Database>;
+let compressed: InstanceType<typeof Database>;
+
+beforeAll(() => {
+  root = fs.mkdtempSync(path.join(os.tmpdir(), 'compressed-database-'));
+  const seedDir = path.join(root, 'seed');
+  fs.mkdirSync(seedDir);
+  fs.writeFileSync(path.join(seedDir, 'fz-152-2006.json'), JSON.stringify({
+    law: { id: 'fz-152-2006', title: 'О персональных данных', identifier: '152-ФЗ', law_type: 'federal_law' },
+    provisions: PROVISIONS.map(p => ({ ...p, provision_ref: p.article })),
+  }));
+  const paths = (dbPath: string) => ({
+    seedDir,
+    dbPath: path.join(root, dbPath),
+    censusPath: path.join(root, 'census.json'),
+    censusDbPath: path.join(root, 'census.sqlite'),
+  });
+  buildDatabase(false, paths('plain.db'));
+  buildDatabase(true, paths('compressed.db'));
+  plain = new Database(path.join(root, 'plain.db'), { readonly: true });
+  compressed = new Database(path.join(root, 'compressed.db'), { readonly: true });
+});
+
+afterAll(() => {
+  plain.close();
+  compressed.close();
+  fs.rmSync(root, { recursive: true, force: true });
+});
+
+describe('a --compress database opened with @ansvar/mcp-sqlite', () => {
+  it('answers search_legislation with the rows and snippets of the plain build', async () => {
+    for (const query of ['персональных данных', 'оператор', 'сроки хранения']) {
+      const expected = (await searchLegislation(plain, { query })).results;
+      expect(expected.length).toBeGreaterThan(0);
+      expect((await searchLegislation(compressed, { query })).results).toEqual(expected);
+    }
+  });
+
+  it('answers get_provision with the plain text', async () => {
+    const result = (await getProvision(compressed, { document_id: 'fz-152-2006', section: '3' })).results as ProvisionResult;
+    expect(result.content).toBe(PROVISIONS[2].content);
+    expect((await getProvision(compressed, { document_id: 'fz-152-2006' })).results)
+      .toEqual((await getProvision(plain, { document_id: 'fz-152-2006' })).results);
+  });
+});
@@ -0,0 +1,118 @@
+"""Shared fixtures for the RusLawOD ingester tests (scripts/ingest-ruslawod.py)."""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+SCRIPT_PATH = Path(__file__).resolve().parents[2] / "scripts" / "ingest-ruslawod.py"
+
+PARQUET_COLUMNS = [
+    "pravogovruNd", "doc_typeIPS", "headingIPS", "docNumberIPS",
+    "docdateIPS", "statusIPS", "issuedByIPS", "textIPS",
+]
+
+
+def load_ingester():
+    spec = importlib.util.spec_from_file_location("ingest_ruslawod", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["ingest_ruslawod"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def ingest():
+    return load_ingester()
+
+
+@pytest.fixture
+def seed_dir(ingest, tmp_path, monkeypatch):
+    path = tmp_path / "seed"
+    path.mkdir()
+    monkeypatch.setattr(ingest, "SEED_DIR", path)
+    return path
+
+
+def article_text(articles: int, paragraphs: int = 3) -> str:
+    lines = ["ФЕДЕРАЛЬНЫЙ ЗАКОН", "", "Глава 1. Общие положения", ""]
+    for n in range(1, articles + 1):
+        lines.append(f'Статья {n}. Предмет регулирования <ref nd="1020{n:05d}">статьи</ref> {n}')
+        for p in range(1, paragraphs + 1):
+            lines.append(f"{p}. Настоящая статья устанавливает  правило {p}   для статьи {n}.")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def write_parquet(path: Path, rows: list[tuple]) -> str:
+    import duckdb
+
+    con = duckdb.connect()
+    placeholders = ", ".join(f"${i + 1}" for i in range(len(PARQUET_COLUMNS)))
+    columns = ", ".join(f"{c} VARCHAR" for c in PARQUET_COLUMNS)
+    con.execute(f"CREATE TABLE docs ({columns})")
+    con.executemany(f"INSERT INTO docs VALUES ({placeholders})", rows)
+    con.execute(f"COPY docs TO '{path}' (FORMAT parquet)")
+    con.close()
+    return str(path)
+
+
+@pytest.fixture
+def sample_parquet(tmp_path):
+    rows = [
+        (f"10200{i:04d}", "Федеральный закон", f"О предмете {i}", f"{i}-ФЗ",
+         "01.02.2010", "Действует", "Федеральный закон", article_text(5 + i % 7))
+        for i in range(1, 41)
+    ]
+    rows += [
+        ("102009999", "Постановление", "Не федеральный акт", "12", "01.01.2011", "", "Правительство", "текст"),
+        ("102009998", "Кодекс", "Налоговый кодекс Российской Федерации (часть вторая)", "117-ФЗ",
+         "05.08.2000", "С изменениями", "Федеральный закон", article_text(60, 8)),
+        ("102009997", "nan", "Короткий документ", "", "", "", "Указ", "коротко"),
+    ]
+    return write_parquet(tmp_path / "ruslawod_01.parquet", rows)
+
+
+@pytest.fixture
+def mirror_dir(tmp_path):
+    """A local mirror with all 11 ruslawod_NN.parquet files."""
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    for batch in range(1, 12):
+        rows = [
+            (f"1020{batch:02d}{i:03d}", "Федеральный закон", f"О предмете {batch}.{i}", f"{batch * 100 + i}-ФЗ",
+             "01.02.2010", "Действует", "Федеральный закон", article_text(3 + (batch * i) % 9))
+            for i in range(1, 6 + batch)
+        ]
+        # Same law id from two different files resolves to an nd-suffixed id
+        rows.append((f"1029{batch:02d}000", "Федеральный закон", "Повтор", "1-ФЗ",
+                     "01.01.2001", "", "Федеральный закон", article_text(2)))
+        write_parquet(mirror / f"ruslawod_{batch:02d}.parquet", rows)
+    return mirror
+
+
+@pytest.fixture
+def run_main(ingest, seed_dir, tmp_path, monkeypatch):
+    """Run ingest main() with the given CLI args; returns the census dict."""
+    census_path = tmp_path / "census.json"
+    monkeypatch.setattr(ingest, "CENSUS_PATH", census_path)
+
+    def run(*args: str) -> dict:
+        monkeypatch.setattr(sys, "argv", ["ingest-ruslawod.py", *args])
+        ingest.main()
+        return json.loads(census_path.read_text(encoding="utf-8"))
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def bench(ingest):
+    spec = importlib.util.spec_from_file_location("bench_ruslawod", SCRIPT_PATH.with_name("bench-ruslawod.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,1167 @@
+"""Tests for scripts/ingest-ruslawod.py."""
+
+import hashlib
+import json
+import random
+import re
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+import pytest
+
+from conftest import article_text, write_parquet
+
+
+def read_seeds(seed_dir):
+    return {p.name: p.read_bytes() for p in sorted(seed_dir.glob("*.json"))}
+
+
+def test_worker_pool_matches_serial_output(ingest, seed_dir, sample_parquet, monkeypatch):
+    con = duckdb.connect()
+    serial = ingest.ingest_batch(con, sample_parquet, census_only=False)
+    serial_seeds = read_seeds(seed_dir)
+    for path in seed_dir.glob("*.json"):
+        path.unlink()
+
+    # Small chunks force several chunks in flight and out-of-order completion.
+    monkeypatch.setattr(ingest, "RENDER_CHUNK_DOCS", 3)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        parallel = ingest.ingest_batch(con, sample_parquet, census_only=False, pool=pool, max_in_flight=4)
+
+    assert parallel == serial
+    assert read_seeds(seed_dir) == serial_seeds
+    assert serial[1] == 41
+
+
+def test_prefetched_scan_matches_serial_output(ingest, seed_dir, sample_parquet):
+    con = duckdb.connect()
+    serial = ingest.ingest_batch(con, sample_parquet, census_only=False, fetch_batch_size=5)
+    serial_seeds = read_seeds(seed_dir)
+    for path in seed_dir.glob("*.json"):
+        path.unlink()
+
+    slot = threading.Semaphore(1)
+    prefetched = ingest.ingest_batch(con, sample_parquet, census_only=False, fetch_batch_size=5,
+                                     prefetch=2, slot=slot)
+    assert prefetched == serial
+    assert read_seeds(seed_dir) == serial_seeds
+    assert slot.acquire(blocking=False)  # released again
+    assert not list(seed_dir.glob("*.tmp"))
+
+
+def test_prefetcher_reads_ahead_in_order(ingest):
+    read = []
+
+    def source(n):
+        try:
+            for i in range(n):
+                read.append(i)
+                yield i
+        finally:
+            read.append("closed")
+
+    with ingest.Prefetcher(source(10), depth=3) as prefetcher:
+        deadline = time.time() + 5
+        while len(read) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        assert read[:3] == [0, 1, 2]  # read before anything was consumed
+        assert list(prefetcher) == list(range(10))
+    assert read[-1] == "closed"
+
+    # Giving up early stops the reading thread and closes the source
+    read.clear()
+    prefetcher = ingest.Prefetcher(source(1000), depth=2)
+    assert next(iter(prefetcher)) == 0
+    prefetcher.close()
+    assert not prefetcher.thread.is_alive()
+    assert read[-1] == "closed" and len(read) < 10
+
+    def failing():
+        yield 1
+        raise OSError("connection reset")
+
+    with ingest.Prefetcher(failing(), depth=4) as prefetcher:
+        items = iter(prefetcher)
+        assert next(items) == 1
+        with pytest.raises(OSError, match="connection reset"):
+            next(items)
+
+
+def test_seed_writer_writes_atomically_in_order(ingest, tmp_path):
+    calls = []
+    with ingest.SeedWriter() as writer:
+        for i in range(100):
+            writer.submit(ingest.write_seed_file, tmp_path / f"{i}.json", json.dumps({"n": i}))
+            writer.submit(calls.append, i)
+    assert calls == list(range(100))
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(f"{i}.json" for i in range(100))
+
+    writer = ingest.SeedWriter()
+    writer.submit(ingest.write_seed_file, tmp_path / "missing" / "x.json", "{}")
+    writer.submit(calls.append, "after the error")
+    with pytest.raises(FileNotFoundError):
+        writer.close()
+    assert calls[-1] == 99
+    with pytest.raises(FileNotFoundError):
+        writer.submit(calls.append, "rejected")
+
+
+def test_render_seeds_preserves_input_order(ingest, monkeypatch):
+    monkeypatch.setattr(ingest, "RENDER_CHUNK_DOCS", 2)
+    docs = [(i, {"id": f"law-{i}", "title": f"Закон {i}", "source_url": ""}, f"Статья 1. Текст {i}\n" * 40)
+            for i in range(11)]
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        rendered = [(key, law["id"]) for key, law, _ in ingest.render_seeds(iter(docs), pool, max_in_flight=2)]
+    assert rendered == [(key, law["id"]) for key, law, _ in docs]
+
+
+def test_fetch_batch_size_does_not_change_output(ingest, seed_dir, sample_parquet):
+    con = duckdb.connect()
+    whole = ingest.ingest_batch(con, sample_parquet, census_only=False, fetch_batch_size=10_000)
+    whole_seeds = read_seeds(seed_dir)
+    for path in seed_dir.glob("*.json"):
+        path.unlink()
+
+    streamed = ingest.ingest_batch(con, sample_parquet, census_only=False, fetch_batch_size=3)
+
+    assert streamed == whole
+    assert read_seeds(seed_dir) == whole_seeds
+    assert (ingest.ingest_batch(con, sample_parquet, census_only=True, fetch_batch_size=3)
+            == ingest.ingest_batch(con, sample_parquet, census_only=True, fetch_batch_size=10_000))
+
+
+def test_concurrent_mirror_ingest_merges_in_file_order(seed_dir, mirror_dir, run_main):
+    sequential = run_main("--source", str(mirror_dir), "--prefetch", "0")
+    sequential_seeds = read_seeds(seed_dir)
+    for path in seed_dir.glob("*.json"):
+        path.unlink()
+
+    concurrent = run_main("--source", str(mirror_dir), "--concurrency", "4")
+
+    assert concurrent["laws"] == sequential["laws"]
+    assert concurrent["stats"] == sequential["stats"]
+    assert concurrent["stats"]["total"] == sum(6 + b for b in range(1, 12))
+    assert concurrent["stats"]["id_collisions"] == 10
+    assert sorted(read_seeds(seed_dir)) == sorted(sequential_seeds)
+
+
+def test_manifest_skips_unchanged_documents(ingest, seed_dir, mirror_dir, run_main, monkeypatch):
+    first = run_main("--source", str(mirror_dir), "--batch", "2")
+    manifest = json.loads((seed_dir / "_manifest.json").read_text(encoding="utf-8"))["documents"]
+    assert len(manifest) == len(first["laws"])
+
+    rendered = []
+    render_seed = ingest.render_seed
+    monkeypatch.setattr(ingest, "render_seed", lambda law, text: rendered.append(law["id"]) or render_seed(law, text))
+
+    second = run_main("--source", str(mirror_dir), "--batch", "2")
+    assert rendered == []
+    assert second["ingestion"]["total_provisions"] == first["ingestion"]["total_provisions"]
+
+    # Change the text of one document: only that one is parsed again
+    rows = duckdb.connect().execute(
+        f"SELECT * FROM read_parquet('{mirror_dir / 'ruslawod_02.parquet'}')").fetchall()
+    nd = rows[0][0]
+    rows[0] = rows[0][:7] + (rows[0][7] + "\nСтатья 99. Новая статья\nНовый текст.",)
+    write_parquet(mirror_dir / "ruslawod_02.parquet", rows)
+
+    run_main("--source", str(mirror_dir), "--batch", "2")
+    assert rendered == [manifest[nd]["law_id"]]
+    updated = json.loads((seed_dir / "_manifest.json").read_text(encoding="utf-8"))["documents"]
+    assert updated[nd]["provisions"] == manifest[nd]["provisions"] + 1
+    assert updated[nd]["text_sha256"] != manifest[nd]["text_sha256"]
+
+
+@pytest.mark.parametrize("seed_format", ["files", "shards"])
+def test_resume_reruns_only_failed_files(ingest, seed_dir, mirror_dir, run_main, monkeypatch, seed_format):
+    args = ("--source", str(mirror_dir), "--concurrency", "3", "--seed-format", seed_format, "--seed-codec", "gzip")
+    expected = run_main(*args)
+    for path in seed_dir.iterdir():
+        shutil.rmtree(path) if path.is_dir() else path.unlink()
+    ingest.CENSUS_PATH.unlink()
+
+    ingested = []
+    ingest_batch = ingest.ingest_batch
+
+    def flaky(con, parquet_url, census_only, **kwargs):
+        name = parquet_url.split("/")[-1]
+        if not census_only:
+            ingested.append(name)
+            if name in broken:
+                raise OSError(f"connection reset reading {name}")
+        return ingest_batch(con, parquet_url, census_only, **kwargs)
+
+    monkeypatch.setattr(ingest, "ingest_batch", flaky)
+    broken = {"ruslawod_03.parquet", "ruslawod_09.parquet"}
+    with pytest.raises(SystemExit) as exit_info:
+        run_main(*args)
+    assert exit_info.value.code == 1
+    assert not ingest.CENSUS_PATH.exists()
+    checkpoints = sorted((seed_dir / "_checkpoints").glob("ruslawod_*.json"))
+    assert len(checkpoints) == 11
+    assert sum(json.loads(p.read_text(encoding="utf-8"))["result"] is None for p in checkpoints) == 2
+
+    # Options must match the failed run
+    with pytest.raises(SystemExit) as exit_info:
+        run_main(*args, "--two-phase", "--resume")
+    assert exit_info.value.code == 2
+
+    broken = set()
+    ingested.clear()
+    if seed_format == "files":
+        # A seed lost since the failed run: that file is ingested again as well
+        (seed_dir / f"{expected['laws'][0]['id']}.json").unlink()
+    resumed = run_main(*args, "--resume")
+    rerun = {"ruslawod_03.parquet", "ruslawod_09.parquet"}
+    if seed_format == "files":
+        rerun.add("ruslawod_01.parquet")
+    assert sorted(ingested) == sorted(rerun)
+    assert resumed["laws"] == expected["laws"]
+    assert resumed["stats"] == expected["stats"]
+    assert resumed["ingestion"]["total_provisions"] == expected["ingestion"]["total_provisions"]
+    assert not (seed_dir / "_checkpoints").exists()
+    if seed_format == "shards":
+        seeds = {seed["law"]["id"] for seed in ingest.read_shard_seeds(seed_dir / "_shards")}
+    else:
+        seeds = {p.stem for p in seed_dir.glob("*.json") if not p.name.startswith("_")}
+    assert seeds == {entry["id"] for entry in expected["laws"]}
+    # One change set covers the laws of both attempts
+    assert [p.name for p in (seed_dir / "_changes").iterdir()] == ["000001.json"]
+    change_set = json.loads((seed_dir / "_changes" / "000001.json").read_text(encoding="utf-8"))
+    assert [law["id"] for law in change_set["added"]] == sorted(seeds)
+
+
+@pytest.mark.parametrize("seed_format", ["files", "shards"])
+def test_change_sets_list_added_changed_and_removed_laws(ingest, seed_dir, mirror_dir, run_main, seed_format):
+    args = ("--source", str(mirror_dir), "--seed-format", seed_format, "--seed-codec", "gzip")
+    first = run_main(*args)
+    changes_dir = seed_dir / "_changes"
+    initial = json.loads((changes_dir / "000001.json").read_text(encoding="utf-8"))
+    assert [law["id"] for law in initial["added"]] == sorted(e["id"] for e in first["laws"])
+    assert initial["changed"] == initial["removed"] == []
+
+    # Nothing changed: no change set
+    run_main(*args)
+    assert [p.name for p in changes_dir.iterdir()] == ["000001.json"]
+
+    rows = [(f"102002{i:03d}", "Федеральный закон", f"О предмете 2.{i}", f"{200 + i}-ФЗ", "01.02.2010", "Действует",
+             "Федеральный закон", article_text(3 + (2 * i) % 9)) for i in range(1, 8)]
+    rows.append(("102902000", "Федеральный закон", "Повтор", "1-ФЗ", "01.01.2001", "", "Федеральный закон",
+                 article_text(2)))
+    rows[0] = rows[0][:7] + (article_text(4, 5),)                # changed text
+    del rows[1]                                                  # removed
+    rows.append(("102002099", "Федеральный закон", "О новом", "299-ФЗ", "01.02.2011", "Действует",
+                 "Федеральный закон", article_text(2)))          # added
+    write_parquet(mirror_dir / "ruslawod_02.parquet", rows)
+    second = run_main(*args)
+    ids = {e["nd"]: e["id"] for e in first["laws"] + second["laws"]}
+
+    change_set = json.loads((changes_dir / "000002.json").read_text(encoding="utf-8"))
+    assert change_set["version"] == 1 and change_set["sequence"] == 2
+    assert [law["id"] for law in change_set["added"]] == [ids["102002099"]]
+    assert [law["id"] for law in change_set["changed"]] == [ids["102002001"]]
+    assert change_set["removed"] == [{"id": ids["102002002"], "nd": "102002002"}]
+
+    changed = change_set["changed"][0]
+    shard_index = ingest.load_shard_index(seed_dir / "_shards") if seed_format == "shards" else None
+    seed = ingest.read_seed(seed_dir, changed["id"], shard_index)
+    assert changed["provisions"] == [
+        {"article": p["article"], "part": None, "paragraph": None,
+         "content_sha256": hashlib.sha256(p["content"].encode("utf-8")).hexdigest()}
+        for p in seed["provisions"]
+    ]
+    manifest = ingest.load_manifest(seed_dir / ingest.MANIFEST_NAME)
+    assert changed["seed_sha256"] == manifest["102002001"]["seed_sha256"]
+    # build-db.ts --apply checks the hash against the seed file or the decompressed shard frame
+    if seed_format == "files":
+        seed_bytes = (seed_dir / f"{changed['id']}.json").read_bytes()
+    else:
+        shard_no, offset, length, _ = shard_index["laws"][changed["id"]]
+        frame = (seed_dir / "_shards" / shard_index["shards"][shard_no]).read_bytes()[offset:offset + length]
+        seed_bytes = ingest.decompress_frame(frame, shard_index["codec"])
+    assert hashlib.sha256(seed_bytes).hexdigest() == changed["seed_sha256"]
+    assert "102002002" not in manifest
+    if seed_format == "files":
+        assert not (seed_dir / f"{ids['102002002']}.json").exists()
+
+
+def test_census_query_row_numbers_are_file_positions(ingest, sample_parquet):
+    con = duckdb.connect()
+    plain = con.execute(ingest.census_query(sample_parquet)).fetchall()
+    numbered = con.execute(ingest.census_query(sample_parquet, row_numbers=True)).fetchall()
+    assert [row[:-1] for row in numbered] == plain
+    # The non-federal row 40 and the post-filtered row 42 are skipped
+    assert [row[-1] for row in numbered] == list(range(40)) + [41]
+
+
+def test_census_tables_match_census_json(ingest, seed_dir, mirror_dir, run_main, tmp_path):
+    for args in (("--census-only",), ("--concurrency", "3")):
+        census = run_main("--source", str(mirror_dir), *args)
+        entries = [tuple(e[f] for f in ingest.CENSUS_FIELDS) for e in census["laws"]]
+
+        parquet = tmp_path / "census.parquet"
+        assert duckdb.connect().execute(f"SELECT * FROM read_parquet('{parquet}')").fetchall() == entries
+
+        con = sqlite3.connect(tmp_path / "census.sqlite")
+        assert con.execute("SELECT * FROM census ORDER BY rowid").fetchall() == entries
+        assert dict(con.execute("SELECT key, value FROM census_stats")) == census["stats"]
+        assert list(dict(con.execute("SELECT key, value FROM census_stats ORDER BY rowid"))) == list(census["stats"])
+        metadata = dict(con.execute("SELECT key, value FROM census_metadata"))
+        assert metadata["generated_at"] == census["generated_at"]
+        assert metadata.get("total_laws") == (str(census["ingestion"]["total_laws"]) if "ingestion" in census else None)
+
+        nd = census["laws"][5]["nd"]
+        assert con.execute("SELECT id FROM census WHERE nd = ?", (nd,)).fetchone() == (census["laws"][5]["id"],)
+        plan = " ".join(row[-1] for row in con.execute("EXPLAIN QUERY PLAN SELECT id FROM census WHERE nd = ?", (nd,)))
+        assert "idx_census_nd" in plan
+        con.close()
+    assert not list(tmp_path.glob("census.*.tmp"))
+
+
+def test_sharded_runs_merge_into_unsharded_census(ingest, seed_dir, mirror_dir, run_main, tmp_path, monkeypatch):
+    full = run_main("--source", str(mirror_dir))
+    full_seeds = read_seeds(seed_dir)
+    full_sqlite = sqlite3.connect(tmp_path / "census.sqlite").execute("SELECT * FROM census").fetchall()
+
+    nds = [e["nd"] for e in full["laws"]]
+    con = duckdb.connect()
+    con.execute("CREATE TABLE t (pravogovruNd VARCHAR)")
+    con.executemany("INSERT INTO t VALUES (?)", [(nd,) for nd in nds])
+    for i in (1, 2, 3):
+        in_shard = con.execute(f"SELECT pravogovruNd FROM t WHERE {ingest.shard_filter(i, 3)}").fetchall()
+        assert sorted(nd for (nd,) in in_shard) == sorted(nd for nd in nds if ingest.nd_shard(nd, 3) == i)
+        assert in_shard
+
+    for path in [*seed_dir.iterdir(), *tmp_path.glob("census.*")]:
+        if path.is_file():
+            path.unlink()
+    for i, args in ((1, ()), (2, ("--two-phase",)), (3, ())):
+        monkeypatch.setattr(sys, "argv", ["ingest-ruslawod.py", "--source", str(mirror_dir), "--shard", f"{i}/3",
+                                          *args])
+        ingest.main()
+        assert not (tmp_path / "census.json").exists()
+
+    slices = sorted(tmp_path.glob("census.shard-*-of-3.json"))
+    assert len(slices) == 3
+    monkeypatch.setattr(sys, "argv", ["ingest-ruslawod.py", "merge", *map(str, slices[:2])])
+    with pytest.raises(SystemExit) as exc:
+        ingest.main()
+    assert exc.value.code == 1
+
+    monkeypatch.setattr(sys, "argv", ["ingest-ruslawod.py", "merge"])
+    ingest.main()
+    merged = json.loads((tmp_path / "census.json").read_text(encoding="utf-8"))
+    assert merged["laws"] == full["laws"]
+    assert merged["stats"] == full["stats"]
+    assert {**merged["ingestion"], "completed_at": None} == {**full["ingestion"], "completed_at": None}
+    merged_seeds = read_seeds(seed_dir)
+    manifest, full_manifest = (json.loads(seeds.pop("_manifest.json")) for seeds in (merged_seeds, full_seeds))
+    # Shard 2 ran with --two-phase, which also records meta_sha256, classification and meta_skips
+    for entry in manifest["documents"].values():
+        entry.pop("meta_sha256", None)
+        entry.pop("classification", None)
+        entry.pop("meta_skips", None)
+    assert manifest["documents"] == full_manifest["documents"]
+    assert merged_seeds == full_seeds
+    assert sqlite3.connect(tmp_path / "census.sqlite").execute("SELECT * FROM census").fetchall() == full_sqlite
+    assert not list(tmp_path.glob("census.shard-*")) and not list(seed_dir.glob("_manifest.shard-*"))
+
+
+def test_two_phase_fetches_text_only_for_changed_row_groups(ingest, seed_dir, mirror_dir, run_main, tmp_path,
+                                                            monkeypatch):
+    import pyarrow.parquet as pq
+
+    # Rewrite batch 2 with row groups of 4 rows (DuckDB rounds row groups up to 2048 rows)
+    path = mirror_dir / "ruslawod_02.parquet"
+    pq.write_table(pq.read_table(path), path, row_group_size=4)
+
+    full = run_main("--source", str(mirror_dir), "--batch", "2")
+    full_seeds = read_seeds(seed_dir)
+    for p in seed_dir.glob("*.json"):
+        p.unlink()
+
+    metrics_path = tmp_path / "metrics.json"
+
+    def two_phase():
+        census = run_main("--source", str(mirror_dir), "--batch", "2", "--two-phase",
+                          "--metrics-out", str(metrics_path))
+        return census, json.loads(metrics_path.read_text(encoding="utf-8"))["totals"]["counters"]
+
+    def law_seeds():
+        return {name: seed for name, seed in read_seeds(seed_dir).items() if not name.startswith("_")}
+
+    first, counters = two_phase()
+    assert law_seeds() == {name: seed for name, seed in full_seeds.items() if not name.startswith("_")}
+    assert first["laws"] == full["laws"]
+    assert counters["seeds_written"] == len(first["laws"]) == counters["rows_scanned"] == 8
+    manifest = json.loads((seed_dir / "_manifest.json").read_text(encoding="utf-8"))["documents"]
+    assert all(entry.get("meta_sha256") for entry in manifest.values())
+
+    # Nothing changed: no text is read at all
+    second, counters = two_phase()
+    assert second["laws"] == first["laws"]
+    assert counters["rows_scanned"] == 0
+    assert counters["seeds_skipped"] == 8
+
+    # One changed text: only its row group is fetched, only that document is parsed
+    rendered = []
+    render_seed = ingest.render_seed
+    monkeypatch.setattr(ingest, "render_seed", lambda law, text: rendered.append(law["id"]) or render_seed(law, text))
+    table = pq.read_table(path)
+    rows = table.to_pylist()
+    rows[5]["textIPS"] += "\nСтатья 99. Новая статья\nНовый текст."
+    pq.write_table(type(table).from_pylist(rows, schema=table.schema), path, row_group_size=4)
+
+    third, counters = two_phase()
+    assert third["laws"] == first["laws"]
+    assert counters["rows_scanned"] == 4
+    assert counters["seeds_skipped"] == 7
+    assert rendered == [manifest[rows[5]["pravogovruNd"]]["law_id"]]
+
+
+def test_two_phase_reads_all_text_every_full_every_runs(ingest, seed_dir, mirror_dir, run_main, tmp_path,
+                                                        monkeypatch):
+    import pyarrow.parquet as pq
+
+    metrics_path = tmp_path / "metrics.json"
+
+    def two_phase():
+        run_main("--source", str(mirror_dir), "--batch", "2", "--two-phase", "--full-every", "2",
+                 "--metrics-out", str(metrics_path))
+        return json.loads(metrics_path.read_text(encoding="utf-8"))["totals"]["counters"]
+
+    assert two_phase()["rows_scanned"] == 8
+
+    # An edit that leaves the row group's size and statistics as they were
+    path = mirror_dir / "ruslawod_02.parquet"
+    con = ingest.connect_duckdb(False)
+    row_groups = ingest.text_row_groups(con, str(path))
+    con.close()
+    monkeypatch.setattr(ingest, "text_row_groups", lambda con, parquet_url: row_groups)
+    table = pq.read_table(path)
+    rows = table.to_pylist()
+    rows[5]["textIPS"] += "\nСтатья 99. Новая статья\nНовый текст."
+    pq.write_table(type(table).from_pylist(rows, schema=table.schema), path)
+    law_id = json.loads((seed_dir / "_manifest.json").read_text(encoding="utf-8"))[
+        "documents"][rows[5]["pravogovruNd"]]["law_id"]
+
+    def articles():
+        return [p["article"] for p in json.loads((seed_dir / f"{law_id}.json").read_text(encoding="utf-8"))["provisions"]]
+
+    # The metadata alone misses it ...
+    counters = two_phase()
+    assert counters["rows_scanned"] == 0
+    assert "99" not in articles()
+
+    # ... until the second run in a row reads every text again
+    counters = two_phase()
+    assert counters["rows_scanned"] == 8
+    assert counters["seeds_written"] == 1
+    assert "99" in articles()
+    manifest = json.loads((seed_dir / "_manifest.json").read_text(encoding="utf-8"))["documents"]
+    assert all(entry["meta_skips"] == 0 for entry in manifest.values())
+    assert two_phase()["rows_scanned"] == 0
+
+
+def test_metrics_out_counts_every_stage(ingest, seed_dir, mirror_dir, run_main, tmp_path):
+    import pstats
+
+    metrics_path = tmp_path / "metrics.json"
+    profile_path = tmp_path / "batch2.prof"
+    first = run_main("--source", str(mirror_dir), "--batch", "2",
+                     "--metrics-out", str(metrics_path), "--profile", str(profile_path))
+    metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
+    assert metrics["options"]["output"] == "files"
+    assert [f["file"] for f in metrics["files"]] == ["ruslawod_02.parquet"]
+    totals = metrics["totals"]
+    assert set(totals["seconds"]) == set(ingest.STAGES)
+    assert all(totals["seconds"][stage] > 0 for stage in ("scan", "convert", "census", "parse", "serialize", "write"))
+
+    counters = totals["counters"]
+    assert counters["seeds_written"] == len(first["laws"]) > 0
+    assert counters["seeds_skipped"] == 0
+    assert counters["provisions"] == first["ingestion"]["total_provisions"]
+    assert counters["rows_scanned"] >= counters["seeds_written"] + counters["duplicates_skipped"]
+    assert counters["text_bytes"] > 0
+    assert pstats.Stats(str(profile_path)).total_calls > 0
+
+    # A second run skips every document through the manifest
+    run_main("--source", str(mirror_dir), "--batch", "2", "--metrics-out", str(metrics_path))
+    counters = json.loads(metrics_path.read_text(encoding="utf-8"))["totals"]["counters"]
+    assert counters["seeds_skipped"] == len(first["laws"])
+    assert counters["seeds_written"] == counters["provisions"] == 0
+
+
+@pytest.mark.parametrize("codec", ["zstd", "gzip"])
+def test_seed_shards_match_seed_files(ingest, seed_dir, mirror_dir, run_main, monkeypatch, codec):
+    if codec == "zstd":
+        pytest.importorskip("zstandard")
+    run_main("--source", str(mirror_dir))
+    files = {p.stem: json.loads(p.read_text(encoding="utf-8")) for p in seed_dir.glob("*.json")
+             if not p.name.startswith("_")}
+    for path in seed_dir.iterdir():
+        shutil.rmtree(path) if path.is_dir() else path.unlink()
+
+    census = run_main("--source", str(mirror_dir), "--concurrency", "4",
+                      "--seed-format", "shards", "--seed-codec", codec)
+    assert not list(seed_dir.glob("*.json"))[1:]  # only the manifest
+    shards_dir = seed_dir / "_shards"
+    index = json.loads((shards_dir / "index.json").read_text(encoding="utf-8"))
+    assert index["codec"] == codec
+
+    seeds = {seed["law"]["id"]: seed for seed in ingest.read_shard_seeds(shards_dir)}
+    assert sorted(seeds) == sorted(files) == sorted(e["id"] for e in census["laws"])
+    for entry in census["laws"]:
+        seed = seeds[entry["id"]]
+        assert seed["provisions"] == files[entry["id"]]["provisions"]
+        assert seed["law"]["source_url"] == entry["source_url"]
+        assert index["laws"][entry["id"]][3] == entry["nd"]
+
+    # A shard decompresses as a whole to NDJSON, one law per line
+    shard = (shards_dir / index["shards"][0]).read_bytes()
+    if codec == "gzip":
+        import gzip
+        lines = gzip.decompress(shard).decode("utf-8").splitlines()
+    else:
+        import io
+        import zstandard
+        reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(shard), read_across_frames=True)
+        lines = reader.read().decode("utf-8").splitlines()
+    assert len(lines) >= len(seeds)
+
+    # Unchanged documents are copied from the previous shard set, not parsed again
+    rendered = []
+    render_seed_line = ingest.render_seed_line
+    monkeypatch.setattr(ingest, "render_seed_line",
+                        lambda law, text: rendered.append(law["id"]) or render_seed_line(law, text))
+    run_main("--source", str(mirror_dir), "--seed-format", "shards", "--seed-codec", codec)
+    assert rendered == []
+    assert {seed["law"]["id"]: seed for seed in ingest.read_shard_seeds(shards_dir)} == seeds
+    assert sorted(p.name for p in seed_dir.iterdir()) == ["_changes", "_manifest.json", "_shards"]
+
+
+def test_assign_law_ids_ranks_colliding_documents_by_nd(ingest):
+    files = [
+        [{"id": "fz-1-2001", "nd": "102000200"}, {"id": "fz-2-2001", "nd": "102000300"}],
+        [{"id": "fz-1-2001", "nd": "102000100"}, {"id": "fz-1-2001", "nd": "102000200"},
+         {"id": "fz-1-2001-000400", "nd": "102000500"}, {"id": "fz-1-2001", "nd": "102000400"}],
+    ]
+    law_ids, collisions = ingest.assign_law_ids(files)
+
+    assert law_ids == [
+        [("fz-1-2001", "fz-1-2001-000200"), ("fz-2-2001", "fz-2-2001")],
+        [("fz-1-2001", "fz-1-2001"), ("fz-1-2001", None),
+         ("fz-1-2001-000400", "fz-1-2001-000400"), ("fz-1-2001", "fz-1-2001-102000400")],
+    ]
+    assert collisions == 2
+
+    # Which document keeps the id does not depend on file order
+    def final_ids(files, law_ids):
+        return {(e["nd"], final) for entries, ids in zip(files, law_ids) for e, (_, final) in zip(entries, ids) if final}
+    assert final_ids(files[::-1], ingest.assign_law_ids(files[::-1])[0]) == final_ids(files, law_ids)
+
+
+def collision_mirror(tmp_path):
+    """Three documents of 1-ФЗ from 2001, one per file; the lowest nd, which keeps the id, is in the last."""
+    mirror = tmp_path / "collisions"
+    mirror.mkdir()
+    for batch in range(1, 4):
+        write_parquet(mirror / f"ruslawod_{batch:02d}.parquet", [
+            (f"10290{4 - batch}000", "Федеральный закон", f"Повтор {batch}", "1-ФЗ",
+             "01.01.2001", "", "Федеральный закон", article_text(batch)),
+        ])
+    for batch in range(4, 12):
+        write_parquet(mirror / f"ruslawod_{batch:02d}.parquet", [
+            ("102800000", "Постановление", "Не федеральный акт", "12", "01.01.2011", "", "Правительство", "текст"),
+        ])
+    return mirror
+
+
+COLLISION_IDS = {"102903000": "fz-1-2001-903000", "102902000": "fz-1-2001-902000", "102901000": "fz-1-2001"}
+
+
+def test_colliding_seeds_are_written_once_under_final_ids(ingest, seed_dir, tmp_path, run_main, monkeypatch):
+    mirror = collision_mirror(tmp_path)
+    written = []
+    write_seed_file = ingest.write_seed_file
+    monkeypatch.setattr(ingest, "write_seed_file",
+                        lambda path, seed_json: written.append(path) or write_seed_file(path, seed_json))
+    census = run_main("--source", str(mirror), "--concurrency", "3")
+
+    ids = {e["nd"]: e["id"] for e in census["laws"]}
+    assert ids == COLLISION_IDS
+    assert sorted(path.name for path in written) == sorted(f"{law_id}.json" for law_id in ids.values())
+    assert not list(seed_dir.glob("*.tmp"))
+    for entry in census["laws"]:
+        seed = json.loads((seed_dir / f"{entry['id']}.json").read_text(encoding="utf-8"))
+        assert seed["law"]["id"] == entry["id"]
+        assert seed["law"]["source_url"] == entry["source_url"]
+        assert seed["law"]["title"] == entry["title"]
+
+
+def test_batch_run_assigns_the_ids_of_a_full_run(ingest, seed_dir, tmp_path, run_main):
+    mirror = collision_mirror(tmp_path)
+    # Alone in its file, 102903000 would take fz-1-2001 and overwrite the seed of 102901000
+    census = run_main("--source", str(mirror), "--batch", "1")
+    assert [(e["nd"], e["id"]) for e in census["laws"]] == [("102903000", COLLISION_IDS["102903000"])]
+    assert sorted(p.name for p in seed_dir.glob("fz-*.json")) == ["fz-1-2001-903000.json"]
+
+
+def build_db_from_seeds(ingest, seed_dir, path):
+    """What scripts/build-db.ts does: row-by-row inserts with the FTS triggers on, exact duplicates stored once."""
+    con = sqlite3.connect(path)
+    con.executescript(ingest.SCHEMA_PATH.read_text(encoding="utf-8"))
+    law_ids = {}
+    for entry in json.loads(ingest.CENSUS_PATH.read_text(encoding="utf-8"))["laws"]:
+        law_ids.setdefault(entry["nd"], entry["id"])
+    for seed_path in sorted(seed_dir.glob("*.json")):
+        if seed_path.name.startswith("_"):
+            continue
+        seed = json.loads(seed_path.read_text(encoding="utf-8"))
+        law = seed["law"]
+        con.execute("INSERT INTO laws (id, title, identifier, law_type, status, effective_date, source_url, "
+                    "last_updated, provision_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (law["id"], law["title"], law["identifier"], law["law_type"], law["status"],
+                     law["effective_date"], law["source_url"], law["last_updated"], len(seed["provisions"])))
+        for i, prov in enumerate(seed["provisions"]):
+            original = con.execute("SELECT id FROM provisions WHERE normalized_sha256 = ? AND duplicate_of IS NULL "
+                                   "AND content = ? AND title IS ?",
+                                   (prov["normalized_sha256"], prov["content"], prov.get("title"))).fetchone()
+            con.execute("INSERT OR IGNORE INTO provisions (law_id, article, title, content, part, paragraph, "
+                        "provision_ref, order_index, normalized_sha256, content_stemmed, duplicate_of) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (law["id"], prov["article"], prov.get("title"), "" if original else prov["content"],
+                         prov.get("part"), prov.get("paragraph"), prov.get("provision_ref"),
+                         prov.get("order_index", i), prov["normalized_sha256"],
+                         None if original else ingest.provision_stems(prov), original[0] if original else None))
+        for ref in seed.get("references", []):
+            for nd in ref["targets"]:
+                if nd in law_ids:
+                    con.execute("INSERT INTO cross_references (source_law_id, source_provision_ref, target_law_id) "
+                                "VALUES (?, ?, ?)", (law["id"], ref["provision_ref"], law_ids[nd]))
+    con.commit()
+    return con
+
+
+# Which of a set of exact duplicates holds the text depends on insertion order
+PROVISION_ROWS = ("SELECT p.law_id, p.article, p.title, COALESCE(o.content, p.content), p.part, p.paragraph, "
+                  "p.provision_ref, p.order_index, p.metadata, p.normalized_sha256, "
+                  "COALESCE(o.content_stemmed, p.content_stemmed) "
+                  "FROM provisions p LEFT JOIN provisions o ON o.id = p.duplicate_of "
+                  "ORDER BY p.law_id, p.order_index, p.article")
+REFERENCE_ROWS = ("SELECT source_law_id, source_provision_ref, target_law_id, target_provision_ref, ref_type "
+                  "FROM cross_references ORDER BY source_law_id, id")
+
+
+def build_db_metadata(ingest):
+    """The db_metadata rows scripts/build-db.ts writeBuildMetadata() writes: key -> literal value, or None."""
+    source = (ingest.SCRIPT_DIR / "build-db.ts").read_text(encoding="utf-8")
+    body = source[source.index("function writeBuildMetadata("):]
+    body = body[:body.index("\n}\n")]
+    rows = re.findall(r"insertMeta\.run\('(\w+)', (?:'([^']*)'|[^']*?\))", body)
+    assert rows
+    return {key: literal or None for key, literal in rows}
+
+
+def test_scan_references_attaches_links_to_articles(ingest):
+    text = "\n".join([
+        'ФЕДЕРАЛЬНЫЙ ЗАКОН в соответствии с <ref nd="100">Конституцией</ref>',
+        '<b>Статья 1.</b> Предмет <ref nd="200">закона</ref>',
+        'Текст со ссылкой на <ref nd="300">статью 5</ref> и снова на <ref nd="300">неё</ref>.',
+        'Статья 2. Без <ref nd="400">текста</ref>',
+        '',
+        'Статья 3. Ссылки',
+        'См. <ref nd="200">закон</ref>, <REF ND="500">указ</REF> и <ref nd="700">',
+        'Статья 4. Не заголовок: тег выше съел перевод строки',
+        'Приложение 1',
+        'Форма по <ref nd="600">приказу</ref>',
+    ])
+    provisions = ingest.scan_provisions(text)
+    assert [p["article"] for p in provisions] == ["1", "3"]
+    assert ingest.scan_references(text, provisions) == [
+        # article 2 has no text, so no provision; the appendix is outside the articles
+        {"provision_ref": None, "targets": ["100", "400", "600"]},
+        {"provision_ref": "1", "targets": ["200", "300"]},
+        {"provision_ref": "3", "targets": ["200", "500", "700"]},
+    ]
+    assert ingest.scan_references("Статья 1. Текст без ссылок", provisions) == []
+
+
+def test_sqlite_output_matches_seed_build(ingest, seed_dir, mirror_dir, run_main, tmp_path):
+    run_main("--source", str(mirror_dir))
+    expected = build_db_from_seeds(ingest, seed_dir, tmp_path / "seeds.db")
+    # The change sets stay: the database records the latest one, for build-db.ts --apply
+    changes_dir = seed_dir / ingest.CHANGES_DIR_NAME
+    for path in seed_dir.iterdir():
+        if path != changes_dir:
+            shutil.rmtree(path) if path.is_dir() else path.unlink()
+
+    db_path = tmp_path / "direct.db"
+    census = run_main("--source", str(mirror_dir), "--concurrency", "4", "--sqlite", str(db_path))
+    assert list(seed_dir.iterdir()) == [changes_dir]
+    assert [p.name for p in changes_dir.iterdir()] == ["000001.json"]
+    assert census["ingestion"]["total_laws"] == len(census["laws"])
+
+    con = sqlite3.connect(db_path)
+    assert con.execute(PROVISION_ROWS).fetchall() == expected.execute(PROVISION_ROWS).fetchall()
+    assert con.execute(REFERENCE_ROWS).fetchall() == expected.execute(REFERENCE_ROWS).fetchall()
+    duplicates = "SELECT COUNT(*) FROM provisions WHERE duplicate_of IS NOT NULL"
+    assert con.execute(duplicates).fetchone() == expected.execute(duplicates).fetchone() > (0,)
+    laws = con.execute("SELECT id, title, identifier, law_type, status, effective_date, source_url "
+                       "FROM laws ORDER BY id").fetchall()
+    fields = ("id", "title", "identifier", "law_type", "status", "effective_date", "source_url")
+    assert laws == sorted(tuple(e[f] for f in fields) for e in census["laws"])
+
+    # FTS index was built in one go, without the duplicates, and the sync triggers are back
+    query = "SELECT rowid FROM provisions_fts WHERE provisions_fts MATCH ? ORDER BY rowid"
+    assert len(con.execute(query, ("правило",)).fetchall()) == con.execute(
+        "SELECT COUNT(*) FROM provisions WHERE content LIKE '%правило%'").fetchone()[0] > 0
+    triggers = {name for (name,) in con.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    assert triggers == {"provisions_ai", "provisions_ad", "provisions_au"}
+
+    # db_metadata as build-db.ts writes it, apart from when and by what it was built
+    metadata = dict(con.execute("SELECT key, value FROM db_metadata"))
+    expected_metadata = build_db_metadata(ingest)
+    assert metadata.keys() == expected_metadata.keys()
+    assert {"law_count", "provision_count", "changeset_sequence"} <= metadata.keys()
+    for key, literal in expected_metadata.items():
+        if literal is not None and key not in ("built_at", "builder"):
+            assert metadata[key] == literal, key
+    assert metadata["builder"] == "ingest-ruslawod.py"
+    assert int(metadata["law_count"]) == len(laws)
+    assert int(metadata["provision_count"]) == con.execute("SELECT COUNT(*) FROM provisions").fetchone()[0]
+    assert metadata["changeset_sequence"] == "1"
+
+
+def test_duplicate_index_flags_exact_and_near_duplicates(ingest):
+    body = " ".join(f"слово{i}" for i in range(200))
+    edited = body.replace("слово100 ", "изменено ")
+
+    def fingerprint(*contents):
+        return ingest.document_fingerprint([
+            {"article": str(n), "title": "Т", "content": content, "provision_ref": str(n)}
+            for n, content in enumerate(contents, 1)
+        ])
+
+    duplicates = ingest.DuplicateIndex()
+    duplicates.add("a", fingerprint(body, "короткий текст"))
+    duplicates.add("b", fingerprint(body, "короткий текст"))
+    duplicates.add("c", fingerprint(edited))
+    duplicates.add("d", fingerprint(" ".join(f"другое{i}" for i in range(200))))
+    report = duplicates.report()
+
+    exact = report["exact_duplicates"]
+    assert (report["laws"], report["provisions"]) == (4, 6)
+    assert exact["provisions"] == exact["fts_rows_saved"] == 2
+    assert exact["content_bytes_saved"] == len(body.encode("utf-8")) + len("короткий текст".encode("utf-8"))
+    assert exact["laws_with_duplicates"] == exact["laws_fully_duplicated"] == 1
+
+    near = report["near_duplicates"]
+    assert [(p["law_id"], p["provision_ref"], p["other_law_id"]) for p in near["provisions"]] == [("a", "1", "c")]
+    assert 0.8 <= near["provisions"][0]["similarity"] < 1
+    assert {(p["law_id"], p["other_law_id"]) for p in near["laws"]} == {("a", "b"), ("a", "c"), ("b", "c")}
+
+
+def test_dedup_report_matches_duplicates_stored_once(ingest, seed_dir, mirror_dir, run_main, tmp_path):
+    db_path = tmp_path / "direct.db"
+    report_path = tmp_path / "dedup.json"
+    run_main("--source", str(mirror_dir), "--sqlite", str(db_path), "--dedup-report", str(report_path))
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+
+    con = sqlite3.connect(db_path)
+    stored, duplicates, saved = con.execute(
+        "SELECT COUNT(*), COUNT(p.duplicate_of), TOTAL(length(CAST(o.content AS BLOB))) "
+        "FROM provisions p LEFT JOIN provisions o ON o.id = p.duplicate_of").fetchone()
+    exact = report["exact_duplicates"]
+    assert report["provisions"] == stored
+    assert exact["provisions"] == duplicates > 0
+    assert exact["content_bytes_saved"] == saved
+    assert con.execute("SELECT COUNT(*) FROM provisions_fts_docsize").fetchone()[0] == stored - duplicates
+    assert con.execute("SELECT COUNT(*) FROM provisions WHERE duplicate_of IS NOT NULL AND "
+                       "(content <> '' OR content_stemmed IS NOT NULL)").fetchone()[0] == 0
+
+
+def test_compressed_sqlite_output_matches_plain_build(ingest, seed_dir, mirror_dir, run_main, tmp_path):
+    plain_path, compressed_path = tmp_path / "plain.db", tmp_path / "compressed.db"
+    run_main("--source", str(mirror_dir), "--sqlite", str(plain_path))
+    run_main("--source", str(mirror_dir), "--sqlite", str(compressed_path), "--compress")
+    plain, con = sqlite3.connect(plain_path), sqlite3.connect(compressed_path)
+
+    (dictionary,) = con.execute("SELECT dictionary FROM content_dictionary").fetchone()
+    assert 0 < len(dictionary) <= ingest.DICTIONARY_SIZE
+    assert con.execute("SELECT COUNT(*) FROM provisions WHERE content <> '' OR content_stemmed IS NOT NULL "
+                       "OR (content_z IS NULL) = (duplicate_of IS NULL)").fetchone()[0] == 0
+    key = "p.law_id, p.article, COALESCE(p.part, ''), COALESCE(p.paragraph, '')"
+    texts = sorted((*row[:-1], ingest.decompress_provision_text(row[-1], dictionary)) for row in con.execute(
+        f"SELECT {key}, COALESCE(o.content_z, p.content_z) FROM provisions p "
+        "LEFT JOIN provisions o ON o.id = p.duplicate_of"))
+    assert texts == plain.execute(f"SELECT {key}, COALESCE(o.content, p.content) FROM provisions p "
+                                  "LEFT JOIN provisions o ON o.id = p.duplicate_of ORDER BY 1, 2, 3, 4").fetchall()
+    compressed_bytes = con.execute("SELECT SUM(length(content_z)) FROM provisions").fetchone()[0]
+    plain_bytes = plain.execute("SELECT SUM(length(CAST(content AS BLOB))) FROM provisions").fetchone()[0]
+    assert compressed_bytes < plain_bytes
+
+    # The index reads the text through provision_text(): same hits, ranking and snippets
+    ingest.register_provision_text(con, dictionary)
+    search = (f"SELECT {key}, round(bm25(provisions_fts), 9), "
+              "snippet(provisions_fts, 0, '>>>', '<<<', '...', 32) FROM provisions_fts "
+              "JOIN provisions p ON p.id = provisions_fts.rowid OR p.duplicate_of = provisions_fts.rowid "
+              "WHERE provisions_fts MATCH ? ORDER BY 1, 2, 3, 4")
+    for query in ("правило", "закон*", 'content_stemmed : "прав"', "NEAR(статья правило, 5)"):
+        hits = con.execute(search, (query,)).fetchall()
+        assert hits == plain.execute(search, (query,)).fetchall()
+    assert hits
+    assert con.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall() == []
+    stems = "SELECT content_stemmed FROM provisions_text ORDER BY id"
+    assert con.execute(stems).fetchall() == plain.execute(
+        "SELECT content_stemmed FROM provisions WHERE duplicate_of IS NULL ORDER BY id").fetchall()
+
+    # ... and can be rebuilt and checked with the function registered
+    con.execute("INSERT INTO provisions_fts(provisions_fts) VALUES('rebuild')")
+    con.execute("INSERT INTO provisions_fts(provisions_fts) VALUES('integrity-check')")
+    assert con.execute(search, ("правило",)).fetchall() == plain.execute(search, ("правило",)).fetchall()
+
+
+def test_split_provisions_numbers_parts_and_items(ingest):
+    text = "\n".join([
+        "Статья 149. Освобождение от налогообложения",
+        "Вводный текст.",
+        "1. Первая часть.",
+        "2. Не подлежит налогообложению:",
+        "1) продажа медицинских товаров;",
+        "2) услуги по уходу",
+        "за больными;",
+        "2.1. Вставленная часть.",
+        "3. Не подлежат налогообложению операции:",
+        "а) по первому пункту;",
+        "б) по второму пункту.",
+        "",
+        "Статья 150. Без частей",
+        "Текст статьи, где 1. не начинает строку.",
+        "",
+        "Статья 151. Пункты",
+        "1) первый;",
+        "2) второй.",
+    ])
+    rows = ingest.split_provisions(ingest.scan_provisions(text))
+    assert [(r["provision_ref"], r["part"], r["paragraph"]) for r in rows] == [
+        ("149", None, None),
+        ("149.1", "1", None),
+        ("149.2", "2", None),
+        ("149.2.1", "2", "1"),
+        ("149.2.2", "2", "2"),
+        ("149.2-1", "2.1", None),
+        ("149.3", "3", None),
+        ("149.3.а", "3", "а"),
+        ("149.3.б", "3", "б"),
+        ("150", None, None),
+        ("151.1", None, "1"),
+        ("151.2", None, "2"),
+    ]
+    assert [r["order_index"] for r in rows] == list(range(len(rows)))
+    assert {r["title"] for r in rows[:9]} == {"Освобождение от налогообложения"}
+    assert rows[4]["content"] == "2) услуги по уходу\nза больными;"
+    assert rows[9]["content"] == "Текст статьи, где 1. не начинает строку."
+
+
+def test_split_parts_seeds_and_sqlite_match(ingest, seed_dir, mirror_dir, run_main, tmp_path):
+    run_main("--source", str(mirror_dir))
+    whole = {p.name: json.loads(p.read_text(encoding="utf-8")) for p in seed_dir.glob("[!_]*.json")}
+
+    # Seeds written without --split-parts never count as unchanged
+    run_main("--source", str(mirror_dir), "--split-parts")
+    manifest = ingest.load_manifest(seed_dir / ingest.MANIFEST_NAME)
+    assert manifest and all(entry.get("split_parts") for entry in manifest.values())
+    split = {p.name: json.loads(p.read_text(encoding="utf-8")) for p in seed_dir.glob("[!_]*.json")}
+    assert split.keys() == whole.keys()
+    for name, seed in split.items():
+        assert len(seed["provisions"]) > len(whole[name]["provisions"])
+        assert {p["article"] for p in seed["provisions"]} == {p["article"] for p in whole[name]["provisions"]}
+        assert {p["part"] for p in seed["provisions"]} >= {"1", "2"}
+        # Joined in order, the rows of an article give its text back (get_provision, drift-detect.ts)
+        joined = {}
+        for p in seed["provisions"]:
+            joined[p["article"]] = joined[p["article"]] + "\n" + p["content"] if p["article"] in joined else p["content"]
+        assert {article: " ".join(text.split()) for article, text in joined.items()} == {
+            p["article"]: " ".join(p["content"].split()) for p in whole[name]["provisions"]}
+    expected = build_db_from_seeds(ingest, seed_dir, tmp_path / "seeds.db")
+
+    db_path = tmp_path / "direct.db"
+    run_main("--source", str(mirror_dir), "--split-parts", "--sqlite", str(db_path))
+    con = sqlite3.connect(db_path)
+    assert con.execute(PROVISION_ROWS).fetchall() == expected.execute(PROVISION_ROWS).fetchall()
+    assert con.execute("SELECT COUNT(*) FROM provisions WHERE provision_ref = article || '.' || part").fetchone()[0] > 0
+
+
+def test_cross_references_resolve_through_census(ingest, seed_dir, mirror_dir, run_main, tmp_path):
+    citing = "\n".join([
+        'ФЕДЕРАЛЬНЫЙ ЗАКОН на основании <ref nd="777000002">закона</ref>',
+        "Статья 1. Отсылки",
+        'Применяется <ref nd="777000002">Федеральный закон</ref> и <ref nd="999999999">акт вне census</ref>.',
+        "Статья 2. Без ссылок",
+        "Текст статьи без ссылок, но достаточно длинный.",
+    ])
+    cited = article_text(2).replace('<ref nd="102000001">', '<ref nd="777000001">')
+    write_parquet(mirror_dir / "ruslawod_01.parquet", [
+        ("777000001", "Федеральный закон", "О ссылающемся законе", "71-ФЗ", "01.02.2010", "", "Федеральный закон", citing),
+    ])
+    write_parquet(mirror_dir / "ruslawod_02.parquet", [
+        ("777000002", "Федеральный закон", "О цитируемом законе", "72-ФЗ", "01.02.2010", "", "Федеральный закон", cited),
+    ])
+    census = run_main("--source", str(mirror_dir))
+    ids = {e["nd"]: e["id"] for e in census["laws"]}
+    seed = json.loads((seed_dir / f"{ids['777000001']}.json").read_text(encoding="utf-8"))
+    assert seed["references"] == [
+        {"provision_ref": None, "targets": ["777000002"]},
+        {"provision_ref": "1", "targets": ["777000002", "999999999"]},
+    ]
+    expected = build_db_from_seeds(ingest, seed_dir, tmp_path / "seeds.db")
+
+    db_path = tmp_path / "direct.db"
+    run_main("--source", str(mirror_dir), "--sqlite", str(db_path))
+    con = sqlite3.connect(db_path)
+    rows = con.execute(REFERENCE_ROWS).fetchall()
+    assert rows == expected.execute(REFERENCE_ROWS).fetchall()
+    assert (ids["777000001"], "1", ids["777000002"], None, "reference") in rows
+    assert (ids["777000002"], "1", ids["777000001"], None, "reference") in rows
+    assert len(rows) == len(set(rows)) and all(row[2] in ids.values() for row in rows)
+    # The link outside the census waits for build-db.ts --apply to resolve it
+    unresolved = con.execute("SELECT * FROM unresolved_references").fetchall()
+    assert (ids["777000001"], "1", "999999999") in unresolved and not {nd for _, _, nd in unresolved} & ids.keys()
+
+    # "What cites X" is an index lookup
+    assert con.execute("SELECT l.name FROM pragma_index_list('cross_references') l "
+                       "JOIN pragma_index_info(l.name) i WHERE i.name = 'target_law_id'").fetchall() == [
+        ("idx_cross_refs_target",)]
+
+
+# ---------------------------------------------------------------------------
+# scan_provisions(text, skip_repeats=False) must stay equivalent to
+# parse_articles(clean_text(text)); the verbatim-repeat skip is tested on its own
+# ---------------------------------------------------------------------------
+
+SCANNER_CASES = [
+    "",
+    "Статья 1. Общие положения\n1. Текст.\n\n\n\n2. Ещё текст.\n\n",
+    "Статья 1.2 Заголовок\nТекст",
+    "Статья 12a\nне статья\nСтатья 3 . . Заголовок\nТекст",
+    "Статья 5. " + "д" * 210 + "\nТекст",
+    "Статья 10. 1. Сразу текст\nПродолжение",
+    "Статья 1. A\nТекст 1\nПриложение 1\nСтатья 9 в приложении?\nТекст\nСтатья 2. B\nТекст 2",
+    "Статья 1. A\nТекст\nПРИЛОЖЕНИЕ\nмусор\nглава IV\nСтатья 1. A\nДубликат",
+    "Глава 1. Общие\nРаздел II\nЧасть 1\nчасть первая\nПодраздел 2\nСтатья 1.\nТекст",
+    'Статья 1. <ref nd="102">Ссылка</ref>\n\n  <ref nd="103">\n\nСтатья 2. Б</ref>  текст',
+    "Статья 1. Заголовок с пробелами\nТекст  с   пробелами \t и\r\nконец\r",
+    "<b>Статья 1.</b> Заголовок\n<p>Текст</p>\n</REF>Статья 2. X\nY",
+    "  \n \nСтатья 7. Т\n \n \nТекст\n \n",
+    "Статья 1. A\nТекст\nСтатья 2. B\nДругой\nСтатья 1. A\nТекст\nСтатья 1. A\nНовое\nСтатья 1.\nТекст",
+]
+
+
+@pytest.mark.parametrize("text", SCANNER_CASES)
+def test_scan_provisions_matches_reference_parser(ingest, text):
+    assert ingest.scan_provisions(text, skip_repeats=False) == ingest.parse_articles(ingest.clean_text(text))
+
+
+def test_verbatim_repeats_of_an_article_are_not_appended(ingest):
+    text = "Статья 1. A\nТекст\n\nСтатья 2. B\nДругой\n\nСтатья 1. A\nТекст\n\nСтатья 1. A\nНовое\n"
+    provisions = ingest.scan_provisions(text)
+    assert [(p["article"], p["content"]) for p in provisions] == [("1", "Текст\n\nНовое"), ("2", "Другой")]
+    merged = ingest.scan_provisions(text, skip_repeats=False)
+    assert [(p["article"], p["content"]) for p in merged] == [("1", "Текст\n\nТекст\n\nНовое"), ("2", "Другой")]
+
+
+def test_verbatim_repeats_leave_the_provisions_unchanged_fuzzed(ingest):
+    lines = ["1. Текст пункта", "2) подпункт", "текст  с   пробелами", "Продолжение статьи", '<ref nd="123">ссылка</ref>']
+    rnd = random.Random(20241016)
+    for _ in range(500):
+        articles = [
+            f"Статья {rnd.randint(1, 6)}. Заголовок\n" + "\n".join(rnd.choices(lines, k=rnd.randint(1, 4)))
+            for _ in range(rnd.randint(1, 8))
+        ]
+        text = "\n".join(articles)
+        # A copy of an article already in the text, as re-published documents repeat them
+        repeated = f"{text}\n{rnd.choice(articles)}"
+        assert ingest.scan_provisions(repeated) == ingest.scan_provisions(text), repeated
+
+
+def test_scan_provisions_matches_reference_parser_fuzzed(ingest):
+    pieces = [
+        "Статья", "Статья 1.", "Статья 2", "Статья 1.2 Title", "Статья 3.  Заголовок  статьи", "Статья 12a",
+        "Приложение", "приложение 1", "Приложения", "Глава 1", "глава IV", "Часть 1", "Подраздел 2",
+        "1. Текст пункта", "2) подпункт", "текст  с   пробелами", '<ref nd="123">', "</ref>", "</REF>", "<b>",
+        "<", ">", " ", "  \t ", "\r", " ", " ", "Статья 5. " + "д" * 210,
+    ]
+    separators = ["\n", "\n", "\n\n", "\n\n\n", " ", "", " \n "]
+    rnd = random.Random(20240607)
+    for _ in range(3000):
+        text = "".join(rnd.choice(pieces) + rnd.choice(separators) for _ in range(rnd.randint(0, 25)))
+        assert ingest.scan_provisions(text, skip_repeats=False) == ingest.parse_articles(ingest.clean_text(text)), text
+
+
+def test_normalized_sha256_matches_drift_detect(ingest):
+    # normalizeText(): text.replace(/\s+/g, ' ').trim().toLowerCase()
+    expected = hashlib.sha256("статья 1. текст \x1cчасть".encode("utf-8")).hexdigest()
+    assert ingest.normalized_sha256("\ufeff Статья\u00a01.\n\t ТЕКСТ\u2003\x1cЧасть\u3000\n") == expected
+    assert ingest.normalized_sha256("Статья\u00a01.\n\t ТЕКСТ ") == hashlib.sha256("статья 1. текст".encode()).hexdigest()
+
+    seed, _ = ingest.render_seed({"id": "fz-1-2010", "title": "О законе", "source_url": ""}, article_text(3))
+    for p in json.loads(seed)["provisions"]:
+        assert p["normalized_sha256"] == ingest.normalized_sha256(p["content"])
+
+
+def test_stem_ru_matches_shared_fixture(ingest):
+    # src/utils/stemmer-ru.ts is tested against the same pairs.
+    fixture = json.loads((ingest.PROJECT_DIR / "fixtures" / "stemmer-ru.json").read_text(encoding="utf-8"))
+    mismatches = {word: ingest.stem_ru(word) for word, stem in fixture["cases"].items() if ingest.stem_ru(word) != stem}
+    assert mismatches == {}
+
+    assert ingest.stem_text("Статья 6. Обработка ПЕРСОНАЛЬНЫХ данных (152-ФЗ), ёмкость_сети") == (
+        "стат 6 обработк персональн дан 152 фз емкост сет"
+    )
+    assert ingest.stem_text(" \n—\t") == ""
+
+    law = {"id": "fz-1-2010", "title": "О законе", "source_url": ""}
+    provisions, _ = ingest.render_document(law, article_text(3), stemmed=True)
+    for p in provisions:
+        assert p["content_stemmed"] == ingest.stem_text(f"{p['title']}\n{p['content']}")
+    # Seeds leave the stems to build-db.ts
+    seed, _ = ingest.render_seed(law, article_text(3))
+    assert not any("content_stemmed" in p for p in json.loads(seed)["provisions"])
+
+
+def test_render_seed_matches_reference_pipeline(ingest):
+    def reference(law, text):
+        cleaned = ingest.clean_text(text)
+        if cleaned and len(cleaned) > 50:
+            provisions = ingest.parse_articles(cleaned) or [{
+                "article": "1", "title": law["title"], "content": cleaned, "provision_ref": "1", "order_index": 0,
+            }]
+        else:
+            provisions = [{
+                "article": "0", "title": law["title"],
+                "content": f"{law['title']}\n\nФедеральное законодательство Российской Федерации.\nИсточник: {law['source_url']}",
+                "provision_ref": "0", "order_index": 0,
+            }]
+        for p in provisions:
+            p["normalized_sha256"] = ingest.normalized_sha256(p["content"])
+        seed = {"law": law, "provisions": provisions}
+        references = ingest.scan_references(text, ingest.parse_articles(cleaned))
+        if references:
+            seed["references"] = references
+        return json.dumps(seed, ensure_ascii=False, indent=2), len(provisions)
+
+    law = {"id": "fz-1-2010", "title": "О законе", "source_url": "http://pravo.gov.ru/proxy/ips/?docbody=&nd=1"}
+    texts = SCANNER_CASES + [
+        article_text(40),
+        "Статья 1. Т\nКоротко",                      # articles, but under 50 characters
+        '<ref nd="1">' * 20 + "Статья 1. Т\nКоротко",  # long only because of markup
+        "Текст без статей, но длиннее пятидесяти символов, целиком.",
+    ]
+    for text in texts:
+        # The reference parser appends verbatim repeats, which the scanner skips (tested above)
+        if ingest.scan_provisions(text) != ingest.scan_provisions(text, skip_repeats=False):
+            continue
+        assert ingest.render_seed(law, text) == reference(law, text)
+
+
+CONSTITUTION = "Конституция Российской Федерации"
+AMENDMENT = "Закон Российской Федерации о поправке к Конституции Российской Федерации"
+
+# Raw metadata: (nd, doc_type, heading, doc_number, date, status, issued_by)
+CENSUS_CASES = [
+    ("102027595", "Конституция", CONSTITUTION, "", "12.12.1993", "С изменениями", ""),
+    ("102027596", None, "КОНСТИТУЦИЯ РОССИЙСКОЙ ФЕДЕРАЦИИ", None, None, None, "Федеральный закон"),
+    ("102027597", "Федеральный конституционный закон", "О референдуме", " 5-фкз ", "28.06.2004", "утратил силу", ""),
+    ("102027598", "Федеральный закон", "О связи", "126-ФЗ", "7.7.2003", "Действует", "Федеральный закон"),
+    ("102027599", "Федеральный закон", "Без даты", "12ФЗ", "", "c изменениями", ""),
+    ("102027600", "Кодекс", "Гражданский кодекс Российской Федерации (часть первая)", "51", "30.11.1994", "", ""),
+    ("102027601", "Кодекс", "Налоговый кодекс Российской Федерации часть 2", "117 ФЗ", "05.08.2000", "", ""),
+    ("102027602", "Кодекс", "Кодекс об административных правонарушениях", "195-ФЗ-1", "30.12.2001", "", ""),
+    ("102027603", "Кодекс", "Кодекс о недрах 'особый'", "", "1.1", "", ""),
+    ("102027604", AMENDMENT, "О поправке к Конституции", "1-ФКЗ", "30.12.2008", "", ""),
+    ("102027605", AMENDMENT, "О поправке к Конституции", "", "", "", ""),
+    ("102027606", AMENDMENT, "О поправке", "N 6", "-.+.2014", "", ""),
+    ("102027607", "Закон", "Об образовании " * 8, "3266-1", "..", "", ""),
+    ("102027608", "nan", "Без типа", "", "01.01.2000", "", "Указ Президента"),
+    ("102027609", "None", "Без типа по ФЗ", "ФЗ без номера", "01.01.2000", "", ""),
+    ("", "", "Без nd", "", "", "", "Федеральный конституционный закон"),
+    ("102027610", "Постановление", "О федеральном законе", "12", "01.01.2011", "", "Правительство"),
+    ("102027611", "Федеральный закон", "١٢ арабские цифры", "١٢-ФЗ", "\t01.02.2003\n", "", ""),
+]
+
+
+def python_census(ingest, path):
+    """The census the row-by-row Python mapping gives for the federal rows of path."""
+    con = duckdb.connect()
+    try:
+        rows = ingest.stream_rows(con, f"SELECT * FROM read_parquet('{path}') WHERE {ingest.FEDERAL_FILTER}")
+        entries = [ingest.census_entry(*row) for row in rows]
+    finally:
+        con.close()
+    return [e for e in entries if e is not None]
+
+
+def sql_census(ingest, path):
+    con = duckdb.connect()
+    try:
+        entries, _, _ = ingest.ingest_batch(con, path, census_only=True)
+    finally:
+        con.close()
+    return entries
+
+
+def test_census_query_matches_python_mapping(ingest, tmp_path):
+    rows = [case + (None,) for case in CENSUS_CASES]
+    path = write_parquet(tmp_path / "census.parquet", rows)
+
+    entries = sql_census(ingest, path)
+    assert entries == python_census(ingest, path)
+    assert {e["id"] for e in entries} >= {"constitution-rf", "fkz-5-2004", "gk-rf-1", "nk-rf-2", "koap-rf",
+                                          "const-amendment-2014", "fz-١٢-2003"}
+
+
+def test_census_query_matches_python_mapping_fuzzed(ingest, tmp_path):
+    rng = random.Random(20240611)
+    fields = list(zip(*CENSUS_CASES))
+    fields[1] = fields[1] + ("Указ", "Кодекс ")
+    fields[4] = fields[4] + ("31.13.2020", "1.2.3.4", " . . ", "+1.-2.2020")
+    fields[5] = fields[5] + ("  УТРАТИЛ СИЛУ  ", "Действует с изменениями")
+    rows = [tuple(rng.choice(values) for values in fields) + (None,) for _ in range(2000)]
+    path = write_parquet(tmp_path / "census.parquet", rows)
+
+    assert sql_census(ingest, path) == python_census(ingest, path)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark corpus (scripts/bench-ruslawod.py)
+# ---------------------------------------------------------------------------
+
+def test_synthetic_corpus_looks_like_ruslawod(ingest, bench):
+    rows = bench.generate_rows(docs=40, code_mb=0.25, seed=3)
+    texts = "\n".join(row[7] for row in rows)
+    for marker in ('<ref nd="', "Раздел I.", "Глава 1.", "Приложение 1", " "):
+        assert marker in texts
+    assert len(rows[0][7].encode("utf-8")) > 0.2 * 1024 * 1024
+
+    for row in rows:
+        assert ingest.scan_provisions(row[7], skip_repeats=False) == ingest.parse_articles(ingest.clean_text(row[7]))
+
+
+def test_synthetic_mirror_ingests_and_baseline_check_flags_slowdowns(bench, seed_dir, tmp_path, run_main):
+    mirror = tmp_path / "mirror"
+    bench.write_mirror(mirror, docs=33, code_mb=0.1, seed=2)
+    census = run_main("--source", str(mirror))
+    assert 0 < census["stats"]["total"] <= 33
+    assert census["ingestion"]["total_laws"] == census["stats"]["total"]
+
+    baseline = {"stages": {"scan_provisions": {"seconds": 1.0, "calibration_s": 0.1, "peak_mb": 10.0}}}
+    same = {"scan_provisions": {"seconds": 2.0, "calibration_s": 0.2, "peak_mb": 10.5}}
+    slower = {"scan_provisions": {"seconds": 1.5, "calibration_s": 0.1, "peak_mb": 30.0}}
+    assert bench.compare(same, baseline, 0.25) == []
+    assert len(bench.compare(slower, baseline, 0.25)) == 2
@@ -0,0 +1,205 @@
+import { describe, it, expect, beforeAll, afterAll } from 'vitest';
+import { createHash } from 'crypto';
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import Database from 'better-sqlite3';
+import { applyChangeSets, buildDatabase, type BuildPaths } from '../../scripts/build-db.js';
+
+// Each step of a seed history is applied to one database and compared with a full build of the same seeds
+
+interface TestProvision {
+  article: string;
+  title?: string;
+  content: string;
+}
+
+interface TestSeed {
+  law: { id: string; title: string; identifier: string; law_type: string };
+  provisions: TestProvision[];
+  references?: Array<{ provision_ref: string | null; targets: string[] }>;
+}
+
+const SHARED = 'Общее положение, которое повторяют несколько законов.';
+
+function seed(id: string, provisions: TestProvision[], references: TestSeed['references'] = []): TestSeed {
+  return {
+    law: { id, title: `Федеральный закон ${id}`, identifier: id, law_type: 'federal_law' },
+    provisions,
+    references,
+  };
+}
+
+const sha256 = (data: string | Buffer): string => createHash('sha256').update(data).digest('hex');
+
+let root: string;
+let paths: BuildPaths;
+let fullPaths: BuildPaths;
+let sequence = 0;
+const current = new Map<string, { nd: string; seed: TestSeed }>();
+
+/** Write the seeds, census and change set of one step; null removes a law. */
+function step(laws: Record<string, { nd: string; seed: TestSeed } | null>): void {
+  const added = [];
+  const changed = [];
+  const removed = [];
+  for (const [id, law] of Object.entries(laws)) {
+    const seedPath = path.join(paths.seedDir, `${id}.json`);
+    if (law === null) {
+      removed.push({ id, nd: current.get(id)!.nd });
+      current.delete(id);
+      fs.unlinkSync(seedPath);
+      continue;
+    }
+    const bytes = JSON.stringify(law.seed, null, 2);
+    fs.writeFileSync(seedPath, bytes);
+    const entry = {
+      id,
+      nd: law.nd,
+      seed_sha256: sha256(bytes),
+      provisions: law.seed.provisions.map(p => ({
+        article: p.article, part: null, paragraph: null, content_sha256: sha256(p.content),
+      })),
+    };
+    (current.has(id) ? changed : added).push(entry);
+    current.set(id, law);
+  }
+
+  const census = [...current.entries()].map(([id, law]) => ({ id, nd: law.nd }));
+  fs.writeFileSync(paths.censusPath, JSON.stringify({ laws: census }));
+  sequence++;
+  fs.writeFileSync(
+    path.join(paths.seedDir, '_changes', `${String(sequence).padStart(6, '0')}.json`),
+    JSON.stringify({ version: 1, sequence, generated_at: new Date().toISOString(), added, changed, removed })
+  );
+}
+
+/** Everything a full build determines, independent of row ids. */
+function snapshot(dbPath: string): Record<string, unknown> {
+  const db = new Database(dbPath, { readonly: true });
+  try {
+    const all = (sql: string) => db.prepare(sql).raw().all();
+    return {
+      laws: all('SELECT id, title, identifier, law_type, status, provision_count FROM laws ORDER BY id'),
+      provisions: all(`
+        SELECT p.law_id, p.article, p.title, COALESCE(o.content, p.content), p.provision_ref, p.order_index,
+          p.normalized_sha256, COALESCE(o.content_stemmed, p.content_stemmed), p.duplicate_of IS NOT NULL
+        FROM provisions p LEFT JOIN provisions o ON o.id = p.duplicate_of
+        ORDER BY p.law_id, p.article`),
+      holders: all(`
+        SELECT COUNT(*), COUNT(DISTINCT content) FROM provisions WHERE duplicate_of IS NULL`),
+      fts: all(`
+        SELECT p.law_id, p.article, provisions_fts.content FROM provisions_fts
+        JOIN provisions p ON p.id = provisions_fts.rowid
+        WHERE provisions_fts MATCH 'положение OR текст'
+        ORDER BY p.law_id, p.article`),
+      cross_references: all(`
+        SELECT source_law_id, source_provision_ref, target_law_id FROM cross_references
+        ORDER BY source_law_id, source_provision_ref, target_law_id`),
+      unresolved_references: all(`
+        SELECT source_law_id, source_provision_ref, nd FROM unresolved_references
+        ORDER BY source_law_id, source_provision_ref, nd`),
+      changeset_sequence: all("SELECT value FROM db_metadata WHERE key = 'changeset_sequence'"),
+    };
+  } finally {
+    db.close();
+  }
+}
+
+/** Apply the step's change set, then check the database against a full build. */
+function applyAndCompare(): Record<string, unknown> {
+  applyChangeSets(paths);
+  buildDatabase(false, fullPaths);
+  const db = new Database(paths.dbPath);
+  db.prepare("INSERT INTO provisions_fts(provisions_fts) VALUES('integrity-check')").run();
+  db.close();
+  const applied = snapshot(paths.dbPath);
+  expect(applied).toEqual(snapshot(fullPaths.dbPath));
+  return applied;
+}
+
+beforeAll(() => {
+  root = fs.mkdtempSync(path.join(os.tmpdir(), 'build-db-'));
+  paths = {
+    seedDir: path.join(root, 'seed'),
+    dbPath: path.join(root, 'database.db'),
+    censusPath: path.join(root, 'census.json'),
+    censusDbPath: path.join(root, 'census.sqlite'),
+  };
+  fullPaths = { ...paths, dbPath: path.join(root, 'full.db') };
+  fs.mkdirSync(path.join(paths.seedDir, '_changes'), { recursive: true });
+
+  step({
+    'law-a': {
+      nd: '100',
+      seed: seed('law-a', [
+        { article: '1', content: 'Первый текст закона А.' },
+        { article: '2', title: 'Общее', content: SHARED },
+      ], [{ provision_ref: '1', targets: ['200', '300'] }]),
+    },
+    'law-b': { nd: '200', seed: seed('law-b', [{ article: '1', title: 'Общее', content: SHARED }]) },
+    'law-d': { nd: '400', seed: seed('law-d', [{ article: '1', content: 'Текст закона Д.' }]) },
+  });
+  buildDatabase(false, paths);
+});
+
+afterAll(() => {
+  fs.rmSync(root, { recursive: true, force: true });
+});
+
+describe('build-db.ts --apply', () => {
+  it('stores the links to documents outside the census', () => {
+    const built = snapshot(paths.dbPath);
+    expect(built.cross_references).toEqual([['law-a', '1', 'law-b']]);
+    expect(built.unresolved_references).toEqual([['law-a', '1', '300']]);
+  });
+
+  it('adds a law and resolves the links of unchanged laws to it', () => {
+    step({
+      'law-c': {
+        nd: '300',
+        seed: seed('law-c', [{ article: '1', content: 'Текст закона В.' }], [{ provision_ref: '1', targets: ['400'] }]),
+      },
+    });
+    const applied = applyAndCompare();
+    expect(applied.cross_references).toEqual([
+      ['law-a', '1', 'law-b'], ['law-a', '1', 'law-c'], ['law-c', '1', 'law-d'],
+    ]);
+    expect(applied.unresolved_references).toEqual([]);
+  });
+
+  it('changes a law, removing the provision that holds the text of a duplicate', () => {
+    step({
+      'law-a': {
+        nd: '100',
+        seed: seed('law-a', [
+          { article: '1', content: 'Первый текст закона А в новой редакции.' },
+          { article: '3', content: 'Новая статья закона А.' },
+        ], [{ provision_ref: '3', targets: ['200', '300'] }]),
+      },
+    });
+    const applied = applyAndCompare();
+    // law-b's copy took the text over
+    const lawB = (applied.provisions as unknown[][]).find(p => p[0] === 'law-b')!;
+    expect([...lawB.slice(0, 4), lawB[8]]).toEqual(['law-b', '1', 'Общее', SHARED, 0]);
+  });
+
+  it('removes a law, keeping the links to it until its document returns', () => {
+    step({ 'law-d': null });
+    let applied = applyAndCompare();
+    expect(applied.unresolved_references).toEqual([['law-c', '1', '400']]);
+
+    step({ 'law-d': { nd: '400', seed: seed('law-d', [{ article: '1', content: 'Текст закона Д.' }]) } });
+    applied = applyAndCompare();
+    expect(applied.unresolved_references).toEqual([]);
+    expect(applied.cross_references).toContainEqual(['law-c', '1', 'law-d']);
+  });
+
+  it('renames a law and retargets the links to it', () => {
+    const { seed: old } = current.get('law-b')!;
+    step({ 'law-b': null, 'law-b-2': { nd: '200', seed: { ...old, law: { ...old.law, id: 'law-b-2' } } } });
+    const applied = applyAndCompare();
+    expect(applied.cross_references).toContainEqual(['law-a', '3', 'law-b-2']);
+    expect((applied.cross_references as string[][]).some(ref => ref.includes('law-b'))).toBe(false);
+  });
+});
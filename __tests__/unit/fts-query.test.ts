@@ -70,3 +70,32 @@ describe('buildFtsQueryVariants', () => {
     expect(result.fallback).toBe('защита* OR персональных* OR данных*');
   });
 });
+
+describe('buildFtsQueryVariants with stemmed search', () => {
+  it('matches stems against content_stemmed and the exact form against content', () => {
+    const result = buildFtsQueryVariants('информация', { stemmed: true });
+    expect(result.primary).toBe('(content_stemmed : "информац" OR content : "информация")');
+    expect(result.fallback).toBeUndefined();
+  });
+
+  it('builds AND query with OR fallback and no prefix terms', () => {
+    const result = buildFtsQueryVariants('защита данных', { stemmed: true });
+    expect(result.primary).toBe(
+      '(content_stemmed : "защит" OR content : "защита") AND (content_stemmed : "дан" OR content : "данных")'
+    );
+    expect(result.fallback).toBe(
+      '(content_stemmed : "защит" OR content : "защита") OR (content_stemmed : "дан" OR content : "данных")'
+    );
+    expect(result.primary).not.toContain('*');
+  });
+
+  it('stems every part of an underscore-joined token', () => {
+    const result = buildFtsQueryVariants('закона_РФ', { stemmed: true });
+    expect(result.primary).toBe('(content_stemmed : ("закон" "рф") OR content : "закона_РФ")');
+  });
+
+  it('preserves explicit FTS syntax', () => {
+    expect(buildFtsQueryVariants('информаци*', { stemmed: true }).primary).toBe('информаци*');
+    expect(buildFtsQueryVariants('защита AND данных', { stemmed: true }).primary).toBe('защита AND данных');
+  });
+});
@@ -0,0 +1,88 @@
+import { describe, it, expect, beforeAll, afterAll } from 'vitest';
+import { readFileSync } from 'fs';
+import { join } from 'path';
+import Database from 'better-sqlite3';
+import type { Database as McpDatabase } from '@ansvar/mcp-sqlite';
+import { getProvision, type ProvisionResult } from '../../src/tools/get-provision.js';
+
+const SCHEMA = readFileSync(join(process.cwd(), 'scripts', 'lib', 'schema.sql'), 'utf-8');
+
+// Article 149 as ingest-ruslawod.py --split-parts stores it, article 150 whole
+const PROVISIONS: [string, string | null, string | null, string][] = [
+  ['149', null, null, 'Вводный текст.'],
+  ['149.1', '1', null, '1. Первая часть.'],
+  ['149.2', '2', null, '2. Не подлежит налогообложению:'],
+  ['149.2.1', '2', '1', '1) продажа медицинских товаров;'],
+  ['149.2.2', '2', '2', '2) услуги по уходу\nза больными;'],
+  ['149.2-1', '2.1', null, '2.1. Вставленная часть.'],
+  ['150', null, null, 'Текст статьи без частей.'],
+];
+
+let sqlite: Database.Database;
+let db: McpDatabase;
+
+beforeAll(() => {
+  sqlite = new Database(':memory:');
+  sqlite.exec(SCHEMA);
+  sqlite.prepare(
+    "INSERT INTO laws (id, title, identifier, law_type) VALUES ('nk-rf-2', 'Налоговый кодекс', '117-ФЗ', 'code')"
+  ).run();
+  const insert = sqlite.prepare(`
+    INSERT INTO provisions (law_id, article, title, content, part, paragraph, provision_ref, order_index)
+    VALUES ('nk-rf-2', ?, 'Освобождение от налогообложения', ?, ?, ?, ?, ?)
+  `);
+  PROVISIONS.forEach(([ref, part, paragraph, content], i) => {
+    insert.run(ref.split('.')[0], content, part, paragraph, ref, i);
+  });
+  sqlite.prepare(`
+    INSERT INTO cross_references (source_law_id, source_provision_ref, target_law_id, ref_type)
+    VALUES ('nk-rf-2', '149', 'gk-rf', 'reference')
+  `).run();
+  db = sqlite as unknown as McpDatabase;
+});
+
+afterAll(() => {
+  sqlite.close();
+});
+
+async function lookup(input: Record<string, string>): Promise<ProvisionResult> {
+  const response = await getProvision(db, { document_id: 'nk-rf-2', ...input });
+  expect(Array.isArray(response.results)).toBe(false);
+  return response.results as ProvisionResult;
+}
+
+describe('getProvision on a --split-parts database', () => {
+  it('returns a split article as one provision with its parts listed', async () => {
+    const result = await lookup({ section: '149' });
+    expect(result).toMatchObject({ provision_ref: '149', section: '149', part: null, paragraph: null });
+    expect(result.content).toBe(PROVISIONS.slice(0, 6).map(([, , , content]) => content).join('\n'));
+    expect(result.parts).toEqual(['149', '149.1', '149.2', '149.2.1', '149.2.2', '149.2-1']);
+    expect(result.cross_references).toEqual([
+      { target_document_id: 'gk-rf', target_provision_ref: null, ref_type: 'reference' },
+    ]);
+  });
+
+  it('returns a part with its items, by part or by provision_ref', async () => {
+    for (const input of [{ section: '149', part: '2' }, { provision_ref: '149.2' }]) {
+      const result = await lookup(input);
+      expect(result).toMatchObject({ provision_ref: '149.2', part: '2', paragraph: null });
+      expect(result.content).toBe('2. Не подлежит налогообложению:\n1) продажа медицинских товаров;\n' +
+        '2) услуги по уходу\nза больными;');
+      expect(result.parts).toEqual(['149.2', '149.2.1', '149.2.2']);
+    }
+  });
+
+  it('returns a single row as it is stored', async () => {
+    expect(await lookup({ section: '149', part: '2', paragraph: '2' })).toMatchObject({
+      provision_ref: '149.2.2', part: '2', paragraph: '2', content: '2) услуги по уходу\nза больными;', parts: [],
+    });
+    expect(await lookup({ provision_ref: '149.2-1' })).toMatchObject({ provision_ref: '149.2-1', part: '2.1', parts: [] });
+    expect(await lookup({ section: '150' })).toMatchObject({ content: 'Текст статьи без частей.', parts: [] });
+  });
+
+  it('returns null for a missing provision and a list for the whole document', async () => {
+    expect((await getProvision(db, { document_id: 'nk-rf-2', section: '151' })).results).toBeNull();
+    const all = (await getProvision(db, { document_id: 'nk-rf-2' })).results as ProvisionResult[];
+    expect(all.map(p => p.provision_ref)).toEqual(PROVISIONS.map(([ref]) => ref));
+  });
+});
@@ -0,0 +1,90 @@
+import { describe, it, expect, beforeAll, afterAll } from 'vitest';
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import Database from 'better-sqlite3';
+import type { Database as McpDatabase } from '@ansvar/mcp-sqlite';
+import { buildDatabase } from '../../scripts/build-db.js';
+import { getProvision, type ProvisionResult } from '../../src/tools/get-provision.js';
+import { searchLegislation } from '../../src/tools/search-legislation.js';
+import { buildLegalStance } from '../../src/tools/build-legal-stance.js';
+
+// An article restated word for word by a second (repealed) law is stored once, by build-db.ts
+const SHARED = 'Оператор обязан обеспечить конфиденциальность персональных данных субъекта.';
+
+let root: string;
+let sqlite: Database.Database;
+let db: McpDatabase;
+
+function writeSeed(seedDir: string, id: string, status: string, provisions: Array<{ article: string; title: string; content: string }>) {
+  fs.writeFileSync(path.join(seedDir, `${id}.json`), JSON.stringify({
+    law: { id, title: `Федеральный закон ${id}`, identifier: id, law_type: 'federal_law', status },
+    provisions: provisions.map(p => ({ ...p, provision_ref: p.article })),
+  }));
+}
+
+beforeAll(() => {
+  root = fs.mkdtempSync(path.join(os.tmpdir(), 'provision-duplicates-'));
+  const seedDir = path.join(root, 'seed');
+  fs.mkdirSync(seedDir);
+  writeSeed(seedDir, 'fz-152-2006', 'in_force', [
+    { article: '7', title: 'Конфиденциальность', content: SHARED },
+    { article: '8', title: 'Общедоступные источники', content: 'Общедоступные источники персональных данных.' },
+  ]);
+  writeSeed(seedDir, 'fz-99-2001', 'repealed', [{ article: '3', title: 'Конфиденциальность', content: SHARED }]);
+  const dbPath = path.join(root, 'database.db');
+  buildDatabase(false, {
+    seedDir,
+    dbPath,
+    censusPath: path.join(root, 'census.json'),
+    censusDbPath: path.join(root, 'census.sqlite'),
+  });
+  sqlite = new Database(dbPath, { readonly: true });
+  db = sqlite as unknown as McpDatabase;
+});
+
+afterAll(() => {
+  sqlite.close();
+  fs.rmSync(root, { recursive: true, force: true });
+});
+
+describe('exact duplicate provisions', () => {
+  it('are stored once', () => {
+    const rows = sqlite.prepare(
+      "SELECT law_id, article, content = '' AS empty, duplicate_of IS NOT NULL AS duplicate FROM provisions ORDER BY law_id, article"
+    ).raw().all();
+    expect(rows).toEqual([['fz-152-2006', '7', 0, 0], ['fz-152-2006', '8', 0, 0], ['fz-99-2001', '3', 1, 1]]);
+  });
+
+  it('return the text of the provision they duplicate from get_provision', async () => {
+    for (const document_id of ['fz-152-2006', 'fz-99-2001']) {
+      const section = document_id === 'fz-152-2006' ? '7' : '3';
+      const result = (await getProvision(db, { document_id, section })).results as ProvisionResult;
+      expect(result).toMatchObject({ document_id, section, content: SHARED });
+    }
+    const all = (await getProvision(db, { document_id: 'fz-99-2001' })).results as ProvisionResult[];
+    expect(all.map(p => p.content)).toEqual([SHARED]);
+  });
+
+  it('are reported once by search_legislation, as the first provision passing the filters', async () => {
+    const { results } = await searchLegislation(db, { query: 'конфиденциальность' });
+    expect(results.map(r => [r.document_id, r.section])).toEqual([['fz-152-2006', '7']]);
+    expect(results[0].snippet).toContain('>>>конфиденциальность<<<');
+
+    const repealed = await searchLegislation(db, { query: 'конфиденциальность', status: 'repealed' });
+    expect(repealed.results.map(r => [r.document_id, r.section])).toEqual([['fz-99-2001', '3']]);
+    expect(repealed.results[0].snippet).toBe(results[0].snippet);
+
+    const byDocument = await searchLegislation(db, { query: 'конфиденциальность', document_id: 'fz-99-2001' });
+    expect(byDocument.results.map(r => r.document_id)).toEqual(['fz-99-2001']);
+  });
+
+  it('are reported once by build_legal_stance', async () => {
+    const { results } = await buildLegalStance(db, { query: 'конфиденциальность персональных данных' });
+    expect(results.provisions.map(p => [p.document_id, p.provision_ref])).toEqual([['fz-152-2006', '7']]);
+    expect(new Set(results.provisions.map(p => p.snippet)).size).toBe(results.provisions.length);
+
+    const byDocument = await buildLegalStance(db, { query: 'конфиденциальность', document_id: 'fz-99-2001' });
+    expect(byDocument.results.provisions.map(p => [p.document_id, p.provision_ref])).toEqual([['fz-99-2001', '3']]);
+  });
+});
@@ -0,0 +1,187 @@
+import { describe, it, expect, beforeAll, afterAll } from 'vitest';
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import Database from 'better-sqlite3';
+import type { Database as McpDatabase } from '@ansvar/mcp-sqlite';
+import { buildDatabase } from '../../scripts/build-db.js';
+import { compressProvisionText } from '../../scripts/lib/provision-compression.js';
+import { getProvision, type ProvisionResult } from '../../src/tools/get-provision.js';
+import { searchLegislation } from '../../src/tools/search-legislation.js';
+import { buildLegalStance } from '../../src/tools/build-legal-stance.js';
+import {
+  PROVISION_TEXT_CACHE_SIZE,
+  hasCompressedText,
+  inflateProvisionText,
+  provisionText,
+  registerProvisionText,
+  useFtsText,
+} from '../../src/utils/provision-text.js';
+
+// The same seeds built plain and with --compress must answer every tool the same way
+
+const SUBJECTS = ['персональных данных', 'налоговой декларации', 'трудового договора', 'государственной регистрации'];
+const VERBS = ['обязан обеспечить', 'вправе требовать', 'не допускается', 'осуществляется в порядке'];
+
+/** A long article, so that snippets are cut from the middle of the text. */
+function article(n: number): string {
+  const sentences = Array.from({ length: 6 }, (_, i) =>
+    `${i + 1}. Оператор ${VERBS[(n + i) % VERBS.length]} соблюдение правил ${SUBJECTS[(n * 3 + i) % SUBJECTS.length]} ` +
+    `в течение ${n + i} рабочих дней со дня обращения субъекта.`
+  );
+  return sentences.join('\n');
+}
+
+const LAWS: Array<{ id: string; status: string; provisions: Array<{ article: string; title: string; content: string }> }> = [
+  {
+    id: 'fz-152-2006',
+    status: 'in_force',
+    provisions: Array.from({ length: PROVISION_TEXT_CACHE_SIZE + 40 }, (_, i) => ({
+      article: String(i + 1),
+      title: `Статья ${i + 1}. ${SUBJECTS[i % SUBJECTS.length]}`,
+      content: article(i),
+    })),
+  },
+  {
+    id: 'fz-99-2001',
+    status: 'repealed',
+    provisions: [
+      { article: '1', title: 'Статья 1. персональных данных', content: article(0) },
+      { article: '2', title: 'Статья 2. Сроки', content: 'Срок хранения документов составляет пять лет.' },
+    ],
+  },
+];
+
+const QUERIES = ['персональных данных', 'налоговой', 'договор', 'обязан обеспечить', 'сроки хранения', 'рабочих дней'];
+
+let root: string;
+let plain: Database.Database;
+let compressed: Database.Database;
+
+function build(compress: boolean): Database.Database {
+  const dbPath = path.join(root, compress ? 'compressed.db' : 'plain.db');
+  buildDatabase(compress, {
+    seedDir: path.join(root, 'seed'),
+    dbPath,
+    censusPath: path.join(root, 'census.json'),
+    censusDbPath: path.join(root, 'census.sqlite'),
+  });
+  return new Database(dbPath);
+}
+
+beforeAll(() => {
+  root = fs.mkdtempSync(path.join(os.tmpdir(), 'provision-text-'));
+  fs.mkdirSync(path.join(root, 'seed'));
+  for (const law of LAWS) {
+    fs.writeFileSync(path.join(root, 'seed', `${law.id}.json`), JSON.stringify({
+      law: { id: law.id, title: `Федеральный закон ${law.id}`, identifier: law.id, law_type: 'federal_law', status: law.status },
+      provisions: law.provisions.map(p => ({ ...p, provision_ref: p.article })),
+    }));
+  }
+  plain = build(false);
+  compressed = build(true);
+});
+
+afterAll(() => {
+  plain.close();
+  compressed.close();
+  fs.rmSync(root, { recursive: true, force: true });
+});
+
+const mcp = (db: Database.Database) => db as unknown as McpDatabase;
+
+describe('a database built with --compress', () => {
+  it('stores no plain text', () => {
+    expect(hasCompressedText(mcp(plain))).toBe(false);
+    expect(hasCompressedText(mcp(compressed))).toBe(true);
+    expect(compressed.prepare(
+      "SELECT COUNT(*) FROM provisions WHERE content <> '' OR content_stemmed IS NOT NULL"
+    ).pluck().get()).toBe(0);
+  });
+
+  it('answers search_legislation with the rows and snippets of the plain database', async () => {
+    let hits = 0;
+    for (const query of QUERIES) {
+      for (const filters of [{}, { status: 'repealed' }, { document_id: 'fz-152-2006' }]) {
+        const input = { query, limit: 50, ...filters };
+        const expected = (await searchLegislation(mcp(plain), input)).results;
+        expect((await searchLegislation(mcp(compressed), input)).results).toEqual(expected);
+        hits += expected.length;
+      }
+    }
+    expect(hits).toBeGreaterThan(100);
+    const { results } = await searchLegislation(mcp(compressed), { query: 'обязан обеспечить' });
+    expect(results[0].snippet).toContain('>>>обязан<<< >>>обеспечить<<<');
+  });
+
+  it('answers build_legal_stance and get_provision like the plain database', async () => {
+    for (const query of QUERIES) {
+      const input = { query, limit: 20 };
+      expect((await buildLegalStance(mcp(compressed), input)).results)
+        .toEqual((await buildLegalStance(mcp(plain), input)).results);
+    }
+    for (const document_id of ['fz-99-2001', 'fz-152-2006']) {
+      const all = (await getProvision(mcp(compressed), { document_id })).results as ProvisionResult[];
+      expect(all).toEqual((await getProvision(mcp(plain), { document_id })).results);
+    }
+  });
+
+  it('rebuilds and checks its index with provision_text() registered', () => {
+    useFtsText(mcp(compressed));
+    const before = compressed.prepare(
+      "SELECT rowid, snippet(provisions_fts, 0, '[', ']', '...', 8) FROM provisions_fts WHERE provisions_fts MATCH 'сроки' ORDER BY rowid"
+    ).raw().all();
+    compressed.prepare("INSERT INTO provisions_fts(provisions_fts) VALUES('rebuild')").run();
+    compressed.prepare("INSERT INTO provisions_fts(provisions_fts) VALUES('integrity-check')").run();
+    expect(compressed.prepare(
+      "SELECT rowid, snippet(provisions_fts, 0, '[', ']', '...', 8) FROM provisions_fts WHERE provisions_fts MATCH 'сроки' ORDER BY rowid"
+    ).raw().all()).toEqual(before);
+  });
+});
+
+describe('provision-text', () => {
+  const dictionary = () => compressed.prepare('SELECT dictionary FROM content_dictionary').pluck().get() as Buffer;
+
+  it('inflates text compressed against the dictionary', () => {
+    const text = article(7);
+    expect(inflateProvisionText(compressProvisionText(text, dictionary()), dictionary())).toBe(text);
+  });
+
+  it('keeps the most recently read texts', () => {
+    const db = new Database(path.join(root, 'compressed.db'));
+    try {
+      expect([provisionText(mcp(db), 1), provisionText(mcp(db), 2)]).toEqual([article(0), article(1)]);
+      db.prepare('UPDATE provisions SET content_z = ? WHERE id IN (1, 2)')
+        .run(compressProvisionText('Изменено.', dictionary()));
+
+      for (let id = 3; id <= PROVISION_TEXT_CACHE_SIZE; id++) {
+        provisionText(mcp(db), id);
+      }
+      // Full: reading id 1 makes it the most recent, so the next text read evicts id 2
+      expect(provisionText(mcp(db), 1)).toBe(article(0));
+      provisionText(mcp(db), PROVISION_TEXT_CACHE_SIZE + 1);
+      expect(provisionText(mcp(db), 1)).toBe(article(0));
+      expect(provisionText(mcp(db), 2)).toBe('Изменено.');
+    } finally {
+      db.close();
+    }
+  });
+
+  it('registers provision_text() once per connection, only for compressed databases', () => {
+    const db = new Database(path.join(root, 'compressed.db'), { readonly: true });
+    try {
+      expect(() => db.prepare('SELECT provision_text(content_z) FROM provisions WHERE id = 3').get()).toThrow();
+      useFtsText(mcp(db));
+      useFtsText(mcp(db));
+      expect(db.prepare('SELECT provision_text(content_z) FROM provisions WHERE id = 3').pluck().get()).toBe(article(2));
+      expect(db.prepare('SELECT provision_text(NULL)').pluck().get()).toBeNull();
+    } finally {
+      db.close();
+    }
+    expect(() => useFtsText(mcp(plain))).not.toThrow();
+  });
+
+  it('names the missing feature when the driver cannot register functions', () => {
+    expect(() => registerProvisionText({}, dictionary())).toThrow(/cannot register functions/);
+  });
+});
@@ -0,0 +1,32 @@
+import { readFileSync } from 'fs';
+import { join } from 'path';
+import { describe, it, expect } from 'vitest';
+import { stemRu, stemText } from '../../src/utils/stemmer-ru.js';
+
+const fixturesPath = join(process.cwd(), 'fixtures', 'stemmer-ru.json');
+const fixture = JSON.parse(readFileSync(fixturesPath, 'utf-8')) as { cases: Record<string, string> };
+
+describe('stemRu', () => {
+  it('matches the stems shared with the Python ingester', () => {
+    const mismatches = Object.entries(fixture.cases)
+      .filter(([word, stem]) => stemRu(word) !== stem)
+      .map(([word, stem]) => `${word}: expected ${stem}, got ${stemRu(word)}`);
+    expect(mismatches).toEqual([]);
+  });
+
+  it('leaves words without vowels unchanged', () => {
+    expect(stemRu('рф')).toBe('рф');
+    expect(stemRu('2006')).toBe('2006');
+  });
+});
+
+describe('stemText', () => {
+  it('tokenizes like the FTS5 unicode61 tokenizer and lowercases', () => {
+    expect(stemText('Статья 6. Обработка ПЕРСОНАЛЬНЫХ данных (152-ФЗ), ёмкость_сети'))
+      .toBe('стат 6 обработк персональн дан 152 фз емкост сет');
+  });
+
+  it('returns an empty string for punctuation only', () => {
+    expect(stemText(' \n—\t')).toBe('');
+  });
+});
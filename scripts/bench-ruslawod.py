@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Russian Law MCP — Offline Benchmarks for the RusLawOD Ingester
+
+Generates a synthetic corpus that looks like RusLawOD (ref tags, Раздел/Глава
+headings, Приложение blocks, duplicated articles, one multi-megabyte code)
+and times each ingestion stage of scripts/ingest-ruslawod.py on it, without
+touching Hugging Face.
+
+For every stage it reports docs/s, MB/s of text and peak Python heap
+(tracemalloc, measured in a separate untimed run; DuckDB's own allocations
+are not included). Each stage time is normalized by a fixed calibration
+workload timed right before it, then compared with the stored baseline; a stage that got slower or hungrier
+than the tolerance allows fails the run.
+
+Usage:
+  python3 scripts/bench-ruslawod.py                      # Run and compare with the baseline
+  python3 scripts/bench-ruslawod.py --update-baseline    # Record a new baseline
+  python3 scripts/bench-ruslawod.py --stages scan_provisions,render_seed
+  python3 scripts/bench-ruslawod.py --json-out bench.json
+  python3 scripts/bench-ruslawod.py --write-mirror /tmp/ruslawod  # Synthetic ruslawod_NN.parquet files
+"""
+
+import gc
+import importlib.util
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Optional
+
+SCRIPT_DIR = Path(__file__).parent
+INGESTER_PATH = SCRIPT_DIR / "ingest-ruslawod.py"
+BASELINE_PATH = SCRIPT_DIR / "bench-ruslawod.baseline.json"
+
+
+def load_ingester():
+    if "ingest_ruslawod" in sys.modules:
+        return sys.modules["ingest_ruslawod"]
+    spec = importlib.util.spec_from_file_location("ingest_ruslawod", INGESTER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["ingest_ruslawod"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+ingest = load_ingester()
+duckdb = ingest.duckdb
+
+# ---------------------------------------------------------------------------
+# Synthetic corpus
+# ---------------------------------------------------------------------------
+
+# Columns read from the RusLawOD parquet files, in the ingester's order
+PARQUET_COLUMNS = [
+    "pravogovruNd", "doc_typeIPS", "headingIPS", "docNumberIPS",
+    "docdateIPS", "statusIPS", "issuedByIPS", "textIPS",
+]
+
+WORDS = (
+    "настоящий федеральный закон регулирует отношения возникающие при осуществлении деятельности "
+    "органов государственной власти российской федерации субъектов местного самоуправления граждан "
+    "юридических лиц в соответствии с законодательством порядке установленном правительством "
+    "права обязанности ответственность за нарушение требований предусмотренных статьей пунктом "
+    "частью настоящего кодекса иными нормативными правовыми актами включая сведения документы"
+).split()
+
+CHAPTER_TITLES = ["Общие положения", "Права и обязанности", "Государственное регулирование",
+                  "Ответственность", "Заключительные положения", "Порядок рассмотрения"]
+
+CODE_NAMES = ["Гражданский кодекс", "Налоговый кодекс", "Трудовой кодекс", "Земельный кодекс", "Водный кодекс"]
+CODE_PARTS = ["часть первая", "часть вторая", "часть третья", "часть четвертая"]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _with_markup(rng: random.Random, sentence: str) -> str:
+    """Sprinkle a sentence with what RusLawOD text carries: ref tags, nbsp, dashes, double spaces."""
+    words = sentence.split(" ")
+    for _ in range(rng.randint(0, 2)):
+        i = rng.randrange(len(words))
+        words[i] = f'<ref nd="{rng.randint(102000000, 102999999)}">{words[i]}</ref>'
+    text = " ".join(words)
+    if rng.random() < 0.3:
+        text = text.replace(" ", " ", 1)
+    if rng.random() < 0.2:
+        text = text.replace(" ", " — ", 1)
+    if rng.random() < 0.3:
+        text = text.replace(" ", "  ", 2)
+    return text
+
+
+def generate_text(rng: random.Random, articles: int, paragraphs: tuple[int, int] = (1, 5),
+                  appendix: bool = False) -> str:
+    """A federal law or code in RusLawOD's textIPS shape."""
+    lines = ["ФЕДЕРАЛЬНЫЙ ЗАКОН", "", _sentence(rng, 6).upper(), "", "Принят Государственной Думой", ""]
+    chapter = 0
+    section = 0
+    n = 0
+    while n < articles:
+        if n % 40 == 0:
+            section += 1
+            lines += [f"Раздел {['I', 'II', 'III', 'IV', 'V', 'VI', 'VII'][min(section, 7) - 1]}. {rng.choice(CHAPTER_TITLES)}", ""]
+        if n % 8 == 0:
+            chapter += 1
+            lines += [f"Глава {chapter}. {rng.choice(CHAPTER_TITLES)}", ""]
+        n += 1
+        number = f"{n}.{rng.randint(1, 3)}" if rng.random() < 0.05 else str(n)
+        style = rng.random()
+        if style < 0.8:
+            lines.append(f"Статья {number}. {_sentence(rng, rng.randint(2, 6))[:-1]}")
+        elif style < 0.9:
+            lines.append(f"Статья {number} {_sentence(rng, 3)[:-1]}")
+        else:
+            lines.append(f"Статья {number}. 1. {_sentence(rng, 8)}")
+        for p in range(1, rng.randint(*paragraphs) + 1):
+            lines.append(f"{p}. {_with_markup(rng, _sentence(rng, rng.randint(10, 40)))}")
+            if rng.random() < 0.3:
+                for letter in "абв"[:rng.randint(1, 3)]:
+                    lines.append(f"{letter}) {_with_markup(rng, _sentence(rng, rng.randint(5, 15)))}")
+        lines.append("")
+        if rng.random() < 0.2:
+            lines.append("")
+        # Amended texts repeat an article (old and new edition)
+        if rng.random() < 0.03:
+            lines += [f"Статья {number}. {_sentence(rng, 3)[:-1]}", _with_markup(rng, _sentence(rng, 20)), ""]
+
+    lines += ["Президент Российской Федерации", "В.ПУТИН", "Москва, Кремль", ""]
+    if appendix:
+        for k in range(1, rng.randint(2, 4)):
+            lines += [f"Приложение {k}", "к Федеральному закону", "", "ПЕРЕЧЕНЬ", ""]
+            lines += [f"{i}. {_sentence(rng, rng.randint(4, 12))}" for i in range(1, rng.randint(5, 30))]
+            lines.append("")
+    return "\n".join(lines)
+
+
+def generate_code_text(rng: random.Random, target_bytes: int) -> str:
+    """A code (кодекс) of roughly target_bytes UTF-8 bytes."""
+    return generate_text(rng, max(1, target_bytes // 1800), paragraphs=(2, 7), appendix=True)
+
+
+def generate_rows(docs: int = 200, code_mb: float = 4.0, seed: int = 1) -> list[tuple]:
+    """RusLawOD-shaped rows: mostly federal laws, a few codes (one of about code_mb MB),
+    constitutional laws, id collisions and non-federal rows the filter must drop."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(docs):
+        nd = str(102000000 + i * 37)
+        year = rng.randint(1994, 2023)
+        date = f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{year}"
+        status = rng.choice(["Действует", "Действует с изменениями", "Утратил силу", ""])
+        kind = rng.random()
+        if i == 0:
+            name = rng.choice(CODE_NAMES)
+            rows.append((nd, "Кодекс", f"{name} Российской Федерации ({rng.choice(CODE_PARTS)})",
+                         f"{rng.randint(1, 200)}-ФЗ", date, status, "Федеральный закон",
+                         generate_code_text(rng, int(code_mb * 1024 * 1024))))
+        elif kind < 0.03:
+            rows.append((nd, "Кодекс", f"{rng.choice(CODE_NAMES)} Российской Федерации", f"{rng.randint(1, 200)}-ФЗ",
+                         date, status, "Федеральный закон", generate_text(rng, rng.randint(80, 200), appendix=True)))
+        elif kind < 0.08:
+            rows.append((nd, "Федеральный конституционный закон", f"О {_sentence(rng, 4)[:-1].lower()}",
+                         f"{rng.randint(1, 9)}-ФКЗ", date, status, "Федеральный конституционный закон",
+                         generate_text(rng, rng.randint(5, 40))))
+        elif kind < 0.15:
+            rows.append((nd, "Постановление", _sentence(rng, 6), str(rng.randint(1, 2000)), date, status,
+                         "Правительство Российской Федерации", generate_text(rng, rng.randint(2, 10))))
+        elif kind < 0.18:
+            # Same number and date as an earlier law: an id collision
+            rows.append((nd, "Федеральный закон", _sentence(rng, 5), "1-ФЗ", "01.01.2001", status,
+                         "Федеральный закон", generate_text(rng, rng.randint(3, 20))))
+        elif kind < 0.20:
+            rows.append((nd, "nan", _sentence(rng, 5), "", "", "", "Федеральный закон", rng.choice(["", "коротко"])))
+        else:
+            rows.append((nd, "Федеральный закон", f"О {_sentence(rng, 5)[:-1].lower()}",
+                         f"{rng.randint(1, 600)}-ФЗ", date, status, "Федеральный закон",
+                         generate_text(rng, rng.randint(3, 60), appendix=rng.random() < 0.2)))
+    return rows
+
+
+def write_parquet(path: Path, rows: list[tuple]) -> str:
+    """Write rows as a parquet file with the RusLawOD column names (all VARCHAR)."""
+    con = duckdb.connect()
+    try:
+        columns = ", ".join(f"{c} VARCHAR" for c in PARQUET_COLUMNS)
+        con.execute(f"CREATE TABLE docs ({columns})")
+        placeholders = ", ".join(f"${i + 1}" for i in range(len(PARQUET_COLUMNS)))
+        con.executemany(f"INSERT INTO docs VALUES ({placeholders})", rows)
+        con.execute(f"COPY docs TO '{str(path).replace(chr(39), chr(39) * 2)}' (FORMAT parquet)")
+    finally:
+        con.close()
+    return str(path)
+
+
+def write_mirror(directory: Path, docs: int, code_mb: float, seed: int) -> None:
+    """Write ruslawod_01..11.parquet for --source runs of the ingester."""
+    directory.mkdir(parents=True, exist_ok=True)
+    rows = generate_rows(docs, code_mb, seed)
+    for i, name in enumerate(ingest.PARQUET_NAMES):
+        write_parquet(directory / name, rows[i::len(ingest.PARQUET_NAMES)])
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+class Corpus:
+    def __init__(self, docs: int, code_mb: float, seed: int, workdir: Path):
+        self.rows = generate_rows(docs, code_mb, seed)
+        self.texts = [row[7] for row in self.rows]
+        self.text_bytes = sum(len(t.encode("utf-8")) for t in self.texts)
+        self.cleaned = [ingest.clean_text(t) for t in self.texts]
+        self.workdir = workdir
+        self.parquet = write_parquet(workdir / "ruslawod_01.parquet", self.rows)
+
+        text_by_nd = {row[0]: row[7] for row in self.rows}
+        self.census = census(self.parquet)
+        self.laws = [dict(entry, last_updated="2024-01-01") for entry in self.census]
+        self.federal_texts = [text_by_nd[entry["nd"]] for entry in self.census]
+        self.federal_bytes = sum(len(t.encode("utf-8")) for t in self.federal_texts)
+
+
+def census(parquet: str) -> list[dict]:
+    con = duckdb.connect()
+    try:
+        entries, _, _ = ingest.ingest_batch(con, parquet, census_only=True)
+    finally:
+        con.close()
+    return entries
+
+
+def stage_clean_text(c: Corpus) -> int:
+    for text in c.texts:
+        ingest.clean_text(text)
+    return len(c.texts)
+
+
+def stage_parse_articles(c: Corpus) -> int:
+    for text in c.cleaned:
+        ingest.parse_articles(text)
+    return len(c.cleaned)
+
+
+def stage_scan_provisions(c: Corpus) -> int:
+    for text in c.texts:
+        ingest.scan_provisions(text)
+    return len(c.texts)
+
+
+def stage_render_seed(c: Corpus) -> int:
+    for law, text in zip(c.laws, c.federal_texts):
+        ingest.render_seed(law, text)
+    return len(c.laws)
+
+
+def stage_census_entry(c: Corpus) -> int:
+    for row in c.rows:
+        ingest.census_entry(*row)
+    return len(c.rows)
+
+
+def stage_census_query(c: Corpus) -> int:
+    return len(census(c.parquet))
+
+
+def _fresh_dir(c: Corpus, name: str) -> Path:
+    return Path(tempfile.mkdtemp(prefix=f"{name}-", dir=c.workdir))
+
+
+def _ingest(c: Corpus, **kwargs) -> int:
+    """The ingester's two passes over one file: id assignment, then parse and write (prefetched, as by default)."""
+    law_ids, _ = ingest.assign_law_ids([census(c.parquet)])
+    con = duckdb.connect()
+    try:
+        entries, _, _ = ingest.ingest_batch(con, c.parquet, census_only=False, law_ids=law_ids[0],
+                                            prefetch=ingest.PREFETCH_BATCHES, **kwargs)
+    finally:
+        con.close()
+    return len(entries)
+
+
+def stage_ingest_seeds(c: Corpus) -> int:
+    ingest.SEED_DIR = _fresh_dir(c, "seed")
+    return _ingest(c)
+
+
+def stage_ingest_sqlite(c: Corpus) -> int:
+    db = ingest.SqliteOutput(_fresh_dir(c, "db") / "database.db")
+    docs = _ingest(c, db=db)
+    db.finish()
+    return docs
+
+
+STAGES: dict[str, Callable[[Corpus], int]] = {
+    "clean_text": stage_clean_text,
+    "parse_articles": stage_parse_articles,
+    "scan_provisions": stage_scan_provisions,
+    "render_seed": stage_render_seed,
+    "census_entry": stage_census_entry,
+    "census_query": stage_census_query,
+    "ingest_seeds": stage_ingest_seeds,
+    "ingest_sqlite": stage_ingest_sqlite,
+}
+
+# Text each stage processes, for MB/s; the census stages only see metadata
+STAGE_TEXT = {
+    "clean_text": "text_bytes",
+    "parse_articles": "text_bytes",
+    "scan_provisions": "text_bytes",
+    "render_seed": "federal_bytes",
+    "ingest_seeds": "federal_bytes",
+    "ingest_sqlite": "federal_bytes",
+}
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+CALIBRATION_TEXT = ("Статья 1. Предмет регулирования  настоящего закона\n" * 2000)
+
+
+def calibrate() -> float:
+    """Seconds for a fixed string/regex workload, to normalize stage times across machines."""
+    pattern = re.compile(r"Статья\s+(\d+)\.\s*(.*)")
+    start = time.perf_counter()
+    for _ in range(20):
+        lines = CALIBRATION_TEXT.replace("  ", " ").split("\n")
+        matches = [pattern.match(line) for line in lines]
+        json.dumps([m.group(2) for m in matches if m], ensure_ascii=False)
+    return time.perf_counter() - start
+
+
+def measure(name: str, corpus: Corpus, repeat: int) -> dict:
+    """Best of repeat timed runs, each right after a calibration run, then one traced run for memory."""
+    stage = STAGES[name]
+    best = calibration = float("inf")
+    docs = 0
+    for _ in range(repeat):
+        gc.collect()
+        calibration = min(calibration, calibrate())
+        start = time.perf_counter()
+        docs = stage(corpus)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    stage(corpus)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mb = getattr(corpus, STAGE_TEXT[name]) / (1024 * 1024) if name in STAGE_TEXT else 0.0
+    return {
+        "seconds": round(best, 4),
+        "calibration_s": round(calibration, 5),
+        "docs": docs,
+        "docs_per_s": round(docs / best, 1),
+        "mb_per_s": round(mb / best, 2) if mb else None,
+        "peak_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of results against baseline, as readable lines (empty if none)."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            continue
+        normalized = result["seconds"] / result["calibration_s"]
+        base_normalized = base["seconds"] / base["calibration_s"]
+        if normalized > base_normalized * (1 + tolerance):
+            regressions.append(f"{name}: {normalized / base_normalized:.2f}x the baseline time")
+        if result["peak_mb"] > base["peak_mb"] * (1 + tolerance) + 1:
+            regressions.append(f"{name}: peak memory {result['peak_mb']} MB (baseline {base['peak_mb']} MB)")
+    return regressions
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the RusLawOD ingester")
+    parser.add_argument("--docs", type=int, default=200, help="Documents in the synthetic corpus (default: 200)")
+    parser.add_argument("--code-mb", type=float, default=4.0, help="Size of the largest code in MB (default: 4)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the corpus (default: 1)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage; the best counts (default: 5)")
+    parser.add_argument("--stages", help=f"Comma-separated subset of: {', '.join(STAGES)}")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown or memory growth vs. the baseline (default: 0.25)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Record the results as the new baseline")
+    parser.add_argument("--json-out", type=Path, help="Also write the results as JSON")
+    parser.add_argument("--write-mirror", type=Path, metavar="DIR",
+                        help="Only write a synthetic ruslawod_NN.parquet mirror to DIR and exit")
+    args = parser.parse_args()
+
+    if args.write_mirror:
+        write_mirror(args.write_mirror, args.docs, args.code_mb, args.seed)
+        print(f"Synthetic mirror: {args.write_mirror} ({args.docs} documents)")
+        return
+
+    names = args.stages.split(",") if args.stages else list(STAGES)
+    unknown = [n for n in names if n not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    config = {"docs": args.docs, "code_mb": args.code_mb, "seed": args.seed}
+
+    baseline: Optional[dict] = None
+    if not args.update_baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("config") != config:
+            parser.error(f"baseline {args.baseline} was recorded with {baseline.get('config')}; "
+                         "use the same corpus settings or --update-baseline")
+
+    print("=" * 70)
+    print("Russian Law MCP — RusLawOD Ingester Benchmarks")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory(prefix="bench-ruslawod-") as workdir:
+        corpus = Corpus(args.docs, args.code_mb, args.seed, Path(workdir))
+        print(f"Corpus: {len(corpus.rows)} documents, {corpus.text_bytes / (1024 * 1024):.1f} MB of text "
+              f"({len(corpus.laws)} federal)")
+        print()
+        print(f"  {'stage':<16} {'seconds':>9} {'docs/s':>10} {'MB/s':>8} {'peak MB':>9}")
+        results = {}
+        for name in names:
+            result = measure(name, corpus, args.repeat)
+            results[name] = result
+            mb_per_s = f"{result['mb_per_s']:.2f}" if result["mb_per_s"] is not None else "-"
+            print(f"  {name:<16} {result['seconds']:>9.3f} {result['docs_per_s']:>10.1f} "
+                  f"{mb_per_s:>8} {result['peak_mb']:>9.2f}")
+
+    report = {
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "duckdb": duckdb.__version__,
+        "config": config,
+        "stages": results,
+    }
+    if args.json_out:
+        args.json_out.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    if args.update_baseline:
+        if args.stages and args.baseline.exists():
+            previous = json.loads(args.baseline.read_text(encoding="utf-8"))
+            if previous.get("config") == config:
+                report["stages"] = {**previous["stages"], **results}
+        args.baseline.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline written: {args.baseline}")
+        return
+
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one.")
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nREGRESSIONS (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions against {args.baseline.name} (tolerance {args.tolerance:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,80 @@
 /**
  * Database builder for Russian Law MCP server.
  *
- * Builds the SQLite database from seed JSON files in data/seed/.
+ * Builds the SQLite database from seed JSON files in data/seed/, and from
+ * the compressed NDJSON shards in data/seed/_shards/ written by
+ * `ingest-ruslawod.py --seed-format shards`. A law present in the shards
+ * is not loaded again from a per-law file.
+ *
+ * Seeds from `ingest-ruslawod.py` list the dataset's <ref nd="..."> links;
+ * they become cross_references rows with targets resolved to law ids
+ * through the census (data/census.sqlite, or data/census.json). Links to a
+ * document the census does not have wait in unresolved_references.
+ *
+ * A provision with the same title and content as one already stored is an
+ * exact duplicate (a re-publication, a collision variant, an article
+ * restated by an amending law): it is stored with empty content and
+ * duplicate_of pointing at the provision that holds the text, and is left
+ * out of provisions_fts.
+ *
+ * With --apply, the change sets the ingester wrote to data/seed/_changes/
+ * since the database was built are applied to it in place: only the laws
+ * they list are read from the seeds, and only their changed provisions are
+ * rewritten (the FTS triggers keep provisions_fts in step). Links to a
+ * removed law follow its document to its new id, or wait in
+ * unresolved_references, and waiting links whose document the census now
+ * has are resolved, so the links match a full build. A full build records
+ * the latest change set it includes as db_metadata changeset_sequence.
+ *
+ * With --compress, the provisions are loaded without the FTS triggers, and
+ * each provision's content and content_stemmed are then stored as raw
+ * deflate against a dictionary trained on the corpus
+ * (lib/provision-compression.ts). provisions_fts is indexed through the
+ * provisions_text view, which decompresses with the provision_text() SQL
+ * function (lib/compressed-fts.sql); the server registers it to search
+ * (src/utils/provision-text.ts). To rebuild or check that index, register
+ * the function with registerProvisionText() and run the FTS5 'rebuild' or
+ * 'integrity-check' command. Such a database cannot take --apply, and
+ * leaves out unresolved_references.
  *
  * Usage: npm run build:db
+ *        npm run build:db:compressed
+ *        npm run build:db:apply
  */
 
+import McpDatabase from '@ansvar/mcp-sqlite';
 import Database from 'better-sqlite3';
+import { createHash } from 'crypto';
 import * as fs from 'fs';
 import * as path from 'path';
+import * as zlib from 'zlib';
 import { fileURLToPath } from 'url';
+import { normalizedSha256 } from './lib/provision-hash.js';
+import { DICTIONARY_SAMPLE_BYTES, compressProvisionText, trainDictionary } from './lib/provision-compression.js';
+import { registerProvisionText } from '../src/utils/provision-text.js';
+import { stemText } from '../src/utils/stemmer-ru.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
-const SEED_DIR = path.resolve(__dirname, '../data/seed');
-const DB_PATH = path.resolve(__dirname, '../data/database.db');
+/** Where a build reads its seeds and census and writes the database. */
+export interface BuildPaths {
+  /** Seed files, with the _shards/ and _changes/ directories */
+  seedDir: string;
+  dbPath: string;
+  censusPath: string;
+  censusDbPath: string;
+}
+
+const DEFAULT_PATHS: BuildPaths = {
+  seedDir: path.resolve(__dirname, '../data/seed'),
+  dbPath: path.resolve(__dirname, '../data/database.db'),
+  censusPath: path.resolve(__dirname, '../data/census.json'),
+  censusDbPath: path.resolve(__dirname, '../data/census.sqlite'),
+};
+
+const shardsDir = (paths: BuildPaths): string => path.join(paths.seedDir, '_shards');
+const changesDir = (paths: BuildPaths): string => path.join(paths.seedDir, '_changes');
 
 // ─────────────────────────────────────────────────────────────────────────────
 // Seed file types
@@ -46,146 +105,82 @@ interface ProvisionSeed {
   provision_ref?: string;
   order_index?: number;
   metadata?: Record<string, unknown>;
+  normalized_sha256?: string;
+  content_stemmed?: string;
+}
+
+/** The <ref nd="..."> targets linked from one article (null: outside the articles). */
+interface ReferenceSeed {
+  provision_ref: string | null;
+  targets: string[];
 }
 
 interface SeedFile {
   law: LawSeed;
   provisions: ProvisionSeed[];
+  references?: ReferenceSeed[];
+}
+
+/** data/seed/_shards/index.json: each law is one compressed frame in a shard. */
+interface ShardIndex {
+  version: number;
+  codec: 'zstd' | 'gzip';
+  shards: string[];
+  /** law id → [shard number, byte offset, byte length, nd] */
+  laws: Record<string, [number, number, number, string]>;
+}
+
+/** A law in a change set; added and changed laws list their provisions. */
+interface ChangedLaw {
+  id: string;
+  nd: string;
+  seed_sha256?: string;
+  provisions?: Array<{ article: string; part: string | null; paragraph: string | null; content_sha256: string }>;
+}
+
+/** data/seed/_changes/NNNNNN.json, written by `ingest-ruslawod.py` after every seed run. */
+interface ChangeSet {
+  version: number;
+  sequence: number;
+  generated_at: string;
+  added: ChangedLaw[];
+  changed: ChangedLaw[];
+  removed: ChangedLaw[];
 }
 
 // ─────────────────────────────────────────────────────────────────────────────
 // Database schema
 // ─────────────────────────────────────────────────────────────────────────────
 
-const SCHEMA = `
--- Laws (federal laws, codes, presidential decrees, government resolutions)
-CREATE TABLE laws (
-    id TEXT PRIMARY KEY,
-    title TEXT NOT NULL,
-    title_en TEXT,
-    identifier TEXT NOT NULL,
-    law_type TEXT NOT NULL,
-    status TEXT NOT NULL DEFAULT 'in_force',
-    effective_date TEXT,
-    publication_date TEXT,
-    source_url TEXT,
-    last_amended TEXT,
-    last_updated TEXT,
-    description TEXT,
-    provision_count INTEGER DEFAULT 0
-);
-
--- Individual provisions (articles, parts, paragraphs)
-CREATE TABLE provisions (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    law_id TEXT NOT NULL REFERENCES laws(id),
-    article TEXT NOT NULL,
-    title TEXT,
-    content TEXT NOT NULL,
-    part TEXT,
-    paragraph TEXT,
-    provision_ref TEXT,
-    order_index INTEGER NOT NULL DEFAULT 0,
-    metadata TEXT
-);
-
--- Unique index for deduplication (expressions allowed in CREATE INDEX)
-CREATE UNIQUE INDEX idx_provisions_unique
-    ON provisions(law_id, article, COALESCE(part, ''), COALESCE(paragraph, ''));
-
--- FTS5 for provision search
-CREATE VIRTUAL TABLE provisions_fts USING fts5(
-    content, title, article,
-    content='provisions',
-    content_rowid='rowid',
-    tokenize='unicode61'
-);
-
--- FTS sync triggers
-CREATE TRIGGER provisions_ai AFTER INSERT ON provisions BEGIN
-    INSERT INTO provisions_fts(rowid, content, title, article)
-    VALUES (new.rowid, new.content, new.title, new.article);
-END;
-CREATE TRIGGER provisions_ad AFTER DELETE ON provisions BEGIN
-    INSERT INTO provisions_fts(provisions_fts, rowid, content, title, article)
-    VALUES ('delete', old.rowid, old.content, old.title, old.article);
-END;
-CREATE TRIGGER provisions_au AFTER UPDATE ON provisions BEGIN
-    INSERT INTO provisions_fts(provisions_fts, rowid, content, title, article)
-    VALUES ('delete', old.rowid, old.content, old.title, old.article);
-    INSERT INTO provisions_fts(rowid, content, title, article)
-    VALUES (new.rowid, new.content, new.title, new.article);
-END;
-
--- EU documents (directives and regulations referenced by Russian law)
-CREATE TABLE IF NOT EXISTS eu_documents (
-    id TEXT PRIMARY KEY,
-    document_type TEXT NOT NULL,
-    document_number TEXT,
-    title TEXT NOT NULL,
-    short_title TEXT,
-    celex TEXT,
-    year INTEGER,
-    community TEXT DEFAULT 'EU',
-    in_force INTEGER DEFAULT 1,
-    source_url TEXT
-);
-
--- EU references linking Russian law provisions to EU directives/regulations
-CREATE TABLE eu_references (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    law_id TEXT NOT NULL REFERENCES laws(id),
-    provision_id INTEGER REFERENCES provisions(id),
-    eu_directive TEXT,
-    eu_regulation TEXT,
-    eu_article TEXT,
-    reference_type TEXT
-);
-
--- Cross-references between provisions/laws
-CREATE TABLE cross_references (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    source_law_id TEXT NOT NULL REFERENCES laws(id),
-    source_provision_ref TEXT,
-    target_law_id TEXT NOT NULL,
-    target_provision_ref TEXT,
-    ref_type TEXT DEFAULT 'reference'
-);
-
--- Build metadata (tier, schema version, build timestamp)
-CREATE TABLE db_metadata (
-    key TEXT PRIMARY KEY,
-    value TEXT
-);
-
--- Indexes
-CREATE INDEX idx_provisions_law_id ON provisions(law_id);
-CREATE INDEX idx_provisions_article ON provisions(article);
-CREATE INDEX idx_provisions_ref ON provisions(provision_ref);
-CREATE INDEX idx_eu_references_law_id ON eu_references(law_id);
-CREATE INDEX idx_cross_refs_source ON cross_references(source_law_id);
-`;
+// Shared with scripts/ingest-ruslawod.py (--sqlite), which writes the same schema.
+const SCHEMA = fs.readFileSync(path.resolve(__dirname, 'lib/schema.sql'), 'utf-8');
+// provisions_fts of a --compress build, also shared with ingest-ruslawod.py.
+const COMPRESSED_FTS = fs.readFileSync(path.resolve(__dirname, 'lib/compressed-fts.sql'), 'utf-8');
 
 // ─────────────────────────────────────────────────────────────────────────────
 // Build
 // ─────────────────────────────────────────────────────────────────────────────
 
-function buildDatabase(): void {
+export function buildDatabase(compress: boolean, paths: BuildPaths = DEFAULT_PATHS): void {
   console.log('Building Russian Law MCP database...\n');
+  const { seedDir, dbPath } = paths;
+  if (compress) {
+    assertServerReadsCompressedText();
+  }
 
   // Delete existing database if present
-  if (fs.existsSync(DB_PATH)) {
-    fs.unlinkSync(DB_PATH);
+  if (fs.existsSync(dbPath)) {
+    fs.unlinkSync(dbPath);
     console.log('  Deleted existing database.');
   }
 
   // Ensure data directory exists
-  const dataDir = path.dirname(DB_PATH);
+  const dataDir = path.dirname(dbPath);
   if (!fs.existsSync(dataDir)) {
     fs.mkdirSync(dataDir, { recursive: true });
   }
 
-  const db = new Database(DB_PATH);
+  const db = new Database(dbPath);
   db.pragma('foreign_keys = ON');
   db.pragma('journal_mode = WAL');
 
@@ -198,81 +193,80 @@ function buildDatabase(): void {
     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
   `);
 
-  const insertProvision = db.prepare(`
-    INSERT OR IGNORE INTO provisions (law_id, article, title, content, part, paragraph, provision_ref, order_index, metadata)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-  `);
+  const provisionStore = createProvisionStore(db);
 
   const updateProvisionCount = db.prepare(`
     UPDATE laws SET provision_count = ? WHERE id = ?
   `);
 
-  // Load seed files
-  if (!fs.existsSync(SEED_DIR)) {
-    console.log(`No seed directory at ${SEED_DIR} — creating empty database.`);
-    writeBuildMetadata(db, 0, 0);
-    finalizeDatabase(db);
-    return;
-  }
+  const insertReferences = createReferenceInserter(db);
+
+  const lawIdsByNd = readCensusIds(paths);
+  let totalReferences = 0;
+
+  const shardIndex = readShardIndex(paths);
+  const seedFiles = fs.existsSync(seedDir)
+    ? fs.readdirSync(seedDir).filter(f => f.endsWith('.json') && !f.startsWith('.') && !f.startsWith('_'))
+    : [];
 
-  const seedFiles = fs.readdirSync(SEED_DIR)
-    .filter(f => f.endsWith('.json') && !f.startsWith('.') && !f.startsWith('_'));
+  const changesetSequence = latestChangeSetSequence(paths);
 
-  if (seedFiles.length === 0) {
-    console.log('No seed files found. Database created with empty schema.');
-    writeBuildMetadata(db, 0, 0);
+  if (!shardIndex && seedFiles.length === 0) {
+    console.log(`No seed files found in ${seedDir}. Database created with empty schema.`);
+    writeBuildMetadata(db, 0, 0, changesetSequence);
     finalizeDatabase(db);
     return;
   }
 
+  if (compress) {
+    // provisions_fts is built once the text is compressed
+    db.exec('DROP TRIGGER provisions_ai; DROP TRIGGER provisions_ad; DROP TRIGGER provisions_au;');
+  }
+
   let totalLaws = 0;
   let totalProvisions = 0;
 
+  const insertSeed = (seed: SeedFile): number => {
+    const law = seed.law;
+
+    insertLaw.run(
+      ...lawValues(law),
+      0 // provision_count — updated after inserting provisions
+    );
+    totalLaws++;
+
+    let provisionCount = 0;
+    for (let i = 0; i < seed.provisions.length; i++) {
+      provisionStore.insert(law.id, provisionValues(seed.provisions[i], i));
+      provisionCount++;
+    }
+
+    updateProvisionCount.run(provisionCount, law.id);
+    totalProvisions += provisionCount;
+
+    totalReferences += insertReferences(law.id, seed.references, lawIdsByNd);
+    return provisionCount;
+  };
+
+  const shardLawIds = new Set(shardIndex ? Object.keys(shardIndex.laws) : []);
+
   const loadAll = db.transaction(() => {
+    if (shardIndex) {
+      console.log(`  Loading ${Object.keys(shardIndex.laws).length} laws from ${shardIndex.shards.length} shards...`);
+      for (const seed of readShardSeeds(paths, shardIndex)) {
+        insertSeed(seed);
+      }
+    }
+
     for (const file of seedFiles) {
-      const filePath = path.join(SEED_DIR, file);
+      if (shardLawIds.has(file.slice(0, -'.json'.length))) {
+        continue;
+      }
+      const filePath = path.join(seedDir, file);
       console.log(`  Loading ${file}...`);
 
       const content = fs.readFileSync(filePath, 'utf-8');
-      const seed = JSON.parse(content) as SeedFile;
-      const law = seed.law;
-
-      insertLaw.run(
-        law.id,
-        law.title,
-        law.title_en ?? null,
-        law.identifier,
-        law.law_type,
-        law.status ?? 'in_force',
-        law.effective_date ?? null,
-        law.publication_date ?? null,
-        law.source_url ?? null,
-        law.last_amended ?? null,
-        law.last_updated ?? null,
-        law.description ?? null,
-        0 // provision_count — updated after inserting provisions
-      );
-      totalLaws++;
-
-      let provisionCount = 0;
-      for (let i = 0; i < seed.provisions.length; i++) {
-        const prov = seed.provisions[i];
-        insertProvision.run(
-          law.id,
-          prov.article,
-          prov.title ?? null,
-          prov.content,
-          prov.part ?? null,
-          prov.paragraph ?? null,
-          prov.provision_ref ?? null,
-          prov.order_index ?? i,
-          prov.metadata ? JSON.stringify(prov.metadata) : null
-        );
-        provisionCount++;
-      }
-
-      updateProvisionCount.run(provisionCount, law.id);
-      totalProvisions += provisionCount;
+      const provisionCount = insertSeed(JSON.parse(content) as SeedFile);
 
       console.log(`    ${provisionCount} provisions`);
     }
@@ -283,18 +277,618 @@ function buildDatabase(): void {
   // Get actual counts from the database (INSERT OR IGNORE may skip duplicates)
   const actualLaws = db.prepare('SELECT COUNT(*) as c FROM laws').get() as { c: number };
   const actualProvisions = db.prepare('SELECT COUNT(*) as c FROM provisions').get() as { c: number };
+  const duplicates = db.prepare('SELECT COUNT(*) as c FROM provisions WHERE duplicate_of IS NOT NULL').get() as { c: number };
 
-  writeBuildMetadata(db, actualLaws.c, actualProvisions.c);
+  writeBuildMetadata(db, actualLaws.c, actualProvisions.c, changesetSequence);
+  const compressed = compress ? compressProvisions(db) : null;
   finalizeDatabase(db);
 
-  const size = fs.statSync(DB_PATH).size;
+  const size = fs.statSync(dbPath).size;
   console.log(
-    `\nBuild complete: ${actualLaws.c} laws, ${actualProvisions.c} provisions`
+    `\nBuild complete: ${actualLaws.c} laws, ${actualProvisions.c} provisions, ${totalReferences} cross-references`
+  );
+  console.log(`  ${duplicates.c} provisions are exact duplicates, stored once`);
+  if (compressed) {
+    console.log(
+      `  Provision text compressed: ${(compressed.plain / 1024).toFixed(1)} KB -> ${(compressed.compressed / 1024).toFixed(1)} KB` +
+      ` (${(compressed.dictionary / 1024).toFixed(1)} KB dictionary)`
+    );
+  }
+  console.log(`Output: ${dbPath} (${(size / 1024).toFixed(1)} KB)`);
+}
+
+/**
+ * Refuse --compress unless the server's driver (@ansvar/mcp-sqlite) can
+ * register provision_text(), without which it cannot search the database.
+ */
+function assertServerReadsCompressedText(): void {
+  const dictionary = Buffer.from('Статья текст закона', 'utf-8');
+  const sample = 'Текст статьи закона.';
+  const db = new McpDatabase(':memory:');
+  try {
+    registerProvisionText(db, dictionary);
+    const row = db.prepare('SELECT provision_text(?) as text').get(compressProvisionText(sample, dictionary)) as
+      { text: string } | undefined;
+    if (row?.text !== sample) {
+      throw new Error(`provision_text() read ${JSON.stringify(row?.text)} through @ansvar/mcp-sqlite`);
+    }
+  } catch (error) {
+    throw new Error(
+      `--compress builds a database the server cannot search: ${(error as Error).message}`
+    );
+  } finally {
+    db.close();
+  }
+}
+
+/** Provisions read per batch while compressing. */
+const COMPRESS_BATCH = 1000;
+
+/**
+ * Store the text of every provision holding one as content_z and
+ * content_stemmed_z (--compress), then index it through the provisions_text
+ * view (lib/compressed-fts.sql), with provision_text() registered here.
+ *
+ * The load ran with the FTS triggers dropped. The dictionary is trained on
+ * an even sample of about DICTIONARY_SAMPLE_BYTES. unresolved_references,
+ * only read by --apply, is dropped.
+ */
+function compressProvisions(db: Database.Database): { plain: number; compressed: number; dictionary: number } {
+  const holders = db.prepare(`
+    SELECT COALESCE(SUM(length(CAST(content AS BLOB))), 0) as bytes,
+      COALESCE(SUM(length(CAST(content_stemmed AS BLOB))), 0) as stemmed_bytes
+    FROM provisions WHERE duplicate_of IS NULL
+  `).get() as { bytes: number; stemmed_bytes: number };
+  const stride = Math.max(1, Math.ceil(holders.bytes / DICTIONARY_SAMPLE_BYTES));
+  const samples = db.prepare('SELECT content FROM provisions WHERE duplicate_of IS NULL ORDER BY id')
+    .pluck().iterate() as IterableIterator<string>;
+  const dictionary = trainDictionary(
+    (function* () {
+      let row = 0;
+      for (const content of samples) {
+        if (row++ % stride === 0) yield content;
+      }
+    })()
   );
-  console.log(`Output: ${DB_PATH} (${(size / 1024).toFixed(1)} KB)`);
+
+  const selectBatch = db.prepare(`
+    SELECT id, content, content_stemmed FROM provisions
+    WHERE duplicate_of IS NULL AND id > ? ORDER BY id LIMIT ${COMPRESS_BATCH}
+  `);
+  const storeCompressed = db.prepare(`
+    UPDATE provisions SET content = '', content_stemmed = NULL, content_z = ?, content_stemmed_z = ? WHERE id = ?
+  `);
+  let compressed = 0;
+
+  const compressAll = db.transaction(() => {
+    db.exec('DROP TABLE unresolved_references');
+    db.prepare('INSERT INTO content_dictionary (id, dictionary) VALUES (1, ?)').run(dictionary);
+    // better-sqlite3 cannot write while a statement is iterating: read in batches
+    let lastId = 0;
+    for (;;) {
+      const rows = selectBatch.all(lastId) as Array<{ id: number; content: string; content_stemmed: string | null }>;
+      if (rows.length === 0) break;
+      for (const row of rows) {
+        const data = compressProvisionText(row.content, dictionary);
+        const stems = row.content_stemmed === null ? null : compressProvisionText(row.content_stemmed, dictionary);
+        storeCompressed.run(data, stems, row.id);
+        compressed += data.length + (stems?.length ?? 0);
+      }
+      lastId = rows[rows.length - 1].id;
+    }
+    registerProvisionText(db, dictionary);
+    db.exec(COMPRESSED_FTS);
+  });
+  compressAll();
+
+  db.exec('VACUUM');
+  return { plain: holders.bytes + holders.stemmed_bytes, compressed, dictionary: dictionary.length };
+}
+
+/** provisionValues() and the duplicate_of column it is stored with. */
+type ProvisionValues = Array<string | number | null>;
+
+interface ProvisionStore {
+  insert(lawId: string, values: ProvisionValues): void;
+  update(id: number, values: ProvisionValues): void;
+  remove(id: number): void;
 }
 
-function writeBuildMetadata(db: Database.Database, laws: number, provisions: number): void {
+/**
+ * Provision writes that store exact duplicates once.
+ *
+ * A provision whose title and content equal those of a stored provision
+ * holding its own text is written with content '', no content_stemmed and
+ * duplicate_of set to that provision; the FTS triggers skip it. Before a
+ * provision holding text is changed or deleted, its first duplicate takes
+ * the text over and the others are pointed at it.
+ */
+function createProvisionStore(db: Database.Database): ProvisionStore {
+  const insertProvision = db.prepare(`
+    INSERT OR IGNORE INTO provisions (law_id, article, title, content, part, paragraph, provision_ref, order_index, metadata, normalized_sha256, content_stemmed, duplicate_of)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+  `);
+  const updateProvision = db.prepare(`
+    UPDATE provisions SET title = ?, content = ?, provision_ref = ?, order_index = ?, metadata = ?, normalized_sha256 = ?, content_stemmed = ?, duplicate_of = ?
+    WHERE id = ?
+  `);
+  const deleteProvision = db.prepare('DELETE FROM provisions WHERE id = ?');
+  const findOriginal = db.prepare(`
+    SELECT id FROM provisions
+    WHERE normalized_sha256 = ? AND duplicate_of IS NULL AND content = ? AND title IS ? AND id <> ?
+    LIMIT 1
+  `).pluck();
+  const firstDuplicate = db.prepare('SELECT id FROM provisions WHERE duplicate_of = ? ORDER BY id LIMIT 1').pluck();
+  const selectText = db.prepare('SELECT content, content_stemmed FROM provisions WHERE id = ?');
+  const takeOverText = db.prepare('UPDATE provisions SET content = ?, content_stemmed = ?, duplicate_of = NULL WHERE id = ?');
+  const repointDuplicates = db.prepare('UPDATE provisions SET duplicate_of = ? WHERE duplicate_of = ?');
+
+  /** values plus duplicate_of; content and content_stemmed are dropped for a duplicate. */
+  const deduplicated = (values: ProvisionValues, id = 0): ProvisionValues => {
+    const [, title, content, , , , , , normalized] = values;
+    const original = findOriginal.get(normalized, content, title, id) as number | undefined;
+    if (original === undefined) {
+      return [...values, null];
+    }
+    const stored = [...values];
+    stored[2] = '';
+    stored[9] = null;
+    return [...stored, original];
+  };
+
+  const release = (id: number): void => {
+    const heir = firstDuplicate.get(id) as number | undefined;
+    if (heir === undefined) {
+      return;
+    }
+    const text = selectText.get(id) as { content: string; content_stemmed: string | null };
+    takeOverText.run(text.content, text.content_stemmed, heir);
+    repointDuplicates.run(heir, id);
+  };
+
+  return {
+    insert(lawId, values) {
+      insertProvision.run(lawId, ...deduplicated(values));
+    },
+    update(id, values) {
+      release(id);
+      const [, title, content, , , provisionRef, orderIndex, metadata, normalized, stemmed, duplicateOf] =
+        deduplicated(values, id);
+      updateProvision.run(title, content, provisionRef, orderIndex, metadata, normalized, stemmed, duplicateOf, id);
+    },
+    remove(id) {
+      release(id);
+      deleteProvision.run(id);
+    },
+  };
+}
+
+/**
+ * Writes a law's <ref> links: a cross_references row per target the census
+ * resolves to a law id, an unresolved_references row per other target.
+ * Returns the number of cross_references rows.
+ */
+function createReferenceInserter(
+  db: Database.Database
+): (lawId: string, references: ReferenceSeed[] | undefined, lawIdsByNd: Map<string, string>) => number {
+  const insertCrossReference = db.prepare(`
+    INSERT INTO cross_references (source_law_id, source_provision_ref, target_law_id)
+    VALUES (?, ?, ?)
+  `);
+  const insertUnresolved = db.prepare(`
+    INSERT INTO unresolved_references (source_law_id, source_provision_ref, nd)
+    VALUES (?, ?, ?)
+  `);
+  return (lawId, references, lawIdsByNd) => {
+    let resolved = 0;
+    for (const ref of references ?? []) {
+      for (const nd of ref.targets) {
+        const target = lawIdsByNd.get(nd);
+        if (target) {
+          insertCrossReference.run(lawId, ref.provision_ref, target);
+          resolved++;
+        } else {
+          insertUnresolved.run(lawId, ref.provision_ref, nd);
+        }
+      }
+    }
+    return resolved;
+  };
+}
+
+/** The laws columns from id to description, in INSERT order. */
+function lawValues(law: LawSeed): Array<string | null> {
+  return [
+    law.id,
+    law.title,
+    law.title_en ?? null,
+    law.identifier,
+    law.law_type,
+    law.status ?? 'in_force',
+    law.effective_date ?? null,
+    law.publication_date ?? null,
+    law.source_url ?? null,
+    law.last_amended ?? null,
+    law.last_updated ?? null,
+    law.description ?? null,
+  ];
+}
+
+/**
+ * The provisions columns after law_id, in INSERT order; index is the default
+ * order_index. Seeds without a normalized_sha256 (not from ingest-ruslawod.py)
+ * get it computed here, and content_stemmed is computed for every seed that
+ * does not carry it (ingest-ruslawod.py leaves it out to keep seeds small).
+ */
+function provisionValues(prov: ProvisionSeed, index: number): ProvisionValues {
+  return [
+    prov.article,
+    prov.title ?? null,
+    prov.content,
+    prov.part ?? null,
+    prov.paragraph ?? null,
+    prov.provision_ref ?? null,
+    prov.order_index ?? index,
+    prov.metadata ? JSON.stringify(prov.metadata) : null,
+    prov.normalized_sha256 ?? normalizedSha256(prov.content),
+    prov.content_stemmed ?? stemText(prov.title ? `${prov.title}\n${prov.content}` : prov.content),
+  ];
+}
+
+/**
+ * pravogovruNd → law id from data/census.sqlite, or data/census.json when an
+ * older ingest did not write it; empty (no cross-references) without a census.
+ */
+function readCensusIds(paths: BuildPaths): Map<string, string> {
+  const ids = new Map<string, string>();
+  if (fs.existsSync(paths.censusDbPath)) {
+    const census = new Database(paths.censusDbPath, { readonly: true });
+    try {
+      const rows = census.prepare("SELECT nd, id FROM census WHERE nd <> '' ORDER BY rowid").raw().all() as
+        Array<[string, string]>;
+      for (const [nd, id] of rows) {
+        if (!ids.has(nd)) {
+          ids.set(nd, id);
+        }
+      }
+    } finally {
+      census.close();
+    }
+    return ids;
+  }
+  if (!fs.existsSync(paths.censusPath)) {
+    console.log(`  No ${paths.censusPath}; <ref> links are not resolved into cross_references.`);
+    return ids;
+  }
+  const census = JSON.parse(fs.readFileSync(paths.censusPath, 'utf-8')) as { laws?: Array<{ id: string; nd?: string }> };
+  for (const law of census.laws ?? []) {
+    if (law.nd && !ids.has(law.nd)) {
+      ids.set(law.nd, law.id);
+    }
+  }
+  return ids;
+}
+
+function readShardIndex(paths: BuildPaths): ShardIndex | null {
+  const indexPath = path.join(shardsDir(paths), 'index.json');
+  if (!fs.existsSync(indexPath)) {
+    return null;
+  }
+  const index = JSON.parse(fs.readFileSync(indexPath, 'utf-8')) as ShardIndex;
+  if (index.version !== 1) {
+    throw new Error(`Unsupported seed shard index version ${index.version} in ${indexPath}`);
+  }
+  if (index.codec === 'zstd' && typeof zlib.zstdDecompressSync !== 'function') {
+    throw new Error(
+      `Seed shards are zstd-compressed, which needs Node.js >= 22.15 (running ${process.version}). ` +
+      'Re-run the ingester with --seed-codec gzip, or upgrade Node.js.'
+    );
+  }
+  return index;
+}
+
+/**
+ * Stream the seeds out of the shards, one frame at a time in file order,
+ * so only a single law is decompressed and parsed at once.
+ */
+function* readShardSeeds(paths: BuildPaths, index: ShardIndex): Generator<SeedFile> {
+  const decompress = index.codec === 'zstd' ? zlib.zstdDecompressSync : zlib.gunzipSync;
+  const byShard = new Map<number, Array<[number, number]>>();
+  for (const [shard, offset, length] of Object.values(index.laws)) {
+    const frames = byShard.get(shard) ?? [];
+    frames.push([offset, length]);
+    byShard.set(shard, frames);
+  }
+
+  for (const [shard, frames] of [...byShard.entries()].sort((a, b) => a[0] - b[0])) {
+    frames.sort((a, b) => a[0] - b[0]);
+    const fd = fs.openSync(path.join(shardsDir(paths), index.shards[shard]), 'r');
+    try {
+      for (const [offset, length] of frames) {
+        const frame = Buffer.alloc(length);
+        fs.readSync(fd, frame, 0, length, offset);
+        yield JSON.parse(decompress(frame).toString('utf-8')) as SeedFile;
+      }
+    } finally {
+      fs.closeSync(fd);
+    }
+  }
+}
+
+/** One law's seed, as the exact bytes the ingester hashed: its shard frame, else its file. */
+function readSeedBytes(paths: BuildPaths, index: ShardIndex | null, lawId: string): Buffer {
+  const entry = index?.laws[lawId];
+  if (!index || !entry) {
+    return fs.readFileSync(path.join(paths.seedDir, `${lawId}.json`));
+  }
+  const [shard, offset, length] = entry;
+  const frame = Buffer.alloc(length);
+  const fd = fs.openSync(path.join(shardsDir(paths), index.shards[shard]), 'r');
+  try {
+    fs.readSync(fd, frame, 0, length, offset);
+  } finally {
+    fs.closeSync(fd);
+  }
+  return index.codec === 'zstd' ? zlib.zstdDecompressSync(frame) : zlib.gunzipSync(frame);
+}
+
+function sha256Hex(data: string | Buffer): string {
+  return createHash('sha256').update(data).digest('hex');
+}
+
+// ─────────────────────────────────────────────────────────────────────────────
+// Change sets (--apply)
+// ─────────────────────────────────────────────────────────────────────────────
+
+function changeSetFiles(paths: BuildPaths): string[] {
+  return fs.existsSync(changesDir(paths))
+    ? fs.readdirSync(changesDir(paths)).filter(f => /^\d+\.json$/.test(f)).sort()
+    : [];
+}
+
+function latestChangeSetSequence(paths: BuildPaths): number {
+  const files = changeSetFiles(paths);
+  return files.length > 0 ? parseInt(files[files.length - 1], 10) : 0;
+}
+
+/**
+ * The change sets after `since`, merged so each law keeps its last state:
+ * law id → the change set entry, with provisions unless it was removed.
+ */
+function readChangeSets(paths: BuildPaths, since: number): { sequence: number; laws: Map<string, ChangedLaw> } {
+  const laws = new Map<string, ChangedLaw>();
+  let sequence = since;
+  for (const file of changeSetFiles(paths)) {
+    if (parseInt(file, 10) <= since) {
+      continue;
+    }
+    const changeSet = JSON.parse(fs.readFileSync(path.join(changesDir(paths), file), 'utf-8')) as ChangeSet;
+    if (changeSet.version !== 1) {
+      throw new Error(`Unsupported change set version ${changeSet.version} in ${file}`);
+    }
+    for (const law of [...changeSet.added, ...changeSet.changed]) {
+      laws.set(law.id, law);
+    }
+    for (const law of changeSet.removed) {
+      laws.set(law.id, { id: law.id, nd: law.nd });
+    }
+    sequence = changeSet.sequence;
+  }
+  return { sequence, laws };
+}
+
+const provisionKey = (article: string, part?: string | null, paragraph?: string | null): string =>
+  `${article}\u0000${part ?? ''}\u0000${paragraph ?? ''}`;
+
+export function applyChangeSets(paths: BuildPaths = DEFAULT_PATHS): void {
+  console.log('Applying seed change sets to the Russian Law MCP database...\n');
+  const { dbPath } = paths;
+
+  if (!fs.existsSync(dbPath)) {
+    throw new Error(`No database at ${dbPath}; run npm run build:db first.`);
+  }
+  const db = new Database(dbPath);
+  db.pragma('foreign_keys = ON');
+  db.pragma('journal_mode = WAL');
+
+  const row = db.prepare("SELECT value FROM db_metadata WHERE key = 'changeset_sequence'").get() as
+    { value: string } | undefined;
+  const columns = db.prepare('SELECT name FROM pragma_table_info(?)').pluck().all('provisions') as string[];
+  const hasUnresolved = db.prepare(
+    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'unresolved_references'"
+  ).get() !== undefined;
+  if (!row || !hasUnresolved ||
+      !['normalized_sha256', 'content_stemmed', 'duplicate_of'].every(column => columns.includes(column))) {
+    db.close();
+    throw new Error(`${dbPath} predates change sets or the current schema; run npm run build:db for a full build.`);
+  }
+  const compressed = db.prepare(
+    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'content_dictionary'"
+  ).get() !== undefined && db.prepare('SELECT 1 FROM content_dictionary').get() !== undefined;
+  if (compressed) {
+    db.close();
+    throw new Error(`${dbPath} was built with --compress; run npm run build:db:compressed for a full build.`);
+  }
+  const since = parseInt(row.value, 10);
+  const { sequence, laws } = readChangeSets(paths, since);
+  if (laws.size === 0) {
+    console.log(`Database is up to date (change set ${since}).`);
+    db.close();
+    return;
+  }
+
+  const upsertLaw = db.prepare(`
+    INSERT INTO laws (id, title, title_en, identifier, law_type, status, effective_date, publication_date, source_url, last_amended, last_updated, description, provision_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+      title = excluded.title, title_en = excluded.title_en, identifier = excluded.identifier,
+      law_type = excluded.law_type, status = excluded.status, effective_date = excluded.effective_date,
+      publication_date = excluded.publication_date, source_url = excluded.source_url,
+      last_amended = excluded.last_amended, last_updated = excluded.last_updated,
+      description = excluded.description, provision_count = excluded.provision_count
+  `);
+  // Duplicates are compared by the text of the provision holding it
+  const selectProvisions = db.prepare(`
+    SELECT p.id, p.article, p.title, COALESCE(o.content, p.content) AS content, p.part, p.paragraph,
+      p.provision_ref, p.order_index, p.metadata, p.normalized_sha256,
+      COALESCE(o.content_stemmed, p.content_stemmed) AS content_stemmed
+    FROM provisions p LEFT JOIN provisions o ON o.id = p.duplicate_of
+    WHERE p.law_id = ?
+  `);
+  const provisionStore = createProvisionStore(db);
+  const deleteLawReferences = db.prepare('DELETE FROM cross_references WHERE source_law_id = ?');
+  const deleteLawUnresolved = db.prepare('DELETE FROM unresolved_references WHERE source_law_id = ?');
+  const insertReferences = createReferenceInserter(db);
+  const deleteEuReferences = db.prepare('DELETE FROM eu_references WHERE law_id = ?');
+  const selectProvisionIds = db.prepare('SELECT id FROM provisions WHERE law_id = ? ORDER BY id').pluck();
+  const deleteLaw = db.prepare('DELETE FROM laws WHERE id = ?');
+  const retargetReferences = db.prepare('UPDATE cross_references SET target_law_id = ? WHERE target_law_id = ?');
+  const unresolveTargetReferences = db.prepare(`
+    INSERT INTO unresolved_references (source_law_id, source_provision_ref, nd)
+    SELECT source_law_id, source_provision_ref, ? FROM cross_references WHERE target_law_id = ? ORDER BY id
+  `);
+  const deleteTargetReferences = db.prepare('DELETE FROM cross_references WHERE target_law_id = ?');
+  const selectUnresolvedNds = db.prepare('SELECT DISTINCT nd FROM unresolved_references').pluck();
+  const resolveReferences = db.prepare(`
+    INSERT INTO cross_references (source_law_id, source_provision_ref, target_law_id)
+    SELECT source_law_id, source_provision_ref, ? FROM unresolved_references WHERE nd = ? ORDER BY rowid
+  `);
+  const deleteUnresolved = db.prepare('DELETE FROM unresolved_references WHERE nd = ?');
+
+  const lawIdsByNd = readCensusIds(paths);
+  const shardIndex = readShardIndex(paths);
+  const counts = { added: 0, updated: 0, deleted: 0, unchanged: 0 };
+  let upserted = 0;
+  let removed = 0;
+  let resolved = 0;
+
+  const apply = db.transaction(() => {
+    for (const change of laws.values()) {
+      if (change.provisions) {
+        continue;
+      }
+      deleteLawReferences.run(change.id);
+      deleteLawUnresolved.run(change.id);
+      deleteEuReferences.run(change.id);
+      for (const id of selectProvisionIds.all(change.id) as number[]) {
+        provisionStore.remove(id);
+      }
+      deleteLaw.run(change.id);
+      // Links to the law follow its document to a new id, or wait for it to come back
+      const renamed = lawIdsByNd.get(change.nd);
+      if (renamed && renamed !== change.id) {
+        retargetReferences.run(renamed, change.id);
+      } else {
+        unresolveTargetReferences.run(change.nd, change.id);
+        deleteTargetReferences.run(change.id);
+      }
+      removed++;
+    }
+
+    for (const change of laws.values()) {
+      if (!change.provisions) {
+        continue;
+      }
+      const bytes = readSeedBytes(paths, shardIndex, change.id);
+      if (sha256Hex(bytes) !== change.seed_sha256) {
+        throw new Error(
+          `The seed of ${change.id} does not match change set ${sequence}; run npm run build:db for a full build.`
+        );
+      }
+      const seed = JSON.parse(bytes.toString('utf-8')) as SeedFile;
+      upsertLaw.run(...lawValues(seed.law), seed.provisions.length);
+
+      // Provisions are matched by (article, part, paragraph); the first of a key wins, as in a full build
+      const hashes = new Map<string, string>();
+      for (const prov of change.provisions) {
+        const key = provisionKey(prov.article, prov.part, prov.paragraph);
+        if (!hashes.has(key)) {
+          hashes.set(key, prov.content_sha256);
+        }
+      }
+      const existing = new Map<string, Record<string, string | number | null>>();
+      for (const prov of selectProvisions.all(change.id) as Array<Record<string, string | number | null>>) {
+        existing.set(provisionKey(prov.article as string, prov.part as string | null, prov.paragraph as string | null), prov);
+      }
+      const seen = new Set<string>();
+      for (let i = 0; i < seed.provisions.length; i++) {
+        const prov = seed.provisions[i];
+        const key = provisionKey(prov.article, prov.part, prov.paragraph);
+        if (seen.has(key)) {
+          continue;
+        }
+        seen.add(key);
+        const values = provisionValues(prov, i);
+        const current = existing.get(key);
+        if (!current) {
+          provisionStore.insert(change.id, values);
+          counts.added++;
+          continue;
+        }
+        const [, title, content, , , provisionRef, orderIndex, metadata, normalized, stemmed] = values;
+        if (
+          sha256Hex(current.content as string) === hashes.get(key) &&
+          current.title === title &&
+          current.provision_ref === provisionRef &&
+          current.order_index === orderIndex &&
+          current.metadata === metadata &&
+          current.normalized_sha256 === normalized &&
+          current.content_stemmed === stemmed
+        ) {
+          counts.unchanged++;
+        } else {
+          provisionStore.update(current.id as number, values);
+          counts.updated++;
+        }
+      }
+      for (const [key, prov] of existing) {
+        if (!seen.has(key)) {
+          provisionStore.remove(prov.id as number);
+          counts.deleted++;
+        }
+      }
+
+      deleteLawReferences.run(change.id);
+      deleteLawUnresolved.run(change.id);
+      insertReferences(change.id, seed.references, lawIdsByNd);
+      upserted++;
+    }
+
+    // Links of unchanged laws to documents the census has now (an added law)
+    for (const nd of selectUnresolvedNds.all() as string[]) {
+      const target = lawIdsByNd.get(nd);
+      if (target) {
+        resolved += resolveReferences.run(target, nd).changes;
+        deleteUnresolved.run(nd);
+      }
+    }
+
+    const lawCount = db.prepare('SELECT COUNT(*) as c FROM laws').get() as { c: number };
+    const provisionCount = db.prepare('SELECT COUNT(*) as c FROM provisions').get() as { c: number };
+    const setMeta = db.prepare('INSERT OR REPLACE INTO db_metadata (key, value) VALUES (?, ?)');
+    setMeta.run('built_at', new Date().toISOString());
+    setMeta.run('builder', 'build-db.ts --apply');
+    setMeta.run('law_count', String(lawCount.c));
+    setMeta.run('provision_count', String(provisionCount.c));
+    setMeta.run('changeset_sequence', String(sequence));
+  });
+
+  apply();
+
+  db.pragma('optimize');
+  db.pragma('wal_checkpoint(TRUNCATE)');
+  db.pragma('journal_mode = DELETE');
+  db.close();
+
+  console.log(`Applied change sets ${since + 1}..${sequence}: ${upserted} laws added or changed, ${removed} removed`);
+  console.log(
+    `  Provisions: ${counts.added} added, ${counts.updated} updated, ${counts.deleted} deleted, ${counts.unchanged} unchanged`
+  );
+  console.log(`  ${resolved} waiting cross-references resolved`);
+  console.log(`Output: ${dbPath}`);
+}
+
+function writeBuildMetadata(db: Database.Database, laws: number, provisions: number, changesetSequence: number): void {
   const insertMeta = db.prepare('INSERT INTO db_metadata (key, value) VALUES (?, ?)');
   const writeMeta = db.transaction(() => {
     insertMeta.run('tier', 'free');
@@ -303,6 +897,7 @@ function writeBuildMetadata(db: Database.Database, laws: number, provisions: num
     insertMeta.run('builder', 'build-db.ts');
     insertMeta.run('law_count', String(laws));
     insertMeta.run('provision_count', String(provisions));
+    insertMeta.run('changeset_sequence', String(changesetSequence));
   });
   writeMeta();
 }
@@ -314,4 +909,11 @@ function finalizeDatabase(db: Database.Database): void {
   db.close();
 }
 
-buildDatabase();
+// Run as a script; imported (by the tests), only the exports are used
+if (process.argv[1] && path.resolve(process.argv[1]) === __filename) {
+  if (process.argv.includes('--apply')) {
+    applyChangeSets();
+  } else {
+    buildDatabase(process.argv.includes('--compress'));
+  }
+}
@@ -6,6 +6,9 @@
  * 2. Compares the census date with current date
  * 3. If census is >30 days old, prints a warning
  *
+ * Reads data/census.sqlite (written by ingest-ruslawod.py next to
+ * census.json) when present, so only the metadata and stats rows are loaded.
+ *
  * Exit codes:
  *   0 — fresh (census <30 days old)
  *   1 — stale (census >30 days old) or error
@@ -13,6 +16,7 @@
  * Usage: npm run check-updates
  */
 
+import Database from 'better-sqlite3';
 import * as fs from 'fs';
 import * as path from 'path';
 import { fileURLToPath } from 'url';
@@ -21,6 +25,7 @@ const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
 const CENSUS_PATH = path.resolve(__dirname, '../data/census.json');
+const CENSUS_DB_PATH = path.resolve(__dirname, '../data/census.sqlite');
 const PRAVO_URL = 'https://pravo.gov.ru/';
 const STALE_THRESHOLD_DAYS = 30;
 
@@ -58,26 +63,48 @@ async function checkPravoReachability(): Promise<boolean> {
 // Check census freshness
 // ─────────────────────────────────────────────────────────────────────────────
 
-interface CensusFile {
+interface CensusSummary {
   generated_at: string;
-  stats?: {
-    total: number;
-    ingestable: number;
-  };
+  stats: Record<string, number>;
+}
+
+/** generated_at and stats from census.sqlite, else from census.json; null if neither exists. */
+function readCensusSummary(): CensusSummary | null {
+  if (fs.existsSync(CENSUS_DB_PATH)) {
+    const db = new Database(CENSUS_DB_PATH, { readonly: true });
+    try {
+      const generatedAt = db.prepare("SELECT value FROM census_metadata WHERE key = 'generated_at'").pluck().get() as string;
+      const stats = Object.fromEntries(
+        (db.prepare('SELECT key, value FROM census_stats').all() as Array<{ key: string; value: number }>)
+          .map(row => [row.key, row.value])
+      );
+      return { generated_at: generatedAt, stats };
+    } finally {
+      db.close();
+    }
+  }
+  if (fs.existsSync(CENSUS_PATH)) {
+    const census = JSON.parse(fs.readFileSync(CENSUS_PATH, 'utf-8')) as { generated_at: string; stats?: Record<string, number> };
+    return { generated_at: census.generated_at, stats: census.stats ?? {} };
+  }
+  return null;
 }
 
 function checkCensusFreshness(): { fresh: boolean; daysOld: number; censusDate: string } {
-  if (!fs.existsSync(CENSUS_PATH)) {
+  const census = readCensusSummary();
+  if (!census) {
     console.error('  census.json not found. Run: npm run ingest:census');
     return { fresh: false, daysOld: -1, censusDate: 'missing' };
   }
 
-  const census = JSON.parse(fs.readFileSync(CENSUS_PATH, 'utf-8')) as CensusFile;
   const generatedAt = new Date(census.generated_at);
   const now = new Date();
   const daysOld = Math.floor((now.getTime() - generatedAt.getTime()) / (24 * 60 * 60 * 1000));
   const fresh = daysOld <= STALE_THRESHOLD_DAYS;
 
+  if (census.stats.total !== undefined) {
+    console.log(`  Census: ${census.stats.total} laws, ${census.stats.class_ingestable ?? 0} with text`);
+  }
   return { fresh, daysOld, censusDate: census.generated_at };
 }
 
@@ -5,6 +5,10 @@
  * Loads fixtures/golden-hashes.json and compares SHA-256 hashes
  * of normalized provision text against the current database.
  *
+ * With --against <previous.db>, compares every provision of the current
+ * database with an earlier build instead: the stored normalized_sha256
+ * column makes that a single indexed join, with no text re-hashed.
+ *
  * Reports: OK, DRIFT, ERROR, SKIP
  *
  * Exit codes:
@@ -13,13 +17,15 @@
  *   2 — drift detected (content has changed)
  *
  * Usage: npm run drift:detect
+ *        npm run drift:detect -- --against data/previous.db
  */
 
 import * as fs from 'fs';
 import * as path from 'path';
-import { createHash } from 'crypto';
 import { fileURLToPath } from 'url';
 import Database from 'better-sqlite3';
+import { normalizeText, normalizedSha256 } from './lib/provision-hash.js';
+import { inflateProvisionText } from '../src/utils/provision-text.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -57,17 +63,16 @@ interface CheckResult {
   message?: string;
 }
 
-// ─────────────────────────────────────────────────────────────────────────────
-// Helpers
-// ─────────────────────────────────────────────────────────────────────────────
-
-function normalizeText(text: string): string {
-  return text.replace(/\s+/g, ' ').trim().toLowerCase();
+/** A provision whose normalized hash differs between two builds, or that is only in one. */
+interface ProvisionDiff {
+  law_id: string;
+  article: string;
+  part: string | null;
+  paragraph: string | null;
 }
 
-function sha256(text: string): string {
-  return createHash('sha256').update(text).digest('hex');
-}
+/** Provisions listed per category in the --against report. */
+const MAX_LISTED = 20;
 
 // ─────────────────────────────────────────────────────────────────────────────
 // Main
@@ -93,6 +98,24 @@ function main(): void {
 
   const db = new Database(DB_PATH, { readonly: true });
 
+  const against = process.argv.indexOf('--against');
+  if (against !== -1) {
+    compareDatabases(db, process.argv[against + 1]);
+    return;
+  }
+
+  // Databases built before the column existed are hashed here
+  const hashColumn = hasNormalizedHashes(db, 'main') ? 'p.normalized_sha256' : 'NULL AS normalized_sha256';
+  // Exact duplicates keep their text in the provision they point at
+  const contentColumn = hasProvisionColumn(db, 'main', 'duplicate_of')
+    ? 'COALESCE((SELECT o.content FROM provisions o WHERE o.id = p.duplicate_of), p.content) AS content'
+    : 'p.content';
+  // Databases built with --compress keep it in content_z
+  const dictionary = contentDictionary(db);
+  const compressedColumn = dictionary
+    ? ', COALESCE((SELECT o.content_z FROM provisions o WHERE o.id = p.duplicate_of), p.content_z) AS content_z'
+    : '';
+
   const results: CheckResult[] = [];
   let driftCount = 0;
   let errorCount = 0;
@@ -103,12 +126,14 @@ function main(): void {
     const { document_id, article, sha256: expectedHash } = entry;
 
     try {
-      // Query provision from database
-      const row = db.prepare(
-        'SELECT content FROM provisions WHERE law_id = ? AND article = ?'
-      ).get(document_id, article) as { content: string } | undefined;
+      // Query provision from database; --split-parts builds hold an article as a row per part and item
+      const rows = db.prepare(
+        `SELECT ${contentColumn}, ${hashColumn}${compressedColumn} FROM provisions p
+         WHERE p.law_id = ? AND p.article = ? ORDER BY p.order_index`
+      ).all(document_id, article) as
+        { content: string; normalized_sha256: string | null; content_z?: Buffer | null }[];
 
-      if (!row) {
+      if (rows.length === 0) {
         results.push({
           document_id,
           article,
@@ -119,9 +144,19 @@ function main(): void {
         continue;
       }
 
-      // Normalize and hash
-      const normalized = normalizeText(row.content);
-      const actualHash = sha256(normalized);
+      for (const row of rows) {
+        if (row.content_z && dictionary) {
+          row.content = inflateProvisionText(row.content_z, dictionary);
+        }
+      }
+      // The parts are the article's lines cut at their markers, so joined they hash as the article
+      const row = rows.length === 1 ? rows[0] : {
+        content: rows.map(r => r.content).join('\n'),
+        normalized_sha256: null,
+      };
+
+      // Stored at build time; computed for provisions without it
+      const actualHash = row.normalized_sha256 ?? normalizedSha256(row.content);
 
       if (actualHash === expectedHash) {
         results.push({ document_id, article, status: 'OK' });
@@ -133,7 +168,7 @@ function main(): void {
           status: 'DRIFT',
           expected_hash: expectedHash,
           actual_hash: actualHash,
-          message: `Content has changed. Snippet: "${normalized.substring(0, 60)}..."`,
+          message: `Content has changed. Snippet: "${normalizeText(row.content).substring(0, 60)}..."`,
         });
         driftCount++;
       }
@@ -179,4 +214,89 @@ function main(): void {
   }
 }
 
+function hasProvisionColumn(db: Database.Database, schema: string, column: string): boolean {
+  return db.prepare(`SELECT 1 FROM ${schema}.pragma_table_info('provisions') WHERE name = ?`).get(column) !== undefined;
+}
+
+function contentDictionary(db: Database.Database): Buffer | null {
+  const hasTable = db.prepare(
+    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'content_dictionary'"
+  ).get() !== undefined;
+  if (!hasTable) {
+    return null;
+  }
+  const row = db.prepare('SELECT dictionary FROM content_dictionary WHERE id = 1').get() as
+    { dictionary: Buffer } | undefined;
+  return row?.dictionary ?? null;
+}
+
+function hasNormalizedHashes(db: Database.Database, schema: string): boolean {
+  return hasProvisionColumn(db, schema, 'normalized_sha256');
+}
+
+/**
+ * Whole-corpus drift against an earlier build: provisions are matched by
+ * (law_id, article, part, paragraph) and compared by normalized_sha256.
+ */
+function compareDatabases(db: Database.Database, previousPath: string | undefined): void {
+  if (!previousPath || !fs.existsSync(previousPath)) {
+    console.error(`  ERROR: --against needs an existing database (got ${previousPath ?? 'nothing'})`);
+    process.exit(1);
+  }
+  db.prepare('ATTACH DATABASE ? AS previous').run(path.resolve(previousPath));
+  for (const [schema, file] of [['main', DB_PATH], ['previous', previousPath]]) {
+    if (!hasNormalizedHashes(db, schema)) {
+      console.error(`  ERROR: ${file} has no provisions.normalized_sha256; rebuild it with npm run build:db`);
+      process.exit(1);
+    }
+  }
+  console.log(`Comparing ${DB_PATH} against ${previousPath}\n`);
+
+  const sameProvision = `
+    p.law_id = c.law_id AND p.article = c.article
+    AND COALESCE(p.part, '') = COALESCE(c.part, '') AND COALESCE(p.paragraph, '') = COALESCE(c.paragraph, '')
+  `;
+  const columns = 'c.law_id, c.article, c.part, c.paragraph';
+  const changed = db.prepare(`
+    SELECT ${columns} FROM main.provisions c JOIN previous.provisions p ON ${sameProvision}
+    WHERE p.normalized_sha256 IS NOT c.normalized_sha256
+    ORDER BY c.law_id, c.order_index
+  `).all() as ProvisionDiff[];
+  const added = db.prepare(`
+    SELECT ${columns} FROM main.provisions c
+    WHERE NOT EXISTS (SELECT 1 FROM previous.provisions p WHERE ${sameProvision})
+    ORDER BY c.law_id, c.order_index
+  `).all() as ProvisionDiff[];
+  const removed = db.prepare(`
+    SELECT ${columns} FROM previous.provisions c
+    WHERE NOT EXISTS (SELECT 1 FROM main.provisions p WHERE ${sameProvision})
+    ORDER BY c.law_id, c.order_index
+  `).all() as ProvisionDiff[];
+  const total = db.prepare('SELECT COUNT(*) AS c FROM main.provisions').get() as { c: number };
+  db.close();
+
+  const label = (r: ProvisionDiff): string =>
+    `${r.law_id} art.${r.article}${r.part ? ` part ${r.part}` : ''}${r.paragraph ? ` item ${r.paragraph}` : ''}`;
+  for (const [status, rows] of [['DRIFT', changed], ['ADDED', added], ['REMOVED', removed]] as const) {
+    for (const r of rows.slice(0, MAX_LISTED)) {
+      console.log(`  [${status.padEnd(7)}] ${label(r)}`);
+    }
+    if (rows.length > MAX_LISTED) {
+      console.log(`  [${status.padEnd(7)}] ... and ${rows.length - MAX_LISTED} more`);
+    }
+  }
+
+  const unchanged = total.c - changed.length - added.length;
+  console.log(`\n─────────────────────────────────`);
+  console.log(
+    `Results: ${unchanged} OK, ${changed.length} DRIFT, ${added.length} ADDED, ${removed.length} REMOVED`
+  );
+  if (changed.length + added.length + removed.length > 0) {
+    console.log('Exit: 2 (drift detected)');
+    process.exit(2);
+  }
+  console.log('Exit: 0 (all hashes match)');
+  process.exit(0);
+}
+
 main();
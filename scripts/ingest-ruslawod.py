@@ -13,16 +13,49 @@ Usage:
   python3 scripts/ingest-ruslawod.py              # Full ingestion
   python3 scripts/ingest-ruslawod.py --census-only # Census only (no text parsing)
   python3 scripts/ingest-ruslawod.py --batch 1     # Process only parquet batch 1
+  python3 scripts/ingest-ruslawod.py --workers 8   # Parse documents in 8 processes
+  python3 scripts/ingest-ruslawod.py --fetch-batch-size 64  # Smaller Arrow batches (less RAM)
+  python3 scripts/ingest-ruslawod.py --concurrency 4        # Ingest 4 parquet files at once
+  python3 scripts/ingest-ruslawod.py --prefetch 0           # No read-ahead of the next batches/file
+  python3 scripts/ingest-ruslawod.py --source data/ruslawod # Read a local mirror of the parquet files
+  python3 scripts/ingest-ruslawod.py --sqlite data/database.db  # Write the database directly (no seeds)
+  python3 scripts/ingest-ruslawod.py --sqlite data/database.db --compress  # Provision text deflated
+  python3 scripts/ingest-ruslawod.py --seed-format shards        # Seeds as zstd NDJSON shards
+  python3 scripts/ingest-ruslawod.py --split-parts # Articles split into parts and items (149.3.2)
+  python3 scripts/ingest-ruslawod.py --resume      # Retry only the files a failed run did not finish
+  python3 scripts/ingest-ruslawod.py --two-phase   # Fetch text only for new or changed documents
+  python3 scripts/ingest-ruslawod.py --two-phase --full-every 5  # ... and all text every 5th run
+  python3 scripts/ingest-ruslawod.py --shard 2/4   # Parse a quarter of the documents (one of 4 nodes)
+  python3 scripts/ingest-ruslawod.py merge         # Combine the census slices of all --shard runs
+  python3 scripts/ingest-ruslawod.py --metrics-out data/metrics.json  # Stage timings and counters
+  python3 scripts/ingest-ruslawod.py --batch 3 --profile batch3.prof   # cProfile one file
+  python3 scripts/ingest-ruslawod.py --dedup-report data/dedup.json  # Exact and near-duplicate provisions/laws
 """
 
+import bisect
+import cProfile
+import gzip
 import json
+import multiprocessing
 import os
+import queue
 import re
+import shutil
+import sqlite3
 import sys
 import time
 import hashlib
+import threading
+import traceback
+import zlib
+from array import array
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
 
 try:
     import duckdb
@@ -30,6 +63,17 @@ except ImportError:
     print("ERROR: duckdb not installed. Run: pip3 install duckdb")
     sys.exit(1)
 
+try:
+    import pyarrow  # used by DuckDB for Arrow record batch streaming
+except ImportError:
+    print("ERROR: pyarrow not installed. Run: pip3 install pyarrow")
+    sys.exit(1)
+
+try:
+    import zstandard  # optional: zstd-compressed seed shards
+except ImportError:
+    zstandard = None
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
@@ -41,11 +85,20 @@ SEED_DIR = DATA_DIR / "seed"
 CENSUS_PATH = DATA_DIR / "census.json"
 
 # ---------------------------------------------------------------------------
-# RusLawOD remote parquet files
+# RusLawOD parquet files (remote, or a local mirror via --source)
 # ---------------------------------------------------------------------------
 
 HF_BASE = "https://huggingface.co/datasets/irlspbru/RusLawOD/resolve/main"
-PARQUET_FILES = [f"{HF_BASE}/ruslawod_{i:02d}.parquet" for i in range(1, 12)]
+PARQUET_NAMES = [f"ruslawod_{i:02d}.parquet" for i in range(1, 12)]
+PARQUET_FILES = [f"{HF_BASE}/{name}" for name in PARQUET_NAMES]
+
+
+def parquet_sources(source_dir: Optional[str]) -> list[str]:
+    """Parquet locations in batch order: the Hugging Face URLs, or the same
+    ruslawod_NN.parquet layout under a local mirror directory."""
+    if not source_dir:
+        return PARQUET_FILES
+    return [str(Path(source_dir) / name) for name in PARQUET_NAMES]
 
 # SQL filter for federal legislation
 FEDERAL_FILTER = """
@@ -64,6 +117,7 @@ FEDERAL_FILTER = """
 # ---------------------------------------------------------------------------
 
 REF_TAG_PATTERN = re.compile(r'<ref\s+nd="[^"]*">\s*', re.IGNORECASE)
+REF_TARGET_PATTERN = re.compile(r'<ref\s+nd="([^"]*)">\s*', re.IGNORECASE)
 REF_CLOSE_PATTERN = re.compile(r'\s*</ref>', re.IGNORECASE)
 HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
 
@@ -87,12 +141,166 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
+# JavaScript's \s, so the hash matches normalizeText() in drift-detect.ts.
+# str.split() splits on the same characters except \x1c-\x1f and \x85
+# (Python only) and \ufeff (JavaScript only), and is much faster, so the
+# pattern is only used for text containing one of those.
+JS_WHITESPACE_PATTERN = re.compile(
+    '[\t\n\v\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff]+')
+WHITESPACE_MISMATCHES = ("\x1c", "\x1d", "\x1e", "\x1f", "\x85", "\ufeff")
+
+
+def normalized_sha256(content: str) -> str:
+    """SHA-256 of content with whitespace collapsed and lowercased, as drift-detect.ts hashes it."""
+    if not any(ch in content for ch in WHITESPACE_MISMATCHES):
+        normalized = " ".join(content.split()).lower()
+    else:
+        normalized = JS_WHITESPACE_PATTERN.sub(" ", content).strip(" ").lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Russian stemming (provisions.content_stemmed)
+# ---------------------------------------------------------------------------
+
+# The Snowball Russian stemmer (snowballstem.org/algorithms/russian), ported
+# to src/utils/stemmer-ru.ts so search queries are stemmed the same way;
+# fixtures/stemmer-ru.json holds shared test vectors. Every ending table
+# maps an ending to its group: 1 needs а or я before it, 2 does not.
+RU_VOWELS = frozenset("аеиоуыэюя")
+
+
+def _ru_endings(group1: str, group2: str = "") -> tuple[dict[str, int], tuple[int, ...]]:
+    """An ending table and its ending lengths, longest first."""
+    endings = dict.fromkeys(group1.split(), 1) | dict.fromkeys(group2.split(), 2)
+    return endings, tuple(sorted({len(e) for e in endings}, reverse=True))
+
+
+RU_PERFECTIVE_GERUND = _ru_endings("в вши вшись", "ив ивши ившись ыв ывши ывшись")
+RU_ADJECTIVE = _ru_endings("", "ее ие ые ое ими ыми ей ий ый ой ем им ым ом его ого ему ому их ых ую юю ая яя ою ею")
+RU_PARTICIPLE = _ru_endings("ем нн вш ющ щ", "ивш ывш ующ")
+RU_REFLEXIVE = _ru_endings("", "ся сь")
+RU_VERB = _ru_endings(
+    "ла на ете йте ли й л ем н ло но ет ют ны ть ешь нно",
+    "ила ыла ена ейте уйте ите или ыли ей уй ил ыл им ым ен ило ыло ено ят ует уют ит ыт ены ить ыть ишь ую ю")
+RU_NOUN = _ru_endings("", "а ев ов ие ье е иями ями ами еи ии и ией ей ой ий й иям ям ием ем ам ом о у ах иях ях ы ь "
+                          "ию ью ю ия ья я")
+RU_DERIVATIONAL = _ru_endings("", "ост ость")
+RU_TIDY_UP = _ru_endings("", "ейш ейше н ь")
+
+
+def _ru_find(word: str, rv: int, table: tuple[dict[str, int], tuple[int, ...]]) -> int:
+    """Length of the longest ending of word inside RV, or 0.
+
+    A group 1 ending only counts if а or я precedes it inside RV.
+    """
+    endings, lengths = table
+    for n in lengths:
+        start = len(word) - n
+        if start < rv:
+            continue
+        group = endings.get(word[start:])
+        if group is not None:
+            if group == 1 and (start - 1 < rv or word[start - 1] not in "ая"):
+                return 0
+            return n
+    return 0
+
+
+@lru_cache(maxsize=1 << 17)
+def stem_ru(word: str) -> str:
+    """Snowball Russian stem of a lowercase word; other words come back unchanged."""
+    word = word.replace("ё", "е")
+    # RV: after the first vowel. R2: after the second vowel/non-vowel pair past RV's start.
+    rv = r2 = len(word)
+    i = 0
+    while i < len(word) and word[i] not in RU_VOWELS:
+        i += 1
+    if i == len(word):
+        return word
+    rv = i + 1
+    state, i = 0, rv
+    while i < len(word):
+        if (word[i] in RU_VOWELS) == (state == 1):
+            state += 1
+            if state == 3:
+                r2 = i + 1
+                break
+        i += 1
+
+    # Step 1
+    n = _ru_find(word, rv, RU_PERFECTIVE_GERUND)
+    if n:
+        word = word[:-n]
+    else:
+        n = _ru_find(word, rv, RU_REFLEXIVE)
+        if n:
+            word = word[:-n]
+        n = _ru_find(word, rv, RU_ADJECTIVE)
+        if n:
+            word = word[:-n]
+            n = _ru_find(word, rv, RU_PARTICIPLE)
+            if n:
+                word = word[:-n]
+        else:
+            n = _ru_find(word, rv, RU_VERB) or _ru_find(word, rv, RU_NOUN)
+            if n:
+                word = word[:-n]
+
+    # Step 2
+    if word.endswith("и") and len(word) - 1 >= rv:
+        word = word[:-1]
+
+    # Step 3
+    n = _ru_find(word, rv, RU_DERIVATIONAL)
+    if n and len(word) - n >= r2:
+        word = word[:-n]
+
+    # Step 4
+    n = _ru_find(word, rv, RU_TIDY_UP)
+    if n == 1 and word[-1] == "ь":
+        word = word[:-1]
+    elif n:
+        if n > 1:
+            word = word[:-n]
+        if word.endswith("нн") and len(word) - 2 >= rv:
+            word = word[:-1]
+    return word
+
+
+# Tokens as the FTS5 unicode61 tokenizer sees them: runs of letters and digits
+FTS_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+@lru_cache(maxsize=1 << 17)
+def _stem_chunk(chunk: str) -> str:
+    """Stems of one whitespace-separated chunk; most are a single word, maybe with punctuation."""
+    if chunk.isalpha():
+        return stem_ru(chunk)
+    return " ".join(map(stem_ru, FTS_TOKEN_PATTERN.findall(chunk)))
+
+
+def stem_text(text: str) -> str:
+    """text as space-separated, lowercased Snowball stems (provisions.content_stemmed)."""
+    return " ".join(filter(None, map(_stem_chunk, text.lower().split())))
+
+
+def provision_stems(provision: dict) -> str:
+    """provisions.content_stemmed: the stem_text() of a provision's title and content."""
+    title = provision.get("title")
+    return stem_text(f"{title}\n{provision['content']}" if title else provision["content"])
+
+
 # ---------------------------------------------------------------------------
 # Article parser
 # ---------------------------------------------------------------------------
 
 def parse_articles(text: str) -> list[dict]:
-    """Parse Russian law text into article-level provisions."""
+    """Parse Russian law text into article-level provisions.
+
+    Reference implementation: ingestion uses scan_provisions(), which must
+    return exactly parse_articles(clean_text(text)).
+    """
     provisions = []
     lines = text.split("\n")
     current_num = ""
@@ -175,6 +383,290 @@ def parse_articles(text: str) -> list[dict]:
     return deduped
 
 
+# ---------------------------------------------------------------------------
+# Single-pass scanner (clean_text + parse_articles in one sweep)
+# ---------------------------------------------------------------------------
+
+# "Статья N." and "Статья N" in one pattern: the first alternative is
+# ARTICLE_PATTERN, the second ARTICLE_PATTERN_ALT, tried in the same order.
+ARTICLE_HEADING_PATTERN = re.compile(
+    r'Статья\s+(?:(\d+(?:\.\d+)?)\.\s*(.*)|(\d+(?:\.\d+)?)\b[\.\s]*(.*))'
+)
+TITLE_AS_BODY_PATTERN = re.compile(r'\d+\.\s')
+REF_CLOSE_TAG_PATTERN = re.compile(r'</ref>', re.IGNORECASE)
+
+# First characters (of a stripped line) that can start an appendix or a
+# chapter heading; every other line skips those regexes entirely.
+APPENDIX_FIRST_CHARS = frozenset("Пп")
+CHAPTER_FIRST_CHARS = frozenset("ГгРрЧчПп")
+
+
+def scan_provisions(text: str, skip_repeats: bool = True) -> list[dict]:
+    """Clean and segment law text in one pass over its lines.
+
+    With skip_repeats=False, returns exactly parse_articles(clean_text(text)),
+    including the merge of repeated article numbers, but only runs the
+    markup regexes when the text has markup and only tries the heading
+    regexes on lines whose first character can start one. By default a
+    repeat that is a verbatim copy of text already in the article is not
+    appended again. Mirrors parseRussianText() in scripts/lib/parser.ts.
+    """
+    if not text:
+        return []
+
+    # Ref tags swallow the whitespace (newlines included) around them, so
+    # markup has to go before the text is split into lines.
+    if "<" in text:
+        text = REF_TAG_PATTERN.sub("", text)
+        # Same as REF_CLOSE_PATTERN.sub("", text): a leading \s* makes the
+        # regex engine try every position, so split on the literal tag and
+        # strip the whitespace in front of each occurrence instead.
+        pieces = REF_CLOSE_TAG_PATTERN.split(text)
+        if len(pieces) > 1:
+            last = pieces.pop()
+            text = "".join([piece.rstrip() for piece in pieces] + [last])
+        text = HTML_TAG_PATTERN.sub("", text)
+    if "\u00A0" in text or "\u2003" in text or "\u2002" in text:
+        text = text.replace("\u00A0", " ").replace("\u2003", " ").replace("\u2002", " ")
+    # Same as re.sub(' +', ' ', text); each replace() halves every run of spaces
+    while "  " in text:
+        text = text.replace("  ", " ")
+
+    provisions: list[dict] = []
+    position: dict[str, int] = {}
+    chunks: list[set[str]] = []
+    current_num = ""
+    current_title = ""
+    current_content: list[str] = []
+    blank_pending = False
+    in_appendix = False
+
+    def flush():
+        if current_num and current_content:
+            content = "\n".join(current_content)
+            i = position.get(current_num)
+            if i is None:
+                position[current_num] = len(provisions)
+                chunks.append({content})
+                provisions.append({
+                    "article": current_num,
+                    "title": current_title,
+                    "content": content,
+                    "provision_ref": current_num,
+                    "order_index": len(provisions),
+                })
+            elif not skip_repeats or content not in chunks[i]:
+                chunks[i].add(content)
+                provisions[i]["content"] += "\n\n" + content
+
+    for raw_line in text.split("\n"):
+        line = raw_line.strip()
+        if not line:
+            # Runs of blank lines inside an article collapse to one; trailing ones are dropped
+            if current_content:
+                blank_pending = True
+            continue
+
+        first = line[0]
+        m = ARTICLE_HEADING_PATTERN.match(line) if first == "С" else None
+
+        if m is None:
+            if first in APPENDIX_FIRST_CHARS and APPENDIX_PATTERN.match(line):
+                in_appendix = True
+                flush()
+                current_num, current_title, current_content, blank_pending = "", "", [], False
+                continue
+            if in_appendix:
+                continue
+            if first in CHAPTER_FIRST_CHARS and CHAPTER_PATTERN.match(line):
+                continue
+            if current_num:
+                if blank_pending:
+                    current_content.append("")
+                    blank_pending = False
+                current_content.append(line)
+            continue
+
+        in_appendix = False
+        flush()
+        if m.group(1) is not None:
+            current_num, rest = m.group(1), m.group(2)
+        else:
+            current_num, rest = m.group(3), m.group(4)
+        current_title, current_content, blank_pending = "", [], False
+
+        rest = rest.strip()
+        if rest:
+            if len(rest) < 200 and not TITLE_AS_BODY_PATTERN.match(rest):
+                current_title = rest
+            else:
+                current_content.append(rest)
+
+    flush()
+    return provisions
+
+
+# scan_references() replaces each <ref nd="..."> tag with REF_MARK and finds
+# the lines scan_provisions() treats as article or appendix headings with
+# one regex (ARTICLE_HEADING_PATTERN's number alternatives, tried in the
+# same order, and APPENDIX_PATTERN). Markup in front of a heading is skipped
+# rather than removed, except </ref>, which joins its line to the one above.
+# Anchoring on "\n" instead of a multiline "^" lets the regex engine jump
+# from line to line.
+REF_MARK = "\x00"
+REFERENCE_HEADING_PATTERN = re.compile(
+    r'\n(?:[^\S\n]|\x00|<(?!(?i:/ref>))[^>\n]*>)*'
+    r'(?:Статья[^\S\n]+(?:(\d+(?:\.\d+)?)\.|(\d+(?:\.\d+)?)\b)|(?i:приложение)\b)'
+)
+
+
+def scan_references(text: str, provisions: list[dict]) -> list[dict]:
+    """The <ref nd="..."> links of a document, grouped by the article they appear in.
+
+    provisions is scan_provisions(text). Returns [{"provision_ref", "targets"}]
+    in order of first appearance, each target nd listed once per article;
+    links outside the articles (preamble, appendices, headings without text)
+    are grouped under provision_ref None. A link belongs to the last
+    heading line before it.
+    """
+    if "<" not in text:
+        return []
+    pieces = REF_TARGET_PATTERN.split(text)
+    if len(pieces) == 1:
+        return []
+    pieces[0] = "\n" + pieces[0]
+    marked = REF_MARK.join(pieces[::2])
+    targets = pieces[1::2]
+
+    bounds = [0]
+    segment_articles: list[Optional[str]] = [None]
+    for m in REFERENCE_HEADING_PATTERN.finditer(marked):
+        bounds.append(m.start())
+        segment_articles.append(m.group(1) or m.group(2))
+    bounds.append(len(marked))
+
+    articles = {p["article"] for p in provisions}
+    groups: dict[Optional[str], dict[str, None]] = {}
+    position = 0
+    for i, article in enumerate(segment_articles):
+        count = marked.count(REF_MARK, bounds[i], bounds[i + 1])
+        if count:
+            ref = article if article in articles else None
+            groups.setdefault(ref, {}).update(dict.fromkeys(targets[position:position + count]))
+            position += count
+    groups = {ref: [nd for nd in nds if nd] for ref, nds in groups.items()}
+    return [{"provision_ref": ref, "targets": nds} for ref, nds in groups.items() if nds]
+
+
+# ---------------------------------------------------------------------------
+# Part and item split (--split-parts)
+# ---------------------------------------------------------------------------
+
+# Numbered parts ("1.", "2.1.") and items ("1)", "2.1)", "а)") at the start of
+# a line. A marker only counts if it continues the numbering of its level
+# ("1." first, then a later number with a major at most one higher), so
+# numbered lists quoted inside an item stay in its content. Items split one
+# level deep: "а)" sub-items of a numbered item stay in that item.
+PART_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\.\s')
+ITEM_PATTERN = re.compile(r'(?:(\d+(?:\.\d+)?)\)|([а-я])\))\s')
+ITEM_LETTERS = "абвгдежзиклмнопрстуфхцчшщэюя"
+
+
+def _marker_key(label: str) -> tuple[int, ...]:
+    if label in ITEM_LETTERS:
+        return (ITEM_LETTERS.index(label) + 1,)
+    return tuple(int(n) for n in label.split("."))
+
+
+def _continues(previous: Optional[tuple[int, ...]], key: tuple[int, ...]) -> bool:
+    if previous is None:
+        return key == (1,)
+    return key > previous and key[0] <= previous[0] + 1
+
+
+def _split_lines(lines: list[str], match_marker: Callable[[str], Optional[str]]) -> tuple[list[str], list[tuple[str, list[str]]]]:
+    """Split lines at numbered markers: (lines before the first marker, [(label, lines)])."""
+    lead: list[str] = []
+    sections: list[tuple[str, list[str]]] = []
+    previous = None
+    kind = None
+    for line in lines:
+        label = match_marker(line)
+        if label is not None:
+            label_kind = label in ITEM_LETTERS
+            key = _marker_key(label)
+            if (kind is None or label_kind == kind) and _continues(previous, key):
+                kind = label_kind
+                previous = key
+                sections.append((label, [line]))
+                continue
+        (sections[-1][1] if sections else lead).append(line)
+    return lead, sections
+
+
+def _part_label(line: str) -> Optional[str]:
+    m = PART_PATTERN.match(line)
+    return m.group(1) if m else None
+
+
+def _item_label(line: str) -> Optional[str]:
+    m = ITEM_PATTERN.match(line)
+    return (m.group(1) or m.group(2)) if m else None
+
+
+def split_provisions(provisions: list[dict]) -> list[dict]:
+    """Split articles into numbered parts and items.
+
+    An article with at least two parts becomes a row per part (part set),
+    and a part with at least two items a row per item (paragraph set);
+    items directly under an article get paragraph without part. Text before
+    the first marker stays in a row of its own for the article or part.
+    provision_ref is article.part.paragraph (e.g. 149.3.2), with the dots of
+    inserted numbers written as hyphens (part 2.1 is 149.2-1); every row
+    keeps the article number and title. Other articles are left whole.
+    """
+    rows: list[dict] = []
+
+    def emit(provision: dict, lines: list[str], part: Optional[str], paragraph: Optional[str]) -> None:
+        content = "\n".join(lines).strip()
+        if not content:
+            return
+        ref = ".".join([provision["article"]] + [n.replace(".", "-") for n in (part, paragraph) if n is not None])
+        rows.append({
+            "article": provision["article"],
+            "title": provision["title"],
+            "content": content,
+            "provision_ref": ref,
+            "order_index": len(rows),
+            "part": part,
+            "paragraph": paragraph,
+        })
+
+    def emit_items(provision: dict, lines: list[str], part: Optional[str]) -> None:
+        lead, items = _split_lines(lines, _item_label)
+        if len(items) < 2:
+            emit(provision, lines, part, None)
+            return
+        emit(provision, lead, part, None)
+        for label, item_lines in items:
+            emit(provision, item_lines, part, label)
+
+    for provision in provisions:
+        lines = provision["content"].split("\n")
+        intro, parts = _split_lines(lines, _part_label)
+        if len(parts) >= 2:
+            emit(provision, intro, None, None)
+            for label, part_lines in parts:
+                emit_items(provision, part_lines, label)
+        else:
+            before = len(rows)
+            emit_items(provision, lines, None)
+            if len(rows) == before + 1:
+                # Nothing to split: keep the article row exactly as scanned
+                rows[-1] = dict(provision, order_index=before, part=None, paragraph=None)
+    return rows
+
+
 # ---------------------------------------------------------------------------
 # ID generation
 # ---------------------------------------------------------------------------
@@ -205,17 +697,20 @@ CODE_SLUGS = {
 }
 
 
+# "часть первая" etc. in a code heading; alternatives are tried in this order
+CODE_PART_NUMBERS = {"перв": "1", "втор": "2", "трет": "3", "четверт": "4",
+                     "первая": "1", "вторая": "2", "третья": "3", "четвёртая": "4",
+                     "1": "1", "2": "2", "3": "3", "4": "4"}
+CODE_PART_PATTERN = re.compile(r'часть\s+(' + "|".join(CODE_PART_NUMBERS) + ')')
+
+
 def make_code_slug(heading: str) -> str:
     heading_lower = heading.lower()
     for pattern, slug in CODE_SLUGS.items():
         if pattern in heading_lower:
-            part_match = re.search(r'часть\s+(перв|втор|трет|четверт|первая|вторая|третья|четвёртая|1|2|3|4)', heading_lower)
+            part_match = CODE_PART_PATTERN.search(heading_lower)
             if part_match:
-                part_text = part_match.group(1)
-                part_num = {"перв": "1", "первая": "1", "1": "1",
-                           "втор": "2", "вторая": "2", "2": "2",
-                           "трет": "3", "третья": "3", "3": "3",
-                           "четверт": "4", "четвёртая": "4", "4": "4"}.get(part_text, "")
+                part_num = CODE_PART_NUMBERS.get(part_match.group(1), "")
                 if part_num:
                     return f"{slug}-{part_num}"
             return slug
@@ -299,175 +794,2478 @@ def parse_date(date_str: str) -> Optional[str]:
     return None
 
 
+def census_entry(nd, doc_type, heading, doc_number, date_str, status_ips, issued_by, text) -> Optional[dict]:
+    """Map one raw RusLawOD row to its census entry, or None if it is not federal legislation.
+
+    This is the reference for census_query(): the SQL pipeline must produce the
+    same entry for every row.
+    """
+    nd = str(nd or "")
+    doc_type = str(doc_type or "")
+    heading = str(heading or "")
+    doc_number = str(doc_number or "").strip()
+    date_str = str(date_str or "").strip()
+    status_ips = str(status_ips or "")
+    issued_by = str(issued_by or "")
+    text = str(text or "")
+
+    # Skip NaN/None doc types that don't match by other criteria
+    if doc_type in ("nan", "None", "") and "ФЗ" not in doc_number and "ФКЗ" not in doc_number:
+        # Check if it matches by issuedByIPS
+        if not any(issued_by.startswith(p) for p in ["Федеральный закон", "Федеральный конституционный закон"]):
+            return None
+
+    return {
+        "id": make_law_id(doc_number, date_str, heading, doc_type),
+        "nd": nd,
+        "title": heading,
+        "identifier": doc_number,
+        "law_type": map_law_type(doc_type, doc_number, issued_by, heading),
+        "status": map_status(status_ips),
+        "effective_date": parse_date(date_str) or "",
+        "classification": "ingestable" if text and len(text) > 50 else "metadata_only",
+        "source_url": f"http://pravo.gov.ru/proxy/ips/?docbody=&nd={nd}" if nd else "",
+    }
+
+
 # ---------------------------------------------------------------------------
-# Main ingestion using DuckDB
+# Census in SQL (--census-only)
 # ---------------------------------------------------------------------------
 
-def ingest_batch(con: duckdb.DuckDBPyConnection, parquet_url: str, census_only: bool) -> tuple[list[dict], int, int]:
-    """Extract federal legislation from a single remote parquet file.
+# The census functions above, restated as one DuckDB query so --census-only
+# runs column-wise. RE2 has no Python-compatible \s or \d, so both are
+# spelled out: the characters str.isspace() accepts (which is also what
+# str.strip() removes) and Unicode decimal digits.
+PY_WHITESPACE_CLASS = (
+    r"[\t\n\x{0b}\x{0c}\r\x{1c}-\x{1f} \x{85}\x{a0}\x{1680}\x{2000}-\x{200a}"
+    r"\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]"
+)
+PY_DIGIT_CLASS = r"\p{Nd}"
 
-    Returns: (census_entries, laws_written, total_provisions)
+CENSUS_FIELDS = ("id", "nd", "title", "identifier", "law_type", "status",
+                 "effective_date", "classification", "source_url")
+
+CONST_AMENDMENT_TYPE = "Закон Российской Федерации о поправке к Конституции Российской Федерации"
+
+def sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _sql_strip(expr: str) -> str:
+    ws = PY_WHITESPACE_CLASS
+    return f"regexp_replace({expr}, {sql_literal(f'^{ws}+|{ws}+$')}, '', 'g')"
+
+
+def _sql_zfill2(expr: str) -> str:
+    # str.zfill(2): lpad, except a lone sign keeps its place ('-' -> '-0')
+    return (f"CASE WHEN length({expr}) >= 2 THEN {expr} "
+            f"WHEN {expr} IN ('+', '-') THEN {expr} || '0' "
+            f"ELSE lpad({expr}, 2, '0') END")
+
+
+def census_query(parquet_url: str, row_numbers: bool = False) -> str:
+    """SQL producing CENSUS_FIELDS for every federal row, in file order.
+
+    Matches census_entry() with an empty text, so classification is always
+    metadata_only. effective_date is reassembled from the dotted string like
+    parse_date() does rather than parsed with strptime, which would reject
+    the malformed dates that parse_date() passes through.
+
+    With row_numbers, each row also gets its position in the parquet file
+    as a last row_number column (for --two-phase).
     """
-    # Query only federal legislation with all needed columns
-    if census_only:
-        query = f"""
-            SELECT pravogovruNd, doc_typeIPS, headingIPS, docNumberIPS,
-                   docdateIPS, statusIPS, issuedByIPS
-            FROM read_parquet('{parquet_url}')
-            WHERE {FEDERAL_FILTER}
-        """
+    source = parquet_url.replace("'", "''")
+    if row_numbers:
+        source_columns = "file_row_number AS row_number,"
+        parquet = f"read_parquet('{source}', file_row_number = true)"
+        row_number = ",\n            row_number"
     else:
-        query = f"""
-            SELECT pravogovruNd, doc_typeIPS, headingIPS, docNumberIPS,
-                   docdateIPS, statusIPS, issuedByIPS, textIPS
-            FROM read_parquet('{parquet_url}')
+        source_columns = row_number = ""
+        parquet = f"read_parquet('{source}')"
+    digits = PY_DIGIT_CLASS
+    ws = PY_WHITESPACE_CLASS
+
+    code_base = "CASE " + " ".join(
+        f"WHEN contains(lower(heading), {sql_literal(pattern)}) THEN {sql_literal(slug)}"
+        for pattern, slug in CODE_SLUGS.items()
+    ) + " END"
+    part_pattern = "часть" + ws + "+(" + "|".join(CODE_PART_NUMBERS) + ")"
+    code_part = "CASE regexp_extract(lower(heading), {}, 1) {} ELSE '' END".format(
+        sql_literal(part_pattern),
+        " ".join(f"WHEN {sql_literal(k)} THEN '-{v}'" for k, v in CODE_PART_NUMBERS.items()),
+    )
+    year_suffix = "CASE WHEN year <> '' THEN '-' || year ELSE '' END"
+
+    return f"""
+        WITH source AS (
+            SELECT {source_columns}
+                   COALESCE(CAST(pravogovruNd AS VARCHAR), '') AS nd,
+                   COALESCE(CAST(doc_typeIPS AS VARCHAR), '') AS doc_type,
+                   COALESCE(CAST(headingIPS AS VARCHAR), '') AS heading,
+                   {_sql_strip("COALESCE(CAST(docNumberIPS AS VARCHAR), '')")} AS doc_number,
+                   {_sql_strip("COALESCE(CAST(docdateIPS AS VARCHAR), '')")} AS date_str,
+                   COALESCE(CAST(statusIPS AS VARCHAR), '') AS status_ips,
+                   COALESCE(CAST(issuedByIPS AS VARCHAR), '') AS issued_by
+            FROM {parquet}
             WHERE {FEDERAL_FILTER}
-        """
+        ), federal AS (
+            SELECT *,
+                   lower(heading) AS heading_lower,
+                   string_split(date_str, '.') AS date_parts,
+                   CASE WHEN len(string_split(date_str, '.')) = 3
+                        THEN string_split(date_str, '.')[3] ELSE '' END AS year,
+                   regexp_extract(doc_number, {sql_literal(f'(?i)^({digits}+)-?ФКЗ$')}, 1) AS fkz_number,
+                   regexp_extract(doc_number, {sql_literal(f'(?i)^({digits}+)-?ФЗ$')}, 1) AS fz_number,
+                   {code_base} AS code_slug,
+                   {code_part} AS code_part
+            FROM source
+            WHERE NOT (doc_type IN ('nan', 'None', '')
+                       AND NOT contains(doc_number, 'ФЗ')
+                       AND NOT contains(doc_number, 'ФКЗ')
+                       AND NOT starts_with(issued_by, 'Федеральный закон')
+                       AND NOT starts_with(issued_by, 'Федеральный конституционный закон'))
+        )
+        SELECT
+            CASE
+                WHEN contains(heading_lower, 'конституция российской федерации')
+                     AND doc_type IN ('Конституция', '') THEN 'constitution-rf'
+                WHEN fkz_number <> '' THEN 'fkz-' || fkz_number || {year_suffix}
+                WHEN fz_number <> '' THEN 'fz-' || fz_number || {year_suffix}
+                WHEN doc_type = 'Кодекс' THEN
+                    CASE WHEN code_slug IS NOT NULL THEN code_slug || code_part
+                         ELSE 'code-' || left(md5(heading), 6) END
+                WHEN doc_type = {sql_literal(CONST_AMENDMENT_TYPE)} THEN
+                    'const-amendment-' || CASE WHEN year <> '' THEN year ELSE left(md5(heading), 6) END
+                ELSE 'law-' || left(md5(doc_number || '_' || date_str || '_' || left(heading, 50)), 8)
+            END AS id,
+            nd,
+            heading AS title,
+            doc_number AS identifier,
+            CASE
+                WHEN contains(heading_lower, 'конституция российской федерации') THEN 'constitution'
+                WHEN doc_type = 'Кодекс' THEN 'code'
+                WHEN contains(doc_number, 'ФКЗ') OR doc_type = 'Федеральный конституционный закон'
+                    THEN 'federal_constitutional_law'
+                WHEN doc_type = {sql_literal(CONST_AMENDMENT_TYPE)} THEN 'constitutional_amendment'
+                ELSE 'federal_law'
+            END AS law_type,
+            CASE
+                WHEN contains(lower(status_ips), 'утратил силу') THEN 'repealed'
+                WHEN contains(lower(status_ips), 'с изменениями')
+                     OR contains(lower(status_ips), 'c изменениями') THEN 'amended'
+                ELSE 'in_force'
+            END AS status,
+            CASE WHEN len(date_parts) = 3
+                 THEN date_parts[3] || '-' || {_sql_zfill2("date_parts[2]")} || '-' || {_sql_zfill2("date_parts[1]")}
+                 ELSE '' END AS effective_date,
+            'metadata_only' AS classification,
+            CASE WHEN nd <> '' THEN 'http://pravo.gov.ru/proxy/ips/?docbody=&nd=' || nd ELSE '' END AS source_url{row_number}
+        FROM federal
+    """
 
-    rows = con.execute(query).fetchall()
 
-    census_entries = []
-    laws_written = 0
-    total_provisions = 0
+# ---------------------------------------------------------------------------
+# Law id assignment (collision policy)
+# ---------------------------------------------------------------------------
 
-    for row in rows:
-        if census_only:
-            nd, doc_type, heading, doc_number, date_str, status_ips, issued_by = row
-            text = ""
-        else:
-            nd, doc_type, heading, doc_number, date_str, status_ips, issued_by, text = row
-
-        nd = str(nd or "")
-        doc_type = str(doc_type or "")
-        heading = str(heading or "")
-        doc_number = str(doc_number or "").strip()
-        date_str = str(date_str or "").strip()
-        status_ips = str(status_ips or "")
-        issued_by = str(issued_by or "")
-        text = str(text or "")
-
-        # Skip NaN/None doc types that don't match by other criteria
-        if doc_type in ("nan", "None", "") and "ФЗ" not in doc_number and "ФКЗ" not in doc_number:
-            # Check if it matches by issuedByIPS
-            if not any(issued_by.startswith(p) for p in ["Федеральный закон", "Федеральный конституционный закон"]):
-                continue
+def _nd_order(nd: str) -> tuple:
+    # Numeric nd order; documents without an nd sort last
+    return (not nd, len(nd), nd)
 
-        law_id = make_law_id(doc_number, date_str, heading, doc_type)
-        law_type = map_law_type(doc_type, doc_number, issued_by, heading)
-        status = map_status(status_ips)
-        effective_date = parse_date(date_str)
-        source_url = f"http://pravo.gov.ru/proxy/ips/?docbody=&nd={nd}" if nd else ""
 
-        census_entries.append({
-            "id": law_id,
-            "nd": nd,
-            "title": heading,
-            "identifier": doc_number,
-            "law_type": law_type,
-            "status": status,
-            "effective_date": effective_date or "",
-            "classification": "ingestable" if text and len(text) > 50 else "metadata_only",
-            "source_url": source_url,
-        })
+def assign_law_ids(files: list[list[dict]]) -> tuple[list[list[tuple[str, Optional[str]]]], int]:
+    """Assign the final law id of every census row, before any seed is written.
 
-        if census_only:
-            continue
+    files holds each parquet file's census entries (as from census_query) in
+    file order. Documents (distinct nd) that share a generated id are ranked
+    by nd: the lowest keeps the id and the others get a -{nd[-6:]} suffix,
+    or -{nd} if that is taken too. A row repeating the nd of an earlier row
+    with the same id is a duplicate and gets no id of its own.
+
+    Returns: (per file, per row (generated_id, final_id or None), collisions)
+    """
+    owners: dict[tuple[str, str], tuple[int, int]] = {}
+    nds_by_id: dict[str, list[str]] = {}
+    for file_no, entries in enumerate(files):
+        for row_no, entry in enumerate(entries):
+            key = (entry["id"], entry["nd"])
+            if key not in owners:
+                owners[key] = (file_no, row_no)
+                nds_by_id.setdefault(entry["id"], []).append(entry["nd"])
+
+    final_ids: dict[tuple[str, str], str] = {}
+    taken = set(nds_by_id)
+    collisions = 0
+    for law_id in sorted(nds_by_id):
+        first, *others = sorted(nds_by_id[law_id], key=_nd_order)
+        final_ids[(law_id, first)] = law_id
+        for nd in others:
+            final_id = f"{law_id}-{nd[-6:]}"
+            if final_id in taken:
+                final_id = f"{law_id}-{nd}"
+            n = 2
+            while final_id in taken:
+                final_id = f"{law_id}-{nd}-{n}"
+                n += 1
+            taken.add(final_id)
+            final_ids[(law_id, nd)] = final_id
+            collisions += 1
+
+    assigned = []
+    for file_no, entries in enumerate(files):
+        assigned.append([
+            (entry["id"], final_ids[(entry["id"], entry["nd"])]
+             if owners[(entry["id"], entry["nd"])] == (file_no, row_no) else None)
+            for row_no, entry in enumerate(entries)
+        ])
+    return assigned, collisions
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation (--metrics-out, --profile)
+# ---------------------------------------------------------------------------
+
+METRICS_VERSION = 1
+
+# Where ingest_batch spends its time:
+#   scan        DuckDB reading parquet and producing Arrow batches (or the census query)
+#   convert     Arrow batches to Python row tuples
+#   census      mapping rows to census entries
+#   skip_check  text hashing and manifest / existing-seed checks
+#   parse       cleaning and splitting text into provisions
+#   fingerprint exact keys and MinHash signatures for --dedup-report
+#   serialize   provisions to seed JSON
+#   write       seed files, shard frames or database rows
+# parse, fingerprint and serialize run in the worker processes with
+# --workers, so they add up worker CPU time rather than wall time.
+STAGES = ("scan", "convert", "census", "skip_check", "parse", "fingerprint", "serialize", "write")
+COUNTERS = ("rows_scanned", "text_bytes", "provisions", "seeds_skipped", "seeds_written", "duplicates_skipped")
+
+# parse/fingerprint/serialize seconds of the current thread, collected from render calls
+_render_clock = threading.local()
+
+
+def _clock(stage: str, start: float) -> None:
+    seconds = getattr(_render_clock, "seconds", None)
+    if seconds is None:
+        seconds = _render_clock.seconds = {}
+    seconds[stage] = seconds.get(stage, 0.0) + time.perf_counter() - start
+
+
+def drain_render_clock() -> dict[str, float]:
+    """Return and reset the parse/fingerprint/serialize seconds recorded by this thread."""
+    seconds = getattr(_render_clock, "seconds", None) or {}
+    _render_clock.seconds = {}
+    return seconds
+
+
+class IngestMetrics:
+    """Stage timers and counters for one ingest_batch run; merge() combines runs."""
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+
+    def add_seconds(self, seconds: dict[str, float]) -> None:
+        for name, value in seconds.items():
+            self.seconds[name] += value
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def merge(self, other: "IngestMetrics") -> None:
+        self.add_seconds(other.seconds)
+        for name, value in other.counters.items():
+            self.counters[name] += value
+
+    def as_dict(self) -> dict:
+        return {
+            "seconds": {name: round(value, 4) for name, value in self.seconds.items()},
+            "counters": dict(self.counters),
+        }
 
-        # Skip if seed file exists with real content
-        seed_path = SEED_DIR / f"{law_id}.json"
-        if seed_path.exists():
-            try:
-                existing = json.loads(seed_path.read_text(encoding="utf-8"))
-                provs = existing.get("provisions", [])
-                if provs and len(provs) > 0:
-                    first = provs[0]
-                    if first.get("article") != "0" or len(first.get("content", "")) > 200:
-                        total_provisions += len(provs)
-                        laws_written += 1
-                        continue
-            except (json.JSONDecodeError, KeyError):
-                pass
 
-        # Parse text into provisions
+# ---------------------------------------------------------------------------
+# Seed rendering (clean + parse + serialize, optionally in worker processes)
+# ---------------------------------------------------------------------------
+
+# Bounds for --workers: documents are shipped to the pool in chunks of at
+# most RENDER_CHUNK_DOCS documents or RENDER_CHUNK_BYTES of text, and at most
+# RENDER_CHUNKS_PER_WORKER chunks per worker are in flight at any time.
+RENDER_CHUNK_DOCS = 32
+RENDER_CHUNK_BYTES = 4 * 1024 * 1024
+RENDER_CHUNKS_PER_WORKER = 2
+
+
+def render_document(
+    law: dict, text: str, split_parts: bool = False, fingerprint: bool = False, stemmed: bool = False,
+) -> tuple:
+    """Clean and parse one document into its provisions and <ref> links.
+
+    Depends only on its arguments, so it can run in a worker process.
+    Documents without usable text get a single placeholder provision.
+    split_parts splits articles into parts and items (split_provisions());
+    links stay attached to the article. Every provision carries the
+    normalized_sha256() of its content; with stemmed (for SqliteOutput)
+    also provision_stems() as content_stemmed. Seeds leave that out, as it
+    is about as large as the content and build-db.ts stems seeds itself.
+
+    Returns: (provisions, references from scan_references()), plus the
+    document_fingerprint() of the provisions with fingerprint
+    """
+    start = time.perf_counter()
+    heading = law["title"]
+    provisions = scan_provisions(text)
+    references = scan_references(text, provisions)
+    if split_parts:
+        provisions = split_provisions(provisions)
+
+    # Article contents add up to no more than the cleaned text, so only
+    # tiny or article-less documents need the cleaned text itself.
+    cleaned = None
+    if not provisions or sum(len(p["content"]) for p in provisions) <= 50:
         cleaned = clean_text(text)
-        if cleaned and len(cleaned) > 50:
-            provisions = parse_articles(cleaned)
-            if not provisions:
-                provisions = [{
-                    "article": "1",
-                    "title": heading,
-                    "content": cleaned,
-                    "provision_ref": "1",
-                    "order_index": 0,
-                }]
-        else:
+    if cleaned is None or (cleaned and len(cleaned) > 50):
+        if not provisions:
             provisions = [{
-                "article": "0",
+                "article": "1",
                 "title": heading,
-                "content": f"{heading}\n\nФедеральное законодательство Российской Федерации.\nИсточник: {source_url}",
-                "provision_ref": "0",
+                "content": cleaned,
+                "provision_ref": "1",
                 "order_index": 0,
             }]
+    else:
+        provisions = [{
+            "article": "0",
+            "title": heading,
+            "content": f"{heading}\n\nФедеральное законодательство Российской Федерации.\nИсточник: {law['source_url']}",
+            "provision_ref": "0",
+            "order_index": 0,
+        }]
+
+    for p in provisions:
+        p["normalized_sha256"] = normalized_sha256(p["content"])
+        if stemmed:
+            p["content_stemmed"] = provision_stems(p)
+    _clock("parse", start)
+    if fingerprint:
+        start = time.perf_counter()
+        fingerprints = document_fingerprint(provisions)
+        _clock("fingerprint", start)
+        return provisions, references, fingerprints
+    return provisions, references
+
+
+def seed_document(law: dict, provisions: list[dict], references: list[dict]) -> dict:
+    """The seed of one law; "references" is left out when it has none."""
+    seed_data = {"law": law, "provisions": provisions}
+    if references:
+        seed_data["references"] = references
+    return seed_data
+
+
+def render_seed(law: dict, text: str, split_parts: bool = False, fingerprint: bool = False) -> tuple:
+    """Clean, parse and serialize one document into seed JSON.
+
+    Returns: (seed_json, provision_count), plus the document_fingerprint()
+    with fingerprint
+    """
+    provisions, references, *fingerprints = render_document(law, text, split_parts, fingerprint)
+    start = time.perf_counter()
+    seed_json = json.dumps(seed_document(law, provisions, references), ensure_ascii=False, indent=2)
+    _clock("serialize", start)
+    return (seed_json, len(provisions), *fingerprints)
+
+
+def _render_chunk(
+    render: Callable[[dict, str], object], chunk: list[tuple[dict, str]]
+) -> tuple[list, dict[str, float]]:
+    drain_render_clock()
+    return [render(law, text) for law, text in chunk], drain_render_clock()
+
+
+def render_seeds(
+    docs: Iterable[tuple[object, dict, str]],
+    pool: Optional[Executor] = None,
+    max_in_flight: int = 1,
+    render: Callable[[dict, str], object] = render_seed,
+    metrics: Optional[IngestMetrics] = None,
+) -> Iterator[tuple[object, dict, object]]:
+    """Render (key, law, text) documents, yielding (key, law, render result) in input order.
+
+    render is render_seed, or render_document when no JSON is needed; with
+    a pool it must be a module-level function (or a partial of one) so it
+    can be pickled.
+    The key is opaque and handed back unchanged. Without a pool this is a
+    plain serial loop. With a pool, documents are grouped into chunks and at
+    most max_in_flight chunks are outstanding, so memory stays bounded while
+    results are still consumed in input order.
+
+    With metrics, parse/fingerprint/serialize seconds measured in the renderer (in
+    the workers when there is a pool) are added to it.
+    """
+    if pool is None:
+        for key, law, text in docs:
+            drain_render_clock()
+            result = render(law, text)
+            if metrics is not None:
+                metrics.add_seconds(drain_render_clock())
+            yield key, law, result
+        return
+
+    pending: deque = deque()
+    chunk: list[tuple[object, dict, str]] = []
+    chunk_bytes = 0
+
+    def submit():
+        nonlocal chunk, chunk_bytes
+        future = pool.submit(_render_chunk, render, [(law, text) for _, law, text in chunk])
+        pending.append(([(key, law) for key, law, _ in chunk], future))
+        chunk = []
+        chunk_bytes = 0
+
+    def drain(limit: int):
+        while len(pending) > limit:
+            keyed, future = pending.popleft()
+            results, seconds = future.result()
+            if metrics is not None:
+                metrics.add_seconds(seconds)
+            for (key, law), result in zip(keyed, results):
+                yield key, law, result
+
+    for key, law, text in docs:
+        chunk.append((key, law, text))
+        chunk_bytes += len(text)
+        if len(chunk) >= RENDER_CHUNK_DOCS or chunk_bytes >= RENDER_CHUNK_BYTES:
+            submit()
+            yield from drain(max_in_flight - 1)
+
+    if chunk:
+        submit()
+    yield from drain(0)
+
+
+def make_render_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """Create the --workers process pool (None for serial rendering).
+
+    Uses the spawn start method: forking after DuckDB has started its
+    scan threads is not safe.
+    """
+    if workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
 
-        seed_data = {
-            "law": {
-                "id": law_id,
-                "title": heading,
-                "identifier": doc_number,
-                "law_type": law_type,
-                "status": status,
-                "effective_date": effective_date or "",
-                "source_url": source_url,
-                "last_updated": time.strftime("%Y-%m-%d"),
+
+# ---------------------------------------------------------------------------
+# Duplicate detection (--dedup-report)
+# ---------------------------------------------------------------------------
+
+# Near duplicates are found with one-permutation MinHash over word
+# shingles: each shingle is hashed once into one of MINHASH_BINS bins, which
+# keep their smallest value. Signatures are split into LSH_BANDS bands;
+# provisions (or laws) sharing a band are candidates, flagged when their
+# estimated Jaccard similarity is at least NEAR_DUPLICATE_SIMILARITY.
+# Provisions with fewer than MIN_SHINGLES shingles are only matched exactly.
+SHINGLE_WORDS = 3
+MINHASH_BINS = 64
+LSH_BANDS = 16
+NEAR_DUPLICATE_SIMILARITY = 0.8
+MIN_SHINGLES = 8
+# Candidates compared per LSH bucket, and near-duplicate pairs listed per kind
+LSH_BUCKET_LIMIT = 64
+MAX_REPORTED_PAIRS = 1000
+DEDUP_REPORT_VERSION = 1
+EMPTY_BIN = 0xFFFFFFFF
+
+
+def exact_key(title: Optional[str], content: str) -> bytes:
+    """Key of the (title, content) pair that build-db.ts stores once."""
+    marked_title = "\x01" if title is None else "\x00" + title
+    return hashlib.sha1(f"{marked_title}\x00{content}".encode("utf-8")).digest()
+
+
+def shingle_bins(content: str) -> Optional[array]:
+    """Raw MinHash bins of content's word shingles (EMPTY_BIN where none fell); None if too short."""
+    words = FTS_TOKEN_PATTERN.findall(content.lower())
+    count = len(words) - SHINGLE_WORDS + 1
+    if count < MIN_SHINGLES:
+        return None
+    bins = array("I", [EMPTY_BIN]) * MINHASH_BINS
+    for i in range(count):
+        shingle = " ".join(words[i:i + SHINGLE_WORDS])
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        b = h % MINHASH_BINS
+        value = h >> 32
+        if value < bins[b]:
+            bins[b] = value
+    return bins
+
+
+def minhash_signature(bins: array) -> bytes:
+    """Fill the empty bins from the next filled one (rotation densification)."""
+    signature = array("I", bins)
+    for b in range(MINHASH_BINS):
+        if signature[b] == EMPTY_BIN:
+            for step in range(1, MINHASH_BINS):
+                value = bins[(b + step) % MINHASH_BINS]
+                if value != EMPTY_BIN:
+                    signature[b] = value
+                    break
+    return signature.tobytes()
+
+
+def signature_similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of the shingles behind two signatures."""
+    return sum(x == y for x, y in zip(array("I", a), array("I", b))) / MINHASH_BINS
+
+
+def document_fingerprint(provisions: list[dict]) -> dict:
+    """What DuplicateIndex needs of one law's provisions.
+
+    "provisions" holds (provision_ref, exact_key(), content bytes, MinHash
+    signature or None) per provision; "signature" is the MinHash of all of
+    the law's shingles (the bin-wise minimum over its provisions).
+    """
+    entries = []
+    law_bins = None
+    for p in provisions:
+        bins = shingle_bins(p["content"])
+        signature = None
+        if bins is not None:
+            signature = minhash_signature(bins)
+            law_bins = bins if law_bins is None else array("I", map(min, law_bins, bins))
+        entries.append((p.get("provision_ref") or p["article"], exact_key(p.get("title"), p["content"]),
+                        len(p["content"].encode("utf-8")), signature))
+    return {
+        "provisions": entries,
+        "signature": minhash_signature(law_bins) if law_bins is not None else None,
+    }
+
+
+class _LshIndex:
+    """Signatures of one kind (provisions or laws), bucketed by band."""
+
+    def __init__(self):
+        self.names: list[tuple[str, ...]] = []
+        self.signatures: list[bytes] = []
+        self.buckets: dict[bytes, list[int]] = {}
+
+    def add(self, name: tuple[str, ...], signature: bytes) -> None:
+        index = len(self.names)
+        self.names.append(name)
+        self.signatures.append(signature)
+        width = len(signature) // LSH_BANDS
+        for band in range(LSH_BANDS):
+            key = bytes([band]) + signature[band * width:(band + 1) * width]
+            members = self.buckets.setdefault(key, [])
+            if len(members) < LSH_BUCKET_LIMIT:
+                members.append(index)
+
+    def near_duplicates(self) -> list[tuple[float, tuple[str, ...], tuple[str, ...]]]:
+        """(similarity, name, name) for every pair at NEAR_DUPLICATE_SIMILARITY or above, most similar first."""
+        compared = set()
+        pairs = []
+        for members in self.buckets.values():
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    if (a, b) in compared:
+                        continue
+                    compared.add((a, b))
+                    similarity = signature_similarity(self.signatures[a], self.signatures[b])
+                    if similarity >= NEAR_DUPLICATE_SIMILARITY:
+                        pairs.append((similarity, self.names[a], self.names[b]))
+        pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+        return pairs
+
+
+class DuplicateIndex:
+    """Exact and near-duplicate provisions and laws of one run, for --dedup-report.
+
+    add() takes the document_fingerprint() of every law parsed. A provision
+    with the title and content of one added before is an exact duplicate,
+    which build-db.ts and --sqlite store once (empty content, duplicate_of,
+    no FTS row); its content bytes and FTS row are the savings. The other
+    provisions, and the laws, are compared by MinHash/LSH and near
+    duplicates are reported, not merged. Safe to share between
+    --concurrency threads.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.exact: set[bytes] = set()
+        self.provisions = _LshIndex()
+        self.laws = _LshIndex()
+        self.counts = {"laws": 0, "provisions": 0, "content_bytes": 0,
+                       "duplicate_provisions": 0, "duplicate_bytes": 0, "laws_with_duplicates": 0,
+                       "laws_fully_duplicated": 0}
+
+    def add(self, law_id: str, fingerprint: dict) -> None:
+        with self.lock:
+            counts = self.counts
+            duplicates = 0
+            for provision_ref, key, size, signature in fingerprint["provisions"]:
+                counts["provisions"] += 1
+                counts["content_bytes"] += size
+                if key in self.exact:
+                    duplicates += 1
+                    counts["duplicate_bytes"] += size
+                    continue
+                self.exact.add(key)
+                if signature is not None:
+                    self.provisions.add((law_id, provision_ref), signature)
+            counts["laws"] += 1
+            counts["duplicate_provisions"] += duplicates
+            if duplicates:
+                counts["laws_with_duplicates"] += 1
+                if duplicates == len(fingerprint["provisions"]):
+                    counts["laws_fully_duplicated"] += 1
+            if fingerprint["signature"] is not None:
+                self.laws.add((law_id,), fingerprint["signature"])
+
+    def report(self) -> dict:
+        """The --dedup-report JSON."""
+        with self.lock:
+            counts = dict(self.counts)
+            provision_pairs = self.provisions.near_duplicates()
+            law_pairs = self.laws.near_duplicates()
+
+        def listed(pairs, fields):
+            return [dict(zip(fields, (*a, *b)), similarity=round(similarity, 3))
+                    for similarity, a, b in pairs[:MAX_REPORTED_PAIRS]]
+
+        return {
+            "version": DEDUP_REPORT_VERSION,
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "laws": counts["laws"],
+            "provisions": counts["provisions"],
+            "content_bytes": counts["content_bytes"],
+            "exact_duplicates": {
+                "provisions": counts["duplicate_provisions"],
+                "content_bytes_saved": counts["duplicate_bytes"],
+                "fts_rows_saved": counts["duplicate_provisions"],
+                "laws_with_duplicates": counts["laws_with_duplicates"],
+                "laws_fully_duplicated": counts["laws_fully_duplicated"],
+            },
+            "near_duplicates": {
+                "similarity_threshold": NEAR_DUPLICATE_SIMILARITY,
+                "provision_pairs": len(provision_pairs),
+                "law_pairs": len(law_pairs),
+                "provisions": listed(provision_pairs, ("law_id", "provision_ref", "other_law_id", "other_provision_ref")),
+                "laws": listed(law_pairs, ("law_id", "other_law_id")),
             },
-            "provisions": provisions,
         }
 
-        seed_path.write_text(json.dumps(seed_data, ensure_ascii=False, indent=2), encoding="utf-8")
-        laws_written += 1
-        total_provisions += len(provisions)
+
+# ---------------------------------------------------------------------------
+# Incremental ingestion manifest
+# ---------------------------------------------------------------------------
+
+# Maps pravogovruNd -> {text_sha256, law_id, provisions, seed_sha256}, plus
+# split_parts for seeds written with --split-parts, and meta_sha256,
+# classification and meta_skips for documents seen by a --two-phase run (the
+# census classification depends on the text, which that run may not read;
+# meta_skips counts the runs in a row that skipped the document on its
+# metadata alone). The leading underscore keeps it out of build-db.ts and
+# the seed count.
+MANIFEST_NAME = "_manifest.json"
+MANIFEST_VERSION = 4
+
+
+def sha256_hex(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def metadata_fingerprint(entry: dict, row_group: str, offset: int) -> str:
+    """Fingerprint a census entry (with its final id) without reading its text.
+
+    row_group is the text_row_groups() fingerprint of the row group holding
+    the row and offset the row's position inside it, so any change to the
+    row group's text column, or the row moving, changes the fingerprint.
+    """
+    return sha256_hex(json.dumps(
+        [[entry[field] for field in CENSUS_FIELDS], row_group, offset], ensure_ascii=False))
+
+
+def manifest_entry(
+    text_sha256: str, law_id: str, provisions: int, seed: str,
+    two_phase: Optional[dict] = None, split_parts: bool = False,
+) -> dict:
+    """A manifest entry; two_phase holds the --two-phase meta_sha256, classification and meta_skips."""
+    entry = {
+        "text_sha256": text_sha256,
+        "law_id": law_id,
+        "provisions": provisions,
+        "seed_sha256": sha256_hex(seed),
+    }
+    if split_parts:
+        entry["split_parts"] = True
+    if two_phase:
+        entry.update(two_phase)
+    return entry
+
+
+def load_manifest(path: Path) -> dict[str, dict]:
+    """Load the nd -> entry manifest; a missing or unreadable file means a cold start."""
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        print(f"  WARNING: ignoring unreadable manifest {path}")
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("documents", {})
+
+
+def save_manifest(path: Path, documents: dict[str, dict]) -> None:
+    """Write the manifest atomically (temp file + rename)."""
+    payload = {
+        "version": MANIFEST_VERSION,
+        "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "documents": dict(sorted(documents.copy().items())),
+    }
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+# ---------------------------------------------------------------------------
+# Run checkpoints (--resume)
+# ---------------------------------------------------------------------------
+
+# One JSON file per parquet file under data/seed/_checkpoints/, holding the
+# file's census from the id pre-pass and, once its seeds are written, its
+# result (census slice, counts and metrics). A run that loses a file exits without writing census.json, and
+# --resume reruns only the files without a result; final ids are assigned
+# again from the checkpointed census slices. A run that completes removes
+# the directory. _previous_manifest.json keeps the manifest as the first
+# attempt found it, so the change set of a resumed run covers both attempts.
+CHECKPOINTS_DIR_NAME = "_checkpoints"
+CHECKPOINT_VERSION = 1
+PREVIOUS_MANIFEST_NAME = "_previous_manifest.json"
+
+
+def load_checkpoints(checkpoint_dir: Path, run: dict) -> dict[str, dict]:
+    """Load the checkpoints of an earlier run, by parquet file name.
+
+    Raises ValueError if one is unreadable or was written with different options.
+    """
+    checkpoints = {}
+    if not checkpoint_dir.is_dir():
+        return checkpoints
+    for path in sorted(checkpoint_dir.glob("*.json")):
+        if path.name.startswith("_"):
+            continue
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"unreadable checkpoint {path}: {e}") from e
+        if data.get("version") != CHECKPOINT_VERSION or data.get("run") != run:
+            raise ValueError(f"{path} was written by a run with different options")
+        checkpoints[data["file"]] = data
+    return checkpoints
+
+
+def save_checkpoint(
+    checkpoint_dir: Path, run: dict, file: str, census: list[dict], result: Optional[dict] = None
+) -> dict:
+    """Write one parquet file's checkpoint atomically (temp file + rename)."""
+    checkpoint = {
+        "version": CHECKPOINT_VERSION,
+        "run": run,
+        "file": file,
+        "census": census,
+        "result": result,
+    }
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    path = checkpoint_dir / (file.split(".")[0] + ".json")
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(checkpoint, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return checkpoint
+
+
+# ---------------------------------------------------------------------------
+# Sharded seed output (--seed-format shards)
+# ---------------------------------------------------------------------------
+
+# Instead of one indented JSON file per law, seeds can be written as a few
+# NDJSON shards under data/seed/_shards/. Every law is one line compressed
+# as its own zstd (or gzip) frame, so a shard decompresses as a whole to
+# plain NDJSON while index.json still gives each law's byte range:
+#   {"version": 1, "codec": "zstd", "shards": [...],
+#    "laws": {law_id: [shard_no, offset, length, nd]}}
+SHARDS_DIR_NAME = "_shards"
+SHARD_INDEX_NAME = "index.json"
+SHARD_INDEX_VERSION = 1
+SHARD_TARGET_BYTES = 64 * 1024 * 1024
+SHARD_SUFFIXES = {"zstd": ".ndjson.zst", "gzip": ".ndjson.gz"}
+ZSTD_LEVEL = 10
+
+
+def render_seed_line(law: dict, text: str, split_parts: bool = False, fingerprint: bool = False) -> tuple:
+    """Like render_seed(), but as one compact NDJSON line (with its newline)."""
+    provisions, references, *fingerprints = render_document(law, text, split_parts, fingerprint)
+    start = time.perf_counter()
+    seed_line = json.dumps(seed_document(law, provisions, references), ensure_ascii=False,
+                           separators=(",", ":")) + "\n"
+    _clock("serialize", start)
+    return (seed_line, len(provisions), *fingerprints)
+
+
+def compress_frame(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, mtime=0)
+
+
+def decompress_frame(frame: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(frame)
+    return gzip.decompress(frame)
+
+
+def load_shard_index(shards_dir: Path) -> Optional[dict]:
+    """Read a shard index, or None if there is none (or it is unreadable)."""
+    try:
+        index = json.loads((shards_dir / SHARD_INDEX_NAME).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if index.get("version") != SHARD_INDEX_VERSION or index.get("codec") not in SHARD_SUFFIXES:
+        return None
+    return index
+
+
+def read_shard_seeds(shards_dir: Path) -> Iterator[dict]:
+    """Yield the seed of every indexed law, in shard and offset order."""
+    index = load_shard_index(shards_dir)
+    if index is None:
+        return
+    for shard_no, shard_name in enumerate(index["shards"]):
+        frames = sorted((offset, length) for s, offset, length, _ in index["laws"].values() if s == shard_no)
+        with open(shards_dir / shard_name, "rb") as f:
+            for offset, length in frames:
+                f.seek(offset)
+                yield json.loads(decompress_frame(f.read(length), index["codec"]))
+
+
+class SeedShards:
+    """Write seeds into a new shard set, replacing the old one in finish().
+
+    Frames of documents the manifest reports unchanged are copied from the
+    previous shard set without being parsed. Safe to share between
+    --concurrency threads.
+    """
+
+    def __init__(self, seed_dir: Path, codec: str):
+        self.codec = codec
+        self.shards_dir = seed_dir / SHARDS_DIR_NAME
+        self.tmp_dir = seed_dir / (SHARDS_DIR_NAME + ".tmp")
+        if self.tmp_dir.exists():
+            shutil.rmtree(self.tmp_dir)
+        self.tmp_dir.mkdir(parents=True)
+
+        # The previous index, for copying; only usable with the same codec
+        self.previous = load_shard_index(self.shards_dir)
+        if self.previous is not None and self.previous["codec"] != codec:
+            self.previous = None
+
+        self.lock = threading.Lock()
+        self.shards: list[str] = []
+        self.current = None
+        self.laws: dict[str, list] = {}  # law_id -> [shard_no, offset, length, nd]
+
+    def _append(self, law_id: str, nd: str, frame: bytes) -> None:
+        if self.current is None or self.current.tell() >= SHARD_TARGET_BYTES:
+            if self.current is not None:
+                self.current.close()
+            self.shards.append(f"seeds-{len(self.shards):03d}{SHARD_SUFFIXES[self.codec]}")
+            self.current = open(self.tmp_dir / self.shards[-1], "wb")
+        self.laws[law_id] = [len(self.shards) - 1, self.current.tell(), len(frame), nd]
+        self.current.write(frame)
+
+    def add(self, law_id: str, nd: str, seed_line: str) -> None:
+        frame = compress_frame(seed_line.encode("utf-8"), self.codec)
+        with self.lock:
+            self._append(law_id, nd, frame)
+
+    def has_previous(self, law_id: str, nd: str) -> bool:
+        entry = self.previous["laws"].get(law_id) if self.previous is not None else None
+        return entry is not None and entry[3] == nd
+
+    def copy_previous(self, law_id: str, nd: str) -> bool:
+        """Copy law_id's frame from the previous shard set. Returns False if there is none for nd."""
+        if not self.has_previous(law_id, nd):
+            return False
+        entry = self.previous["laws"][law_id]
+        shard_no, offset, length, _ = entry
+        try:
+            with open(self.shards_dir / self.previous["shards"][shard_no], "rb") as f:
+                f.seek(offset)
+                frame = f.read(length)
+        except OSError:
+            return False
+        if len(frame) != length:
+            return False
+        with self.lock:
+            self._append(law_id, nd, frame)
+        return True
+
+    def finish(self, keep_previous: bool = False) -> int:
+        """Write the index and swap the new shards in.
+
+        With keep_previous, laws of the previous shard set that were not
+        written again are carried over, so a run that fails part-way
+        publishes its new seeds without losing any old ones.
+
+        Returns: number of laws in the index
+        """
+        if keep_previous and self.previous is not None:
+            for law_id, (_, _, _, nd) in self.previous["laws"].items():
+                if law_id not in self.laws:
+                    self.copy_previous(law_id, nd)
+        with self.lock:
+            if self.current is not None:
+                self.current.close()
+            index = {
+                "version": SHARD_INDEX_VERSION,
+                "codec": self.codec,
+                "shards": self.shards,
+                "laws": dict(sorted(self.laws.items())),
+            }
+            (self.tmp_dir / SHARD_INDEX_NAME).write_text(
+                json.dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+            old_dir = self.shards_dir.with_name(SHARDS_DIR_NAME + ".old")
+            if old_dir.exists():
+                shutil.rmtree(old_dir)
+            if self.shards_dir.exists():
+                os.replace(self.shards_dir, old_dir)
+            os.replace(self.tmp_dir, self.shards_dir)
+            if old_dir.exists():
+                shutil.rmtree(old_dir)
+            return len(self.laws)
+
+
+# ---------------------------------------------------------------------------
+# Change sets (build-db.ts --apply)
+# ---------------------------------------------------------------------------
+
+# Every seed run that adds, changes or removes a law writes the difference
+# as data/seed/_changes/NNNNNN.json, numbered in sequence. A law is listed
+# by id with its nd and seed_sha256, and an added or changed one with the
+# key (article, part, paragraph) and content_sha256 of every provision it
+# now has. build-db.ts --apply applies the change sets newer than the
+# database to it in place; a full build:db records the latest sequence.
+CHANGES_DIR_NAME = "_changes"
+CHANGE_SET_VERSION = 1
+
+
+def read_seed(seed_dir: Path, law_id: str, shard_index: Optional[dict] = None) -> dict:
+    """Load one law's seed, from its file or (with shard_index) from the shards."""
+    if shard_index is None:
+        return json.loads((seed_dir / f"{law_id}.json").read_text(encoding="utf-8"))
+    shard_no, offset, length, _ = shard_index["laws"][law_id]
+    with open(seed_dir / SHARDS_DIR_NAME / shard_index["shards"][shard_no], "rb") as f:
+        f.seek(offset)
+        return json.loads(decompress_frame(f.read(length), shard_index["codec"]))
+
+
+def diff_manifests(
+    previous: dict[str, dict], manifest: dict[str, dict], census: list[dict], complete: bool
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """Laws added, changed and removed between two manifests: ([{id, nd, seed_sha256}], ...).
+
+    Only documents in census count as present. Without complete (a --batch
+    run), documents outside the run are not known to be gone, so a law only
+    counts as removed when its document now has another id.
+    """
+    census_nds = {e["nd"] for e in census}
+    before = {e["law_id"]: (nd, e["seed_sha256"]) for nd, e in previous.items()}
+    after = {e["law_id"]: (nd, e["seed_sha256"]) for nd, e in manifest.items() if nd in census_nds}
+    added, changed, removed = [], [], []
+    for law_id, (nd, seed_sha256) in sorted(after.items()):
+        if law_id not in before:
+            added.append({"id": law_id, "nd": nd, "seed_sha256": seed_sha256})
+        elif before[law_id] != (nd, seed_sha256):
+            changed.append({"id": law_id, "nd": nd, "seed_sha256": seed_sha256})
+    for law_id, (nd, _) in sorted(before.items()):
+        if law_id not in after and (complete or nd in census_nds):
+            removed.append({"id": law_id, "nd": nd})
+    return added, changed, removed
+
+
+def latest_change_set_sequence(seed_dir: Path) -> int:
+    """Sequence of the newest change set in seed_dir, 0 if there is none."""
+    return max((int(p.stem) for p in (seed_dir / CHANGES_DIR_NAME).glob("[0-9]*.json")), default=0)
+
+
+def write_change_set(
+    seed_dir: Path, added: list[dict], changed: list[dict], removed: list[dict],
+    shard_index: Optional[dict] = None,
+) -> Optional[Path]:
+    """Write the next change set (None if nothing changed). Returns its path."""
+    if not (added or changed or removed):
+        return None
+    for law in added + changed:
+        seed = read_seed(seed_dir, law["id"], shard_index)
+        law["provisions"] = [
+            {"article": p["article"], "part": p.get("part"), "paragraph": p.get("paragraph"),
+             "content_sha256": sha256_hex(p["content"])}
+            for p in seed["provisions"]
+        ]
+    changes_dir = seed_dir / CHANGES_DIR_NAME
+    changes_dir.mkdir(parents=True, exist_ok=True)
+    sequence = latest_change_set_sequence(seed_dir) + 1
+    change_set = {
+        "version": CHANGE_SET_VERSION,
+        "sequence": sequence,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+    }
+    path = changes_dir / f"{sequence:06d}.json"
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(change_set, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def finish_manifest(
+    previous: dict[str, dict], manifest: dict[str, dict], census: list[dict], complete: bool,
+    manifest_path: Path, seed_shards: bool = False,
+) -> tuple[list[dict], list[dict], list[dict], Optional[Path]]:
+    """Write the change set from previous to manifest and drop the laws it removes.
+
+    With complete (the run saw every document), documents gone from census
+    leave the manifest, which is saved to manifest_path. Seed files of
+    removed laws are deleted; with seed_shards, SeedShards.finish() has
+    already left them out.
+
+    Returns: (added, changed, removed, change set path or None)
+    """
+    added, changed, removed = diff_manifests(previous, manifest, census, complete)
+    if complete:
+        census_nds = {e["nd"] for e in census}
+        for nd in [nd for nd in manifest if nd not in census_nds]:
+            del manifest[nd]
+        save_manifest(manifest_path, manifest)
+    if not seed_shards:
+        current_ids = {e["id"] for e in census}
+        for law in removed:
+            if law["id"] not in current_ids:
+                (SEED_DIR / f"{law['id']}.json").unlink(missing_ok=True)
+    change_set_path = write_change_set(
+        SEED_DIR, added, changed, removed,
+        load_shard_index(SEED_DIR / SHARDS_DIR_NAME) if seed_shards else None)
+    return added, changed, removed, change_set_path
+
+
+# ---------------------------------------------------------------------------
+# Census tables (census.parquet, census.sqlite)
+# ---------------------------------------------------------------------------
+
+# Next to census.json, the same entries as a Parquet file and as an indexed
+# SQLite table, so a lookup by id or nd (check-updates.ts, build-db.ts,
+# coverage reports) is a query instead of parsing the whole JSON document.
+# census.sqlite also holds the census.json stats and run metadata.
+CENSUS_SQLITE_SCHEMA = """
+    CREATE TABLE census (
+        id TEXT PRIMARY KEY,
+        nd TEXT NOT NULL,
+        title TEXT,
+        identifier TEXT,
+        law_type TEXT,
+        status TEXT,
+        effective_date TEXT,
+        classification TEXT,
+        source_url TEXT
+    );
+    CREATE INDEX idx_census_nd ON census(nd);
+    CREATE TABLE census_stats (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+    CREATE TABLE census_metadata (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# The census.json stats, in its key order
+CENSUS_STATS_SQL = """
+    SELECT key, value FROM (
+        SELECT 0 AS part, 'total' AS key, COUNT(*) AS value FROM census
+        UNION ALL SELECT 1, 'type_' || law_type, COUNT(*) FROM census GROUP BY law_type
+        UNION ALL SELECT 2, 'status_' || status, COUNT(*) FROM census GROUP BY status
+        UNION ALL SELECT 3, 'class_' || classification, COUNT(*) FROM census GROUP BY classification
+    ) ORDER BY part, key
+"""
+
+
+def load_census_table(con: sqlite3.Connection, census: list[dict], collisions: int) -> dict[str, int]:
+    """Create the census tables in con and fill census and census_stats.
+
+    The stats are computed in SQL over the census table, with id_collisions
+    appended. Returns: the census.json stats
+    """
+    con.executescript(CENSUS_SQLITE_SCHEMA)
+    con.executemany(f"INSERT INTO census VALUES ({', '.join('?' * len(CENSUS_FIELDS))})",
+                    [tuple(e[field] for field in CENSUS_FIELDS) for e in census])
+    con.execute(f"INSERT INTO census_stats (key, value) {CENSUS_STATS_SQL}")
+    con.execute("INSERT INTO census_stats VALUES ('id_collisions', ?)", (collisions,))
+    return dict(con.execute("SELECT key, value FROM census_stats ORDER BY rowid"))
+
+
+def write_census_tables(census: list[dict], parquet_path: Path, sqlite_path: Path,
+                        collisions: int, metadata: dict) -> dict[str, int]:
+    """Write the census entries to parquet_path and sqlite_path, in census order.
+
+    metadata goes to census_metadata. Both files are written under a
+    temporary name and moved into place.
+
+    Returns: the census.json stats
+    """
+    columns = {field: [e[field] for e in census] for field in CENSUS_FIELDS}
+    table = pyarrow.table(columns, schema=pyarrow.schema([(field, pyarrow.string()) for field in CENSUS_FIELDS]))
+    tmp_parquet = parquet_path.with_name(parquet_path.name + ".tmp")
+    con = duckdb.connect()
+    try:
+        con.register("census_entries", table)
+        con.execute(f"COPY census_entries TO {sql_literal(str(tmp_parquet))} (FORMAT parquet, COMPRESSION zstd)")
+    finally:
+        con.close()
+    os.replace(tmp_parquet, parquet_path)
+
+    tmp_sqlite = sqlite_path.with_name(sqlite_path.name + ".tmp")
+    tmp_sqlite.unlink(missing_ok=True)
+    con = sqlite3.connect(tmp_sqlite)
+    try:
+        stats = load_census_table(con, census, collisions)
+        con.executemany("INSERT INTO census_metadata VALUES (?, ?)",
+                        [(key, str(value)) for key, value in metadata.items()])
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp_sqlite, sqlite_path)
+    return stats
+
+
+def census_stats(census: list[dict], collisions: int) -> dict[str, int]:
+    """The census.json stats of census, computed like write_census_tables() does, in memory."""
+    con = sqlite3.connect(":memory:")
+    try:
+        return load_census_table(con, census, collisions)
+    finally:
+        con.close()
+
+
+def write_census(census: list[dict], collisions: int, ingestion: Optional[dict]) -> dict[str, int]:
+    """Write census.json, census.parquet and census.sqlite for a finished run.
+
+    ingestion (laws and provisions written) is left out of census-only runs.
+    Returns: the stats
+    """
+    census_output = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "source": "RusLawOD (irlspbru/RusLawOD) via pravo.gov.ru",
+        "description": "Full census of Russian Federation federal legislation",
+    }
+    stats = write_census_tables(census, CENSUS_PATH.with_suffix(".parquet"), CENSUS_PATH.with_suffix(".sqlite"),
+                                collisions, {**census_output, **(ingestion or {})})
+    census_output["stats"] = stats
+    census_output["laws"] = census
+    if ingestion is not None:
+        census_output["ingestion"] = ingestion
+    CENSUS_PATH.write_text(json.dumps(census_output, ensure_ascii=False, indent=2), encoding="utf-8")
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Sharded runs (--shard i/N, merge)
+# ---------------------------------------------------------------------------
+
+# --shard i/N parses and writes only the documents whose pravogovruNd hashes
+# to shard i, so N processes or machines share the work evenly however the
+# big codes are spread over the parquet files. Every shard still runs the
+# metadata-only id pre-pass over all files, so all of them assign the same
+# final ids. Instead of census.json and _manifest.json, a shard run writes
+# census.shard-i-of-N.json (its census slice, with each entry's position in
+# the full census) and _manifest.shard-i-of-N.json. Seed files are written
+# as usual; their ids never overlap between shards. `merge` checks that the
+# slices of all N shards cover the census exactly, then finishes the run
+# like a complete unsharded one: census files, manifest and change set.
+SHARD_SLICE_VERSION = 1
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """'i/N' -> (i, N), with 1 <= i <= N."""
+    index, sep, count = value.partition("/")
+    if not (sep and index.isdigit() and count.isdigit() and 1 <= int(index) <= int(count)):
+        raise ValueError(f"--shard must be i/N with 1 <= i <= N, not {value!r}")
+    return int(index), int(count)
+
+
+def nd_shard(nd: str, count: int) -> int:
+    """The shard (1..count) of a document: the first 60 bits of the MD5 of its nd, modulo count.
+
+    shard_filter() computes the same in DuckDB.
+    """
+    return int(hashlib.md5(nd.encode("utf-8")).hexdigest()[:15], 16) % count + 1
+
+
+def shard_filter(index: int, count: int) -> str:
+    """SQL condition on a RusLawOD row: its nd_shard() is index."""
+    return (f"('0x' || md5(COALESCE(CAST(pravogovruNd AS VARCHAR), ''))[:15])::BIGINT % {count} "
+            f"= {index - 1}")
+
+
+def shard_suffix(shard: tuple[int, int]) -> str:
+    return f".shard-{shard[0]}-of-{shard[1]}"
+
+
+def census_digest(census: list[dict]) -> str:
+    """SHA-256 over every (nd, id) of a census, in nd order; equal for equal sets of documents."""
+    return sha256_hex("\n".join(sorted(f"{e['nd']}\t{e['id']}" for e in census)))
+
+
+def write_census_slice(shard: tuple[int, int], census: list[dict], positions: list[int],
+                       full_census: list[dict], collisions: int, ingestion: Optional[dict]) -> Path:
+    """Write a shard's census slice next to CENSUS_PATH. Returns its path.
+
+    positions are the slice entries' indexes in full_census, the census of
+    all shards, whose size and digest let merge check the slices add up.
+    """
+    path = CENSUS_PATH.with_name(f"{CENSUS_PATH.stem}{shard_suffix(shard)}.json")
+    payload = {
+        "version": SHARD_SLICE_VERSION,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "shard": list(shard),
+        "census_total": len(full_census),
+        "census_sha256": census_digest(full_census),
+        "id_collisions": collisions,
+        "ingestion": ingestion,
+        "positions": positions,
+        "laws": census,
+    }
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def merge_shards(slice_paths: list[Path]) -> tuple[list[dict], dict[str, int], Optional[Path]]:
+    """Combine the census slices of a sharded run and finish it like main() does.
+
+    Checks that there is one slice for each of the N shards, all from the
+    same census, with each entry in its own shard and every census entry
+    present exactly once (and, for ingesting runs, its seed file too).
+    Then writes census.json, census.parquet and census.sqlite in the order
+    of an unsharded run, merges the shard manifests into _manifest.json
+    (writing the change set) and removes the slices and shard manifests.
+
+    Raises ValueError, naming what is missing or inconsistent.
+    Returns: (census, stats, change set path or None)
+    """
+    if not slice_paths:
+        raise ValueError(f"no census slices (census.shard-*-of-*.json) next to {CENSUS_PATH}")
+    slices = [json.loads(path.read_text(encoding="utf-8")) for path in slice_paths]
+    first = slices[0]
+    count = first["shard"][1]
+    for path, data in zip(slice_paths, slices):
+        if data.get("version") != SHARD_SLICE_VERSION:
+            raise ValueError(f"{path.name}: unsupported census slice version {data.get('version')}")
+        if (data["shard"][1], data["census_sha256"], data["census_total"], data["ingestion"] is None) != (
+                count, first["census_sha256"], first["census_total"], first["ingestion"] is None):
+            raise ValueError(f"{path.name} and {slice_paths[0].name} come from different runs "
+                             "(shard count, census or --census-only differ)")
+    indexes = sorted(data["shard"][0] for data in slices)
+    missing = sorted(set(range(1, count + 1)) - set(indexes))
+    if missing:
+        raise ValueError(f"missing shards of {count}: {', '.join(map(str, missing))}")
+    if len(indexes) != count:
+        raise ValueError("more than one census slice for the same shard")
+
+    by_position: dict[int, dict] = {}
+    for data in slices:
+        index = data["shard"][0]
+        for position, entry in zip(data["positions"], data["laws"]):
+            if nd_shard(entry["nd"], count) != index:
+                raise ValueError(f"{entry['id']} ({entry['nd']}) is in slice {index}/{count}, not its own shard")
+            by_position[position] = entry
+    census = [by_position[p] for p in sorted(by_position)]
+    if len(census) != first["census_total"] or census_digest(census) != first["census_sha256"]:
+        raise ValueError(f"the slices hold {len(census)} of {first['census_total']} census entries; "
+                         "rerun the shards that did not finish")
+
+    ingestion = None
+    change_set_path = None
+    if first["ingestion"] is not None:
+        missing_seeds = [e["id"] for e in census if not (SEED_DIR / f"{e['id']}.json").exists()]
+        if missing_seeds:
+            raise ValueError(f"{len(missing_seeds)} seed files are missing, e.g. {', '.join(missing_seeds[:5])}")
+        total_laws = sum(data["ingestion"]["total_laws"] for data in slices)
+        ingestion = {
+            "completed_at": max(data["ingestion"]["completed_at"] for data in slices),
+            "total_laws": total_laws,
+            "total_provisions": sum(data["ingestion"]["total_provisions"] for data in slices),
+            "coverage_pct": f"{(total_laws / max(len(census), 1)) * 100:.1f}",
+        }
+        manifest_path = SEED_DIR / MANIFEST_NAME
+        shard_manifests = [SEED_DIR / f"_manifest{shard_suffix((i, count))}.json" for i in indexes]
+        manifest = {}
+        for path in shard_manifests:
+            manifest.update(load_manifest(path))
+        _, _, _, change_set_path = finish_manifest(load_manifest(manifest_path), manifest, census, True,
+                                                   manifest_path)
+        for path in shard_manifests:
+            path.unlink(missing_ok=True)
+
+    stats = write_census(census, first["id_collisions"], ingestion)
+    for path in slice_paths:
+        path.unlink()
+    return census, stats, change_set_path
+
+
+def merge_main(argv: list[str]) -> None:
+    """`ingest-ruslawod.py merge [SLICE ...]`: combine the census slices of a --shard run."""
+    import argparse
+    parser = argparse.ArgumentParser(prog="ingest-ruslawod.py merge",
+                                     description="Combine the census slices of a --shard i/N run")
+    parser.add_argument("slices", nargs="*", metavar="SLICE",
+                        help=f"Census slices (default: every {CENSUS_PATH.stem}.shard-*-of-*.json "
+                             f"next to {CENSUS_PATH.name})")
+    args = parser.parse_args(argv)
+
+    slice_paths = ([Path(p) for p in args.slices] if args.slices
+                   else sorted(CENSUS_PATH.parent.glob(f"{CENSUS_PATH.stem}.shard-*-of-*.json")))
+    try:
+        census, stats, change_set_path = merge_shards(slice_paths)
+    except ValueError as e:
+        print(f"FAILED: {e}")
+        sys.exit(1)
+    print(f"Merged {len(slice_paths)} census slices: {len(census)} census entries")
+    for key, value in stats.items():
+        print(f"  {key}: {value}")
+    if change_set_path is not None:
+        print(f"  Change set: {change_set_path.relative_to(SEED_DIR)}")
+    print(f"\n  Census: {CENSUS_PATH}")
+
+
+# ---------------------------------------------------------------------------
+# Direct SQLite output (--sqlite)
+# ---------------------------------------------------------------------------
+
+# The schema build-db.ts creates; --sqlite writes the same database without seed files.
+SCHEMA_PATH = SCRIPT_DIR / "lib" / "schema.sql"
+# provisions_fts of a --compress database, indexed through provision_text().
+COMPRESSED_FTS_PATH = SCRIPT_DIR / "lib" / "compressed-fts.sql"
+
+# --compress stores provision text as raw deflate against a preset dictionary
+# trained on the corpus, as build-db.ts --compress does
+# (scripts/lib/provision-compression.ts): the lines and words repeated most
+# across provisions, best last, within the 32 KB deflate window.
+DICTIONARY_SIZE = 32 * 1024
+DICTIONARY_SAMPLE_BYTES = 16 * 1024 * 1024
+DICTIONARY_CANDIDATES = 20_000
+MIN_LINE_BYTES = 16
+MIN_WORD_LENGTH = 5
+COMPRESS_BATCH = 1000
+
+
+def train_dictionary(samples: Iterable[str]) -> bytes:
+    """The preset dictionary for a sample of provision contents."""
+    counts: dict[str, int] = {}
+    for text in samples:
+        for line in text.split("\n"):
+            line = line.strip()
+            if len(line.encode("utf-8")) >= MIN_LINE_BYTES:
+                counts[line] = counts.get(line, 0) + 1
+        for word in FTS_TOKEN_PATTERN.findall(text):
+            if len(word) >= MIN_WORD_LENGTH:
+                counts[word] = counts.get(word, 0) + 1
+
+    # A segment seen n times saves about (n - 1) copies of itself
+    candidates = sorted(
+        ((-(count - 1) * len(segment.encode("utf-8")), segment) for segment, count in counts.items() if count > 1)
+    )[:DICTIONARY_CANDIDATES]
+
+    chosen: list[str] = []
+    chosen_text = ""
+    size = 0
+    for _, segment in candidates:
+        length = len(segment.encode("utf-8"))
+        if size + length + 1 > DICTIONARY_SIZE or segment in chosen_text:
+            continue
+        chosen.append(segment)
+        chosen_text = f"{chosen_text}\n{segment}" if chosen_text else segment
+        size += length + 1
+    return "\n".join(reversed(chosen)).encode("utf-8")
+
+
+def compress_provision_text(text: str, dictionary: bytes) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS, 8, zlib.Z_DEFAULT_STRATEGY, dictionary)
+    return compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+
+def decompress_provision_text(data: bytes, dictionary: bytes) -> str:
+    return zlib.decompressobj(-zlib.MAX_WBITS, zdict=dictionary).decompress(data).decode("utf-8")
+
+
+def register_provision_text(con: sqlite3.Connection, dictionary: bytes) -> None:
+    """Register provision_text(blob), which the provisions_text view of a compressed database reads with.
+
+    Needed to rebuild or check its provisions_fts, and for snippet():
+    INSERT INTO provisions_fts(provisions_fts) VALUES('rebuild').
+    """
+    con.create_function(
+        "provision_text", 1,
+        lambda data: None if data is None else decompress_provision_text(data, dictionary),
+        deterministic=True,
+    )
+
+
+class SqliteOutput:
+    """Write laws and provisions straight into a build-db.ts database.
+
+    Provisions are bulk inserted with the provisions_fts triggers dropped;
+    finish() then builds the FTS index in one statement, restores the
+    triggers and writes db_metadata. As in build-db.ts, a provision with the
+    title and content of one already inserted is stored with empty content
+    and duplicate_of pointing at it, and gets no FTS row. <ref> links wait in a temporary table
+    until finish() resolves their targets to law ids through the census.
+    With compress, finish() stores the text as content_z and
+    content_stemmed_z instead, indexes it through the provisions_text view
+    and leaves the triggers out (build-db.ts --compress). The database is
+    built next to path and only moved into place by finish(). Safe to share
+    between --concurrency threads.
+    """
+
+    def __init__(self, path: Path, compress: bool = False):
+        self.path = path
+        self.compress = compress
+        self.tmp_path = path.with_name(path.name + ".tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+        self.lock = threading.Lock()
+        self.originals: dict[bytes, int] = {}  # exact_key() -> id of the provision holding the text
+        self.con = sqlite3.connect(self.tmp_path, isolation_level=None, check_same_thread=False)
+        self.con.execute("PRAGMA journal_mode = OFF")
+        self.con.execute("PRAGMA synchronous = OFF")
+        self.con.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+
+        triggers = self.con.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'provisions'"
+        ).fetchall()
+        self.trigger_sql = [sql for _, sql in triggers]
+        for name, _ in triggers:
+            self.con.execute(f"DROP TRIGGER {name}")
+        self.con.execute(
+            "CREATE TEMP TABLE pending_references (source_law_id TEXT, source_provision_ref TEXT, nd TEXT)")
+        self.con.execute("BEGIN")
+
+    def add_law(self, law: dict, provisions: list[dict], references: Iterable[dict] = ()) -> None:
+        """Insert one law, its provisions and its unresolved <ref> links."""
+        with self.lock:
+            self.con.execute(
+                """INSERT INTO laws (id, title, identifier, law_type, status, effective_date,
+                                     source_url, last_updated, provision_count)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (law["id"], law["title"], law["identifier"], law["law_type"], law["status"],
+                 law["effective_date"], law["source_url"], law["last_updated"], len(provisions)),
+            )
+            for i, p in enumerate(provisions):
+                key = exact_key(p.get("title"), p["content"])
+                original = self.originals.get(key)
+                cursor = self.con.execute(
+                    """INSERT OR IGNORE INTO provisions (law_id, article, title, content, part, paragraph,
+                                                         provision_ref, order_index, metadata, normalized_sha256,
+                                                         content_stemmed, duplicate_of)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (law["id"], p["article"], p.get("title"), p["content"] if original is None else "",
+                     p.get("part"), p.get("paragraph"), p.get("provision_ref"), p.get("order_index", i),
+                     json.dumps(p["metadata"], ensure_ascii=False, separators=(",", ":")) if p.get("metadata") else None,
+                     p.get("normalized_sha256") or normalized_sha256(p["content"]),
+                     (p.get("content_stemmed") or provision_stems(p)) if original is None else None, original),
+                )
+                if original is None and cursor.rowcount:
+                    self.originals[key] = cursor.lastrowid
+            self.con.executemany(
+                "INSERT INTO pending_references VALUES (?, ?, ?)",
+                [(law["id"], r["provision_ref"], nd) for r in references for nd in r["targets"]],
+            )
+
+    def finish(self, census: Iterable[dict] = (), changeset_sequence: int = 0) -> tuple[int, int]:
+        """Index the provisions, write db_metadata and move the database into place.
+
+        census (entries with final ids) resolves the <ref> targets; links to
+        documents outside it go to unresolved_references, as in build-db.ts.
+        changeset_sequence is recorded as the latest change set the database
+        includes, so that build-db.ts --apply takes it from there.
+
+        Returns: (law_count, provision_count)
+        """
+        with self.lock:
+            con = self.con
+            con.execute("CREATE TEMP TABLE census_ids (nd TEXT PRIMARY KEY, id TEXT)")
+            con.executemany("INSERT OR IGNORE INTO census_ids VALUES (?, ?)",
+                            [(e["nd"], e["id"]) for e in census if e["nd"]])
+            con.execute(
+                """INSERT INTO cross_references (source_law_id, source_provision_ref, target_law_id)
+                   SELECT r.source_law_id, r.source_provision_ref, c.id
+                   FROM pending_references r JOIN census_ids c ON c.nd = r.nd
+                   ORDER BY r.rowid"""
+            )
+            con.execute(
+                """INSERT INTO unresolved_references (source_law_id, source_provision_ref, nd)
+                   SELECT source_law_id, source_provision_ref, nd FROM pending_references
+                   WHERE nd NOT IN (SELECT nd FROM census_ids)
+                   ORDER BY rowid"""
+            )
+            if self.compress:
+                self.compress_provisions()
+            else:
+                con.execute(
+                    """INSERT INTO provisions_fts(rowid, content, title, article, content_stemmed)
+                       SELECT id, content, title, article, content_stemmed FROM provisions
+                       WHERE duplicate_of IS NULL ORDER BY id"""
+                )
+                for sql in self.trigger_sql:
+                    con.execute(sql)
+
+            law_count = con.execute("SELECT COUNT(*) FROM laws").fetchone()[0]
+            provision_count = con.execute("SELECT COUNT(*) FROM provisions").fetchone()[0]
+            built_at = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+            con.executemany("INSERT INTO db_metadata (key, value) VALUES (?, ?)", [
+                ("tier", "free"),
+                ("schema_version", "1"),
+                ("built_at", built_at),
+                ("builder", "ingest-ruslawod.py"),
+                ("law_count", str(law_count)),
+                ("provision_count", str(provision_count)),
+                ("changeset_sequence", str(changeset_sequence)),
+            ])
+            con.execute("COMMIT")
+
+            con.execute("PRAGMA journal_mode = DELETE")
+            if self.compress:
+                con.execute("VACUUM")
+            con.execute("ANALYZE")
+            con.close()
+            os.replace(self.tmp_path, self.path)
+            return law_count, provision_count
+
+    def compress_provisions(self) -> None:
+        """Deflate the text of every provision holding one into content_z and content_stemmed_z.
+
+        The dictionary is trained on an even sample of about
+        DICTIONARY_SAMPLE_BYTES; content and content_stemmed are emptied.
+        provisions_fts is then indexed through the provisions_text view
+        (lib/compressed-fts.sql), with provision_text() registered here.
+        unresolved_references is dropped, as build-db.ts --apply does not
+        take a compressed database.
+        """
+        con = self.con
+        total = con.execute(
+            "SELECT COALESCE(SUM(length(CAST(content AS BLOB))), 0) FROM provisions WHERE duplicate_of IS NULL"
+        ).fetchone()[0]
+        stride = max(1, -(-total // DICTIONARY_SAMPLE_BYTES))
+        dictionary = train_dictionary(
+            content for i, (content,) in enumerate(
+                con.execute("SELECT content FROM provisions WHERE duplicate_of IS NULL ORDER BY id"))
+            if i % stride == 0
+        )
+        con.execute("DROP TABLE unresolved_references")
+        con.execute("INSERT INTO content_dictionary (id, dictionary) VALUES (1, ?)", (dictionary,))
+        last_id = 0
+        while True:
+            rows = con.execute(
+                """SELECT id, content, content_stemmed FROM provisions
+                   WHERE duplicate_of IS NULL AND id > ? ORDER BY id LIMIT ?""",
+                (last_id, COMPRESS_BATCH),
+            ).fetchall()
+            if not rows:
+                break
+            con.executemany(
+                """UPDATE provisions SET content = '', content_stemmed = NULL, content_z = ?, content_stemmed_z = ?
+                   WHERE id = ?""",
+                [(compress_provision_text(content, dictionary),
+                  None if stems is None else compress_provision_text(stems, dictionary), provision_id)
+                 for provision_id, content, stems in rows],
+            )
+            last_id = rows[-1][0]
+        register_provision_text(con, dictionary)
+        # executescript() would commit the open transaction
+        for statement in COMPRESSED_FTS_PATH.read_text(encoding="utf-8").split(";"):
+            if statement.strip():
+                con.execute(statement)
+
+    def discard(self) -> None:
+        """Drop the unfinished database, leaving any existing one at path untouched."""
+        with self.lock:
+            self.con.close()
+            self.tmp_path.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Main ingestion using DuckDB
+# ---------------------------------------------------------------------------
+
+# Rows per Arrow record batch when streaming query results (--fetch-batch-size).
+FETCH_BATCH_SIZE = 256
+
+# Record batches a file's scan thread reads ahead of parsing (--prefetch).
+# The scan starts before the file gets its --concurrency slot, so the next
+# file is already being read while the current one is parsed.
+PREFETCH_BATCHES = 4
+
+# Seeds (or SQLite inserts) queued for the writer thread of one file.
+WRITE_QUEUE_SIZE = 64
+
+
+class Prefetcher:
+    """Read an iterator ahead on a background thread, through a bounded queue.
+
+    Reading starts on creation. Iterating yields the items in order and
+    re-raises an error of the source where it occurred. close() (or leaving
+    the with block) stops the thread, also when the consumer gave up early.
+    """
+
+    _END = object()
+
+    def __init__(self, source: Iterator, depth: int):
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, depth))
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._read, args=(source,), daemon=True)
+        self.thread.start()
+
+    def _put(self, item: tuple) -> bool:
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read(self, source: Iterator) -> None:
+        try:
+            for item in source:
+                if not self._put((item, None)):
+                    return
+            self._put((self._END, None))
+        except BaseException as e:
+            self._put((self._END, e))
+        finally:
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+
+    def __iter__(self) -> Iterator:
+        while True:
+            item, error = self.queue.get()
+            if item is self._END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+
+    def close(self) -> None:
+        self.stopped.set()
+        self.thread.join()
+
+    def __enter__(self) -> "Prefetcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_seed_file(path: Path, seed_json: str) -> None:
+    """Write a seed atomically (temp file + rename), so a crash never leaves half a seed."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(seed_json, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+class SeedWriter:
+    """Run the writes of one file in order on a background thread.
+
+    submit() queues a call (blocking while WRITE_QUEUE_SIZE are waiting), so
+    rendering the next documents overlaps with disk, compression and SQLite
+    work. After a failed call the rest are dropped; submit() and close()
+    re-raise its error. close() (or leaving the with block) waits for every
+    queued call.
+    """
+
+    _END = object()
+
+    def __init__(self, metrics: Optional[IngestMetrics] = None):
+        self.metrics = metrics if metrics is not None else IngestMetrics()
+        self.queue: queue.Queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self.error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._write, daemon=True)
+        self.thread.start()
+
+    def _write(self) -> None:
+        while True:
+            call = self.queue.get()
+            if call is self._END:
+                return
+            if self.error is not None:
+                continue
+            fn, args = call
+            try:
+                with self.metrics.stage("write"):
+                    fn(*args)
+            except BaseException as e:
+                self.error = e
+
+    def submit(self, fn: Callable, *args) -> None:
+        if self.error is not None:
+            raise self.error
+        self.queue.put((fn, args))
+
+    def close(self) -> None:
+        if self.thread.is_alive():
+            self.queue.put(self._END)
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self) -> "SeedWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Already failing: wait for the queued writes, but keep the original error
+            try:
+                self.close()
+            except BaseException:
+                pass
+
+
+def connect_duckdb(remote: bool = True) -> duckdb.DuckDBPyConnection:
+    con = duckdb.connect()
+    if remote:
+        con.execute("SET http_timeout=120000")
+    return con
+
+
+def stream_rows(
+    con: duckdb.DuckDBPyConnection,
+    query: str,
+    batch_size: int = FETCH_BATCH_SIZE,
+    metrics: Optional[IngestMetrics] = None,
+    params: Optional[list] = None,
+) -> Iterator[tuple]:
+    """Run a query and yield row tuples, one Arrow record batch at a time.
+
+    Unlike fetchall(), only the current batch is converted to Python objects,
+    so memory no longer grows with the number of matching rows.
+    With metrics, batch reads count as scan and conversion as convert.
+    """
+    for rows in stream_row_batches(con, query, batch_size, metrics, params):
+        yield from rows
+
+
+def stream_row_batches(
+    con: duckdb.DuckDBPyConnection,
+    query: str,
+    batch_size: int = FETCH_BATCH_SIZE,
+    metrics: Optional[IngestMetrics] = None,
+    params: Optional[list] = None,
+) -> Iterator[list[tuple]]:
+    """Like stream_rows(), but yield each record batch as a list of row tuples."""
+    metrics = metrics if metrics is not None else IngestMetrics()
+    with metrics.stage("scan"):
+        relation = con.sql(query, params=params)
+        if hasattr(relation, "to_arrow_reader"):
+            reader = relation.to_arrow_reader(batch_size)
+        else:  # duckdb < 1.4
+            reader = relation.fetch_arrow_reader(batch_size)
+    while True:
+        with metrics.stage("scan"):
+            batch = next(reader, None)
+        if batch is None:
+            return
+        with metrics.stage("convert"):
+            rows = list(zip(*(column.to_pylist() for column in batch.columns)))
+        metrics.count("rows_scanned", len(rows))
+        yield rows
+
+
+def text_row_groups(con: duckdb.DuckDBPyConnection, parquet_url: str) -> list[tuple[int, str]]:
+    """(first row, fingerprint) of every row group of a parquet file.
+
+    Fingerprints hash the row count and the textIPS column chunk sizes and
+    statistics from the parquet footer, so they are read without any text.
+    """
+    source = parquet_url.replace("'", "''")
+    rows = con.execute(f"""
+        SELECT row_group_num_rows, total_compressed_size, total_uncompressed_size, stats_min, stats_max
+        FROM parquet_metadata('{source}')
+        WHERE path_in_schema = 'textIPS'
+        ORDER BY row_group_id
+    """).fetchall()
+    groups = []
+    start = 0
+    for row in rows:
+        groups.append((start, sha256_hex(json.dumps(row, ensure_ascii=False, default=str))))
+        start += row[0]
+    return groups
+
+
+def ingest_batch(
+    con: duckdb.DuckDBPyConnection,
+    parquet_url: str,
+    census_only: bool,
+    pool: Optional[Executor] = None,
+    max_in_flight: int = 1,
+    fetch_batch_size: int = FETCH_BATCH_SIZE,
+    manifest: Optional[dict[str, dict]] = None,
+    db: Optional[SqliteOutput] = None,
+    shards: Optional[SeedShards] = None,
+    law_ids: Optional[list[tuple[str, Optional[str]]]] = None,
+    metrics: Optional[IngestMetrics] = None,
+    row_numbers: bool = False,
+    prepass: Optional[list[dict]] = None,
+    split_parts: bool = False,
+    prefetch: int = 0,
+    slot: Optional[threading.Semaphore] = None,
+    shard: Optional[tuple[int, int]] = None,
+    duplicates: Optional[DuplicateIndex] = None,
+    full_every: int = 0,
+) -> tuple[list[dict], int, int]:
+    """Extract federal legislation from a single parquet file (URL or local path).
+
+    Rows are streamed in Arrow record batches of fetch_batch_size rows.
+    law_ids, from assign_law_ids(), gives each census row its final id;
+    rows it marks as duplicates are left out of the census and not written.
+    With a pool, per-document rendering runs in worker processes; seeds are
+    still written in row order, so output matches a serial run. Writes go
+    through a SeedWriter thread, which has finished when this returns.
+
+    With prefetch, a Prefetcher thread scans up to that many record batches
+    ahead of parsing. slot, if given, is held while documents are parsed and
+    written; the scan starts before it is acquired, so a file waiting for a
+    slot already reads its first batches.
+
+    With a manifest, a document whose nd, text hash and law id match its
+    entry (and whose seed still exists) is skipped without being parsed.
+    Entries are added or refreshed in place for every seed written.
+
+    With shards, seeds go into the shard set as NDJSON lines instead of
+    per-law files, and unchanged documents are copied from the previous set.
+
+    With a db, every document is parsed and inserted there instead of being
+    written as a seed file; seeds and the manifest are left alone.
+
+    split_parts splits articles into parts and items; a seed written in the
+    other mode never counts as unchanged.
+
+    In census_only mode nothing is parsed or written and the census comes
+    straight from census_query(); row_numbers adds each row's position in
+    the file as row_number.
+
+    prepass, that row_numbers census (aligned with law_ids), turns on the
+    two-phase scan: documents whose metadata_fingerprint() matches their
+    manifest entry are skipped without reading their text, and textIPS is
+    fetched by row position for the rest only. The fingerprint only sees the
+    row group's size and statistics, so with full_every a document skipped
+    that way in full_every - 1 runs in a row has its text read again: an
+    edit that keeps both is picked up within full_every runs.
+
+    shard, (i, N) from --shard, restricts the text scan to the rows of that
+    shard; law_ids (and prepass) must be restricted to them already.
+
+    With metrics, stage timings and row/seed counters are added to it.
+
+    With duplicates, the document_fingerprint() of every document parsed
+    is added to it; documents skipped as unchanged are not.
+
+    Returns: (census_entries, laws_written, total_provisions)
+    """
+    metrics = metrics if metrics is not None else IngestMetrics()
+
+    # The census alone is derived entirely in SQL
+    if census_only:
+        with metrics.stage("scan"):
+            rows = con.execute(census_query(parquet_url, row_numbers)).fetchall()
+        metrics.count("rows_scanned", len(rows))
+        fields = CENSUS_FIELDS + ("row_number",) if row_numbers else CENSUS_FIELDS
+        return [dict(zip(fields, row)) for row in rows], 0, 0
+
+    # Query only federal legislation with all needed columns
+    source = parquet_url.replace("'", "''")
+    columns = """pravogovruNd, doc_typeIPS, headingIPS, docNumberIPS,
+               docdateIPS, statusIPS, issuedByIPS, textIPS"""
+    in_shard = f"AND {shard_filter(*shard)}" if shard is not None else ""
+    query = f"""
+        SELECT {columns}
+        FROM read_parquet('{source}')
+        WHERE ({FEDERAL_FILTER}) {in_shard}
+    """
+
+    census_entries = []
+    laws_written = 0
+    total_provisions = 0
+    last_updated = time.strftime("%Y-%m-%d")
+
+    # Two-phase scan: decide from the metadata census which rows need their text
+    positions: list[int] = []
+    needed: Optional[list[tuple[dict, str]]] = None  # (census entry, meta_sha256) per fetched row
+    if prepass is not None:
+        if law_ids is None or len(law_ids) != len(prepass):
+            raise ValueError("prepass needs law_ids for each of its rows")
+        with metrics.stage("scan"):
+            row_groups = text_row_groups(con, parquet_url)
+        group_starts = [start for start, _ in row_groups]
+        needed_ids = []
+        needed = []
+        with metrics.stage("skip_check"):
+            for entry, (generated_id, final_id) in zip(prepass, law_ids):
+                if final_id is None:
+                    metrics.count("duplicates_skipped")
+                    continue
+                census = {field: entry[field] for field in CENSUS_FIELDS}
+                census["id"] = final_id
+                census_entries.append(census)
+
+                row_number = entry["row_number"]
+                group = bisect.bisect_right(group_starts, row_number) - 1
+                meta_sha256 = metadata_fingerprint(census, row_groups[group][1], row_number - group_starts[group])
+                nd = census["nd"]
+                previous = manifest.get(nd) if manifest is not None and nd else None
+                if (db is None and previous is not None and previous.get("meta_sha256") == meta_sha256
+                        and previous["law_id"] == final_id
+                        and not (full_every and previous.get("meta_skips", 0) + 1 >= full_every)
+                        and previous.get("split_parts", False) == split_parts
+                        and (shards.copy_previous(final_id, nd) if shards is not None
+                             else (SEED_DIR / f"{final_id}.json").exists())):
+                    census["classification"] = previous["classification"]
+                    previous["meta_skips"] = previous.get("meta_skips", 0) + 1
+                    total_provisions += previous["provisions"]
+                    laws_written += 1
+                    metrics.count("seeds_skipped")
+                    continue
+                positions.append(row_number)
+                needed_ids.append((generated_id, final_id))
+                needed.append((census, meta_sha256))
+        law_ids = needed_ids
+
+    def source_batches() -> Iterator[list[tuple]]:
+        if needed is None:
+            yield from stream_row_batches(con, query, fetch_batch_size, metrics)
+            return
+        # A large IN list becomes a join, which does not keep file order, so
+        # fetch the text in ordered chunks of at most fetch_batch_size rows.
+        chunk_query = f"""
+            SELECT {columns}
+            FROM read_parquet('{source}', file_row_number = true)
+            WHERE file_row_number IN (SELECT unnest(?::BIGINT[]))
+            ORDER BY file_row_number
+        """
+        for i in range(0, len(positions), fetch_batch_size):
+            yield from stream_row_batches(con, chunk_query, fetch_batch_size, metrics,
+                                          params=[positions[i:i + fetch_batch_size]])
+
+    def source_rows(batches: Iterable[list[tuple]]) -> Iterator[tuple]:
+        for rows in batches:
+            yield from rows
+
+    def pending_documents(batches: Iterable[list[tuple]]) -> Iterator[tuple[tuple[str, str, Optional[str]], dict, str]]:
+        """Record census entries and yield ((nd, text_sha256, two_phase), law, text) for seeds that need rendering."""
+        nonlocal laws_written, total_provisions
+
+        row_no = -1
+        for row in source_rows(batches):
+            with metrics.stage("census"):
+                census = census_entry(*row)
+            if census is None:
+                continue
+
+            if law_ids is not None:
+                row_no += 1
+                generated_id, final_id = law_ids[row_no] if row_no < len(law_ids) else (None, None)
+                if generated_id != census["id"]:
+                    raise RuntimeError(
+                        f"{parquet_url}: row {row_no} ({census['nd']}) does not match the id pre-pass "
+                        f"({census['id']} != {generated_id}); was the file modified during the run?")
+                if final_id is None:
+                    metrics.count("duplicates_skipped")
+                    continue
+                census["id"] = final_id
+            two_phase = None
+            if needed is None:
+                census_entries.append(census)
+            else:
+                # The pre-pass entry is already in the census; only the text decides its classification
+                prepass_census, meta_sha256 = needed[row_no]
+                prepass_census["classification"] = census["classification"]
+                two_phase = {"meta_sha256": meta_sha256, "classification": census["classification"], "meta_skips": 0}
+
+            nd = census["nd"]
+            law_id = census["id"]
+            text = str(row[-1] or "")
+            metrics.count("text_bytes", len(text.encode("utf-8")))
+
+            text_sha256 = ""
+            if db is None:
+                with metrics.stage("skip_check"):
+                    seed_path = SEED_DIR / f"{law_id}.json"
+                    text_sha256 = sha256_hex(text)
+
+                    # Skip if the manifest says this exact text was already ingested
+                    entry = manifest.get(nd) if manifest is not None and nd else None
+                    if entry is not None:
+                        if entry["text_sha256"] == text_sha256 and entry["law_id"] == law_id and (
+                                entry.get("split_parts", False) == split_parts) and (
+                                shards.copy_previous(law_id, nd) if shards is not None else seed_path.exists()):
+                            total_provisions += entry["provisions"]
+                            laws_written += 1
+                            metrics.count("seeds_skipped")
+                            if two_phase:
+                                entry.update(two_phase)
+                            continue
+
+                    # No manifest entry: skip if seed file exists with real content
+                    # (whole articles only, as its mode is unknown, and only if it
+                    # has the document's <ref> links or there are none)
+                    elif shards is None and not split_parts and seed_path.exists():
+                        try:
+                            seed_raw = seed_path.read_text(encoding="utf-8")
+                            existing = json.loads(seed_raw)
+                            provs = existing.get("provisions", [])
+                            if provs and "normalized_sha256" in provs[0] and (
+                                    "references" in existing or not REF_TARGET_PATTERN.search(text)):
+                                first = provs[0]
+                                if first.get("article") != "0" or len(first.get("content", "")) > 200:
+                                    total_provisions += len(provs)
+                                    laws_written += 1
+                                    if manifest is not None and nd:
+                                        manifest[nd] = manifest_entry(
+                                            text_sha256, law_id, len(provs), seed_raw, two_phase)
+                                    metrics.count("seeds_skipped")
+                                    continue
+                        except (json.JSONDecodeError, KeyError):
+                            pass
+
+            law = {
+                "id": law_id,
+                "title": census["title"],
+                "identifier": census["identifier"],
+                "law_type": census["law_type"],
+                "status": census["status"],
+                "effective_date": census["effective_date"],
+                "source_url": census["source_url"],
+                "last_updated": last_updated,
+            }
+            yield (nd, text_sha256, two_phase), law, text
+
+        if law_ids is not None and row_no + 1 != len(law_ids):
+            raise RuntimeError(
+                f"{parquet_url}: {row_no + 1} federal rows, but the id pre-pass saw {len(law_ids)}; "
+                "was the file modified during the run?")
+
+    def store_seed(law_id: str, nd: str, seed_json: str, entry: dict) -> None:
+        """Write one seed, then record it in the manifest (on the writer thread)."""
+        if shards is not None:
+            shards.add(law_id, nd, seed_json)
+        else:
+            write_seed_file(SEED_DIR / f"{law_id}.json", seed_json)
+        if manifest is not None and nd:
+            manifest[nd] = entry
+
+    batches = Prefetcher(source_batches(), prefetch) if prefetch > 0 else None
+    try:
+        with slot if slot is not None else nullcontext(), SeedWriter(metrics) as writer:
+            documents = pending_documents(batches if batches is not None else source_batches())
+            options = {}
+            if split_parts:
+                options["split_parts"] = True
+            if duplicates is not None:
+                options["fingerprint"] = True
+            if db is not None:
+                render = partial(render_document, stemmed=True, **options)
+                for _, law, (provisions, references, *fingerprint) in render_seeds(
+                        documents, pool, max_in_flight, render, metrics):
+                    if fingerprint:
+                        duplicates.add(law["id"], fingerprint[0])
+                    writer.submit(db.add_law, law, provisions, references)
+                    laws_written += 1
+                    total_provisions += len(provisions)
+                    metrics.count("seeds_written")
+                    metrics.count("provisions", len(provisions))
+                return census_entries, laws_written, total_provisions
+
+            render = render_seed if shards is None else render_seed_line
+            if options:
+                render = partial(render, **options)
+            for (nd, text_sha256, two_phase), law, (seed_json, provision_count, *fingerprint) in render_seeds(
+                    documents, pool, max_in_flight, render, metrics):
+                if fingerprint:
+                    duplicates.add(law["id"], fingerprint[0])
+                entry = manifest_entry(text_sha256, law["id"], provision_count, seed_json, two_phase, split_parts)
+                writer.submit(store_seed, law["id"], nd, seed_json, entry)
+                laws_written += 1
+                total_provisions += provision_count
+                metrics.count("seeds_written")
+                metrics.count("provisions", provision_count)
+    finally:
+        if batches is not None:
+            batches.close()
 
     return census_entries, laws_written, total_provisions
 
 
+def ingest_file(
+    parquet_url: str, remote: bool, profile_path: Optional[str] = None, **kwargs
+) -> tuple[Optional[tuple], float, Optional[Exception]]:
+    """Run ingest_batch for one parquet file on its own DuckDB connection.
+
+    With profile_path, ingest_batch runs under cProfile and the stats are
+    dumped there (pstats format). Only this thread is profiled, not the
+    render worker processes.
+
+    Errors are returned rather than raised so one failed file does not stop
+    the others. Returns: (ingest_batch result or None, elapsed seconds, error)
+    """
+    start_time = time.time()
+    try:
+        con = connect_duckdb(remote)
+        profiler = cProfile.Profile() if profile_path else None
+        try:
+            if profiler is not None:
+                profiler.enable()
+            result = ingest_batch(con, parquet_url, **kwargs)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(profile_path)
+            con.close()
+        return result, time.time() - start_time, None
+    except Exception as e:
+        return None, time.time() - start_time, e
+
+
 def main():
+    if sys.argv[1:2] == ["merge"]:
+        merge_main(sys.argv[2:])
+        return
+
     import argparse
     parser = argparse.ArgumentParser(description="Ingest Russian Law from RusLawOD via DuckDB")
     parser.add_argument("--census-only", action="store_true", help="Only generate census")
-    parser.add_argument("--batch", type=int, help="Process only batch N (1-11)")
+    parser.add_argument("--batch", type=int,
+                        help="Process only batch N (1-11); law ids still come from the metadata of every file")
+    parser.add_argument("--shard", metavar="i/N",
+                        help="Parse only the documents of shard i of N (by pravogovruNd hash) and write a "
+                             "census slice; combine the N slices with the merge command")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for clean/parse/serialize (default: 1, serial)")
+    parser.add_argument("--fetch-batch-size", type=int, default=FETCH_BATCH_SIZE,
+                        help=f"Rows per Arrow record batch streamed from DuckDB (default: {FETCH_BATCH_SIZE})")
+    parser.add_argument("--source", metavar="DIR",
+                        help="Read ruslawod_NN.parquet from a local mirror instead of Hugging Face")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Parquet files ingested at once, each on its own connection (default: 1)")
+    parser.add_argument("--prefetch", type=int, default=PREFETCH_BATCHES,
+                        help="Record batches scanned ahead of parsing, also for the next file "
+                             f"(default: {PREFETCH_BATCHES}; 0: no read-ahead)")
+    parser.add_argument("--sqlite", metavar="PATH",
+                        help="Write the build-db.ts database directly instead of seed files")
+    parser.add_argument("--compress", action="store_true",
+                        help="With --sqlite: store provision text deflated against a dictionary trained "
+                             "on the corpus (like build-db.ts --compress)")
+    parser.add_argument("--seed-format", choices=("files", "shards"), default="files",
+                        help="Seeds as one JSON file per law, or compressed NDJSON shards (default: files)")
+    parser.add_argument("--seed-codec", choices=tuple(SHARD_SUFFIXES), default="zstd",
+                        help="Compression for --seed-format shards (default: zstd)")
+    parser.add_argument("--split-parts", action="store_true",
+                        help="Split articles into numbered parts and items (provision_ref like 149.3.2)")
+    parser.add_argument("--two-phase", action="store_true",
+                        help="Scan metadata first and fetch textIPS only for new or changed documents. A change "
+                             "is seen through the census entry and the textIPS row group's size and statistics, "
+                             "so an edit that keeps both is only picked up by the full text pass every "
+                             "--full-every runs")
+    parser.add_argument("--full-every", type=int, default=10, metavar="N",
+                        help="With --two-phase, read the text of every document again once it was skipped on "
+                             "its metadata alone in N-1 runs in a row (default: 10; 0 never does)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reuse the checkpoints of a failed run and retry only its unfinished files "
+                             "(with --sqlite only the id pre-pass is reused)")
+    parser.add_argument("--metrics-out", metavar="PATH",
+                        help="Write per-file stage timings and counters as JSON")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Dump a cProfile of the --batch file's ingestion (pstats format)")
+    parser.add_argument("--dedup-report", metavar="PATH",
+                        help="Write exact and MinHash near-duplicate provisions and laws among the "
+                             "documents parsed as JSON")
     args = parser.parse_args()
 
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.fetch_batch_size < 1:
+        parser.error("--fetch-batch-size must be at least 1")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.prefetch < 0:
+        parser.error("--prefetch must be at least 0")
+    if args.source and not Path(args.source).is_dir():
+        parser.error(f"--source directory not found: {args.source}")
+    if args.sqlite and args.census_only:
+        parser.error("--sqlite cannot be combined with --census-only")
+    if args.compress and not args.sqlite:
+        parser.error("--compress needs --sqlite (seeds are compressed by build-db.ts --compress)")
+    if args.seed_format == "shards" and (args.sqlite or args.census_only):
+        parser.error("--seed-format shards cannot be combined with --sqlite or --census-only")
+    if args.seed_format == "shards" and args.seed_codec == "zstd" and zstandard is None:
+        parser.error("zstandard not installed. Run: pip3 install zstandard (or use --seed-codec gzip)")
+    if args.two_phase and args.census_only:
+        parser.error("--two-phase cannot be combined with --census-only (which never reads textIPS)")
+    if args.full_every < 0:
+        parser.error("--full-every must be 0 or more")
+    if args.profile and not args.batch:
+        parser.error("--profile profiles a single file; combine it with --batch")
+    if args.dedup_report and args.census_only:
+        parser.error("--dedup-report cannot be combined with --census-only (which never reads textIPS)")
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.batch or args.sqlite or args.seed_format == "shards":
+            parser.error("--shard cannot be combined with --batch, --sqlite or --seed-format shards")
+
+    remote = not args.source
+
     print("=" * 70)
-    print("Russian Law MCP — RusLawOD Full Ingestion (DuckDB Remote)")
+    print(f"Russian Law MCP — RusLawOD Full Ingestion (DuckDB {'Remote' if remote else 'Local Mirror'})")
     print("=" * 70)
     print()
-    print("Strategy: DuckDB reads remote parquet files via HTTP range requests.")
+    if remote:
+        print("Strategy: DuckDB reads remote parquet files via HTTP range requests.")
+    else:
+        print(f"Strategy: DuckDB reads parquet files from local mirror {args.source}.")
     print("Only federal legislation rows and needed columns are transferred.")
     print()
 
     SEED_DIR.mkdir(parents=True, exist_ok=True)
 
-    con = duckdb.connect()
-    con.execute("SET http_timeout=120000")
-
-    files = PARQUET_FILES
-    if args.batch:
-        files = [PARQUET_FILES[args.batch - 1]]
+    # The id pre-pass reads every file, so a --batch run assigns the ids a full
+    # run would; only the selected file is parsed, written and reported
+    files = parquet_sources(args.source)
+    fnames = [url.split("/")[-1] for url in files]
+    selected = {fnames[args.batch - 1]} if args.batch else set(fnames)
+
+    # Checkpoints are only reused by a run with the same options
+    checkpoint_dir = SEED_DIR / (CHECKPOINTS_DIR_NAME + (shard_suffix(shard) if shard else ""))
+    run_options = {
+        "source": str(Path(args.source).resolve()) if args.source else "remote",
+        "files": fnames,
+        "batch": args.batch,
+        "census_only": args.census_only,
+        "output": "sqlite" if args.sqlite else args.seed_format,
+        "seed_codec": args.seed_codec if args.seed_format == "shards" else None,
+        "two_phase": args.two_phase,
+        "split_parts": args.split_parts,
+        "shard": args.shard,
+    }
+    if args.resume:
+        try:
+            checkpoints = load_checkpoints(checkpoint_dir, run_options)
+        except ValueError as e:
+            parser.error(f"cannot resume: {e}. Rerun without --resume to start over")
+        completed = sum(1 for checkpoint in checkpoints.values() if checkpoint["result"] is not None)
+        print(f"Resume: {len(checkpoints)}/{len(files)} files have a census checkpoint, {completed} are complete")
+        print()
+    else:
+        if checkpoint_dir.exists():
+            shutil.rmtree(checkpoint_dir)
+        checkpoints = {}
+
+    pool = None if args.census_only else make_render_pool(args.workers)
+    max_in_flight = args.workers * RENDER_CHUNKS_PER_WORKER
+
+    manifest = None
+    manifest_path = SEED_DIR / MANIFEST_NAME
+    db = None
+    if args.sqlite:
+        db = SqliteOutput(Path(args.sqlite), compress=args.compress)
+        print(f"Output: {args.sqlite} (all documents are parsed; seed files are not touched)")
+        print()
+    elif shard is not None and not args.census_only:
+        # A shard keeps its own manifest until merge; it starts from the shared one
+        manifest_path = SEED_DIR / f"_manifest{shard_suffix(shard)}.json"
+        if manifest_path.exists():
+            manifest = load_manifest(manifest_path)
+        else:
+            manifest = {nd: entry for nd, entry in load_manifest(SEED_DIR / MANIFEST_NAME).items()
+                        if nd_shard(nd, shard[1]) == shard[0]}
+        print(f"Manifest: {len(manifest)} documents of shard {args.shard} already ingested")
+        print()
+    elif not args.census_only:
+        manifest = load_manifest(manifest_path)
+        print(f"Manifest: {len(manifest)} documents already ingested")
+        print()
+        # The change set is measured from the manifest the first attempt started with
+        previous_manifest_path = checkpoint_dir / PREVIOUS_MANIFEST_NAME
+        if args.resume and previous_manifest_path.exists():
+            previous_manifest = json.loads(previous_manifest_path.read_text(encoding="utf-8"))
+        else:
+            previous_manifest = manifest
+            checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            previous_manifest_path.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+        previous_manifest = {nd: dict(entry) for nd, entry in previous_manifest.items()}
+
+    shards = None
+    if args.seed_format == "shards":
+        shards = SeedShards(SEED_DIR, args.seed_codec)
+    duplicates = DuplicateIndex() if args.dedup_report else None
+
+    def fail(failed: list[str]) -> None:
+        """Exit without a census after files failed; finished work stays checkpointed."""
+        if pool:
+            pool.shutdown()
+        if manifest is not None:
+            save_manifest(manifest_path, manifest)
+        if shards is not None:
+            shards.finish(keep_previous=True)
+        if db is not None:
+            db.discard()
+        print()
+        print(f"FAILED: {len(failed)}/{len(files)} files: {', '.join(failed)}")
+        print(f"  {CENSUS_PATH.name} was not written. Rerun with --resume to retry only the failed files.")
+        sys.exit(1)
 
     all_census = []
     total_laws = 0
     total_provs = 0
+    prepass_metrics = [IngestMetrics() for _ in files]
+    file_metrics = [IngestMetrics() for _ in files]
+    file_reports = []
+    if args.profile and pool is not None:
+        print("Note: --profile covers the ingesting thread only; parsing in --workers processes is not profiled.")
+        print()
+
+    # --concurrency files hold a slot at once; with --prefetch, one more
+    # file is already scanning while it waits for a slot.
+    file_slots = threading.Semaphore(args.concurrency)
+
+    def prepass_file(url: str, fname: str, metrics: IngestMetrics) -> tuple[Optional[tuple], float, Optional[Exception]]:
+        checkpoint = checkpoints.get(fname)
+        if checkpoint is not None:
+            return (checkpoint["census"], 0, 0), 0.0, None
+        with file_slots:
+            result, elapsed, error = ingest_file(
+                url, remote, profile_path=args.profile if args.census_only and fname in selected else None,
+                census_only=True, metrics=metrics, row_numbers=args.two_phase)
+        if error is None:
+            checkpoints[fname] = save_checkpoint(checkpoint_dir, run_options, fname, result[0])
+        return result, elapsed, error
+
+    run_start = time.time()
+    with ThreadPoolExecutor(max_workers=args.concurrency + (1 if args.prefetch else 0)) as executor:
+        # Pass 1: the census from the metadata columns alone, then final ids for every row.
+        # Ids depend on every file, so a file failing here stops the run.
+        prepass = list(executor.map(prepass_file, files, fnames, prepass_metrics))
+        failed = []
+        for fname, (_, elapsed, error) in zip(fnames, prepass):
+            if error is not None:
+                print(f"\n{fname}: census pre-pass ERROR ({elapsed:.1f}s): {error}")
+                traceback.print_exception(type(error), error, error.__traceback__)
+                failed.append(fname)
+        if failed:
+            fail(failed)
+        law_ids, collisions = assign_law_ids([result[0] for result, _, _ in prepass])
+        final_census = [
+            [dict({field: entry[field] for field in CENSUS_FIELDS}, id=final_id)
+             for entry, (_, final_id) in zip(result[0], file_ids) if final_id is not None]
+            for (result, _, _), file_ids in zip(prepass, law_ids)
+        ]
+        prepass_rows = [result[0] for result, _, _ in prepass]
+        full_census = [e for entries in final_census for e in entries]
+        if shard is not None:
+            # Ids are final; from here on only this shard's rows count
+            in_shard = [[nd_shard(entry["nd"], shard[1]) == shard[0] for entry in rows] for rows in prepass_rows]
+            prepass_rows = [[entry for entry, keep in zip(rows, flags) if keep]
+                            for rows, flags in zip(prepass_rows, in_shard)]
+            law_ids = [[ids for ids, keep in zip(file_ids, flags) if keep]
+                       for file_ids, flags in zip(law_ids, in_shard)]
+            final_census = [[e for e in entries if nd_shard(e["nd"], shard[1]) == shard[0]]
+                            for entries in final_census]
+
+        # Files completed by an earlier run are kept if all their seeds are still there
+        resumed = set()
+        for fname, entries in zip(fnames, final_census):
+            checkpoint = checkpoints[fname]
+            if args.census_only or checkpoint["result"] is None:
+                continue
+            if shards is not None:
+                intact = all(shards.has_previous(e["id"], e["nd"]) for e in entries)
+            else:
+                intact = all((SEED_DIR / f"{e['id']}.json").exists() for e in entries)
+            if not intact:
+                print(f"WARNING: seeds of {fname} are missing although it completed earlier; ingesting it again")
+                continue
+            if shards is not None:
+                for e in entries:
+                    shards.copy_previous(e["id"], e["nd"])
+            resumed.add(fname)
+
+        # Pass 2: parse and write every document once, under its final id
+        futures = [
+            None if args.census_only or fname in resumed or fname not in selected else executor.submit(
+                ingest_file, url, remote, profile_path=args.profile,
+                census_only=False, pool=pool, max_in_flight=max_in_flight,
+                fetch_batch_size=args.fetch_batch_size, manifest=manifest, db=db, shards=shards,
+                law_ids=file_ids, metrics=metrics, prepass=rows if args.two_phase else None,
+                split_parts=args.split_parts, prefetch=args.prefetch, slot=file_slots, shard=shard,
+                duplicates=duplicates, full_every=args.full_every,
+            )
+            for url, fname, rows, file_ids, metrics in zip(files, fnames, prepass_rows, law_ids, file_metrics)
+        ]
+
+        # Report and merge in file order, whatever order the files finish in
+        for i, (url, fname, future) in enumerate(zip(files, fnames, futures)):
+            if fname not in selected:
+                continue
+            checkpoint = checkpoints[fname]
+            if future is not None:
+                result, elapsed, error = future.result()
+            elif fname in resumed:
+                done = checkpoint["result"]
+                result, elapsed, error = (done["census"], done["laws_written"], done["provisions"]), 0.0, None
+            else:
+                result, elapsed, error = (final_census[i], 0, 0), prepass[i][1], None
+            print(f"\n[{i+1}/{len(files)}] {fname}")
+            print("-" * 50)
+            file_reports.append({
+                "file": fname,
+                "elapsed_seconds": round(elapsed, 3),
+                "error": None if error is None else f"{type(error).__name__}: {error}",
+                "resumed": fname in resumed,
+                "prepass": prepass_metrics[i].as_dict(),
+                "ingest": checkpoint["result"]["metrics"] if fname in resumed else file_metrics[i].as_dict(),
+            })
+
+            if error is not None:
+                print(f"  ERROR ({elapsed:.1f}s): {error}")
+                traceback.print_exception(type(error), error, error.__traceback__)
+                failed.append(fname)
+                continue
 
-    for i, url in enumerate(files):
-        fname = url.split("/")[-1]
-        print(f"\n[{i+1}/{len(files)}] {fname}")
-        print("-" * 50)
-
-        start_time = time.time()
-        try:
-            entries, written, provs = ingest_batch(con, url, census_only=args.census_only)
-            elapsed = time.time() - start_time
-
+            entries, written, provs = result
             all_census.extend(entries)
             total_laws += written
             total_provs += provs
@@ -475,79 +3273,62 @@ def main():
             print(f"  Federal legislation found: {len(entries)}")
             if not args.census_only:
                 print(f"  Laws written: {written}, Provisions: {provs}")
-            print(f"  Time: {elapsed:.1f}s")
-
-        except Exception as e:
-            elapsed = time.time() - start_time
-            print(f"  ERROR ({elapsed:.1f}s): {e}")
-            import traceback
-            traceback.print_exc()
-
-    con.close()
-
-    # Deduplicate census by ID (keep first occurrence)
-    seen_ids = {}
-    deduped_census = []
-    collisions = 0
-    for entry in all_census:
-        eid = entry["id"]
-        if eid in seen_ids:
-            # ID collision - check if it's a different document
-            existing = seen_ids[eid]
-            if existing["nd"] != entry["nd"]:
-                collisions += 1
-                # Create unique ID with nd suffix
-                new_id = f"{eid}-{entry['nd'][-6:]}"
-                entry["id"] = new_id
-                # Rename seed file if needed
-                old_path = SEED_DIR / f"{eid}.json"
-                new_path = SEED_DIR / f"{new_id}.json"
-                if old_path.exists() and not new_path.exists():
-                    data = json.loads(old_path.read_text(encoding="utf-8"))
-                    data["law"]["id"] = new_id
-                    new_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-                seen_ids[new_id] = entry
-                deduped_census.append(entry)
-        else:
-            seen_ids[eid] = entry
-            deduped_census.append(entry)
-
-    # Count stats
-    type_counts = {}
-    status_counts = {}
-    class_counts = {}
-    for e in deduped_census:
-        lt = e.get("law_type", "unknown")
-        type_counts[lt] = type_counts.get(lt, 0) + 1
-        st = e.get("status", "unknown")
-        status_counts[st] = status_counts.get(st, 0) + 1
-        cl = e.get("classification", "unknown")
-        class_counts[cl] = class_counts.get(cl, 0) + 1
-
-    # Write census.json
-    census_output = {
-        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        "source": "RusLawOD (irlspbru/RusLawOD) via pravo.gov.ru",
-        "description": "Full census of Russian Federation federal legislation",
-        "stats": {
-            "total": len(deduped_census),
-            **{f"type_{k}": v for k, v in sorted(type_counts.items())},
-            **{f"status_{k}": v for k, v in sorted(status_counts.items())},
-            **{f"class_{k}": v for k, v in sorted(class_counts.items())},
-            "id_collisions": collisions,
-        },
-        "laws": deduped_census,
-    }
-
+            if manifest is not None:
+                save_manifest(manifest_path, manifest)
+            if fname in resumed:
+                print("  Completed by an earlier run (resumed)")
+            else:
+                print(f"  Time: {elapsed:.1f}s")
+                # The database is one transaction, so its files never count as complete
+                if future is not None and db is None:
+                    save_checkpoint(checkpoint_dir, run_options, fname, checkpoint["census"], {
+                        "census": entries,
+                        "laws_written": written,
+                        "provisions": provs,
+                        "elapsed_seconds": round(elapsed, 3),
+                        "metrics": file_metrics[i].as_dict(),
+                    })
+
+    if failed:
+        fail(failed)
+    if pool:
+        pool.shutdown()
+    wall_seconds = time.time() - run_start
+    if len(selected) > 1:
+        print(f"\n  Wall time: {wall_seconds:.1f}s")
+
+    if db is not None:
+        db_laws, db_provisions = db.finish(all_census, latest_change_set_sequence(SEED_DIR))
+    if shards is not None:
+        shard_laws = shards.finish()
+
+    change_set_path = None
+    if manifest is not None and shard is None:
+        added, changed, removed, change_set_path = finish_manifest(
+            previous_manifest, manifest, all_census, not args.batch, manifest_path, seed_shards=shards is not None)
+
+    # Write census.json, census.parquet and census.sqlite
+    ingestion = None
     if not args.census_only:
-        census_output["ingestion"] = {
+        ingestion = {
             "completed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
             "total_laws": total_laws,
             "total_provisions": total_provs,
-            "coverage_pct": f"{(total_laws / max(len(deduped_census), 1)) * 100:.1f}",
+            "coverage_pct": f"{(total_laws / max(len(all_census), 1)) * 100:.1f}",
         }
-
-    CENSUS_PATH.write_text(json.dumps(census_output, ensure_ascii=False, indent=2), encoding="utf-8")
+    if shard is None:
+        stats = write_census(all_census, collisions, ingestion)
+    else:
+        # This shard's census slice instead; merge writes the census files
+        positions = {e["id"]: i for i, e in enumerate(full_census)}
+        slice_path = write_census_slice(shard, all_census, [positions[e["id"]] for e in all_census],
+                                        full_census, collisions, ingestion)
+        stats = census_stats(all_census, collisions)
+    type_counts, status_counts, class_counts = (
+        {k[len(prefix):]: v for k, v in stats.items() if k.startswith(prefix)}
+        for prefix in ("type_", "status_", "class_"))
+    if checkpoint_dir.exists():
+        shutil.rmtree(checkpoint_dir)
 
     # Count seed files
     seed_files = [f for f in SEED_DIR.glob("*.json") if not f.name.startswith("_")]
@@ -557,7 +3338,7 @@ def main():
     print("=" * 70)
     print("SUMMARY")
     print("=" * 70)
-    print(f"  Census entries: {len(deduped_census)}")
+    print(f"  Census entries: {len(all_census)}")
     if collisions:
         print(f"  ID collisions resolved: {collisions}")
     print(f"  By type:")
@@ -570,12 +3351,88 @@ def main():
     for k, v in sorted(class_counts.items()):
         print(f"    {k}: {v}")
 
-    if not args.census_only:
+    if db is not None:
+        print(f"\n  Database: {db_laws} laws, {db_provisions} provisions")
+    elif shards is not None:
+        print(f"\n  Seed shards: {len(shards.shards)} ({shard_laws} laws, {args.seed_codec})")
+        print(f"  Total provisions: {total_provs}")
+    elif not args.census_only:
         print(f"\n  Seed files: {len(list(seed_files))}")
         print(f"  Total provisions: {total_provs}")
-
-    print(f"\n  Census: {CENSUS_PATH}")
-    print(f"  Seeds:  {SEED_DIR}")
+    if manifest is not None and shard is None:
+        print(f"  Changes: {len(added)} added, {len(changed)} changed, {len(removed)} removed"
+              + (f" ({change_set_path.relative_to(SEED_DIR)})" if change_set_path else ""))
+
+    if args.metrics_out:
+        totals = IngestMetrics()
+        for fname, metrics in zip(fnames, file_metrics if not args.census_only else prepass_metrics):
+            if fname in selected:
+                totals.merge(metrics)
+        prepass_totals = IngestMetrics()
+        for metrics in prepass_metrics:
+            prepass_totals.merge(metrics)
+        metrics_output = {
+            "version": METRICS_VERSION,
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "options": {
+                "census_only": args.census_only,
+                "two_phase": args.two_phase,
+                "split_parts": args.split_parts,
+                "output": "sqlite" if db is not None else args.seed_format,
+                "workers": args.workers,
+                "concurrency": args.concurrency,
+                "prefetch": args.prefetch,
+                "fetch_batch_size": args.fetch_batch_size,
+                "shard": args.shard,
+                "source": args.source or "remote",
+            },
+            "wall_seconds": round(wall_seconds, 3),
+            "totals": totals.as_dict(),
+            "prepass": prepass_totals.as_dict(),
+            "files": file_reports,
+        }
+        metrics_path = Path(args.metrics_out)
+        metrics_path.parent.mkdir(parents=True, exist_ok=True)
+        metrics_path.write_text(json.dumps(metrics_output, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        print(f"\n  Stage seconds:")
+        for stage, seconds in totals.seconds.items():
+            if seconds:
+                print(f"    {stage}: {seconds:.2f}")
+        print(f"  Counters:")
+        for name, value in totals.counters.items():
+            print(f"    {name}: {value}")
+
+    if duplicates is not None:
+        dedup = duplicates.report()
+        dedup_path = Path(args.dedup_report)
+        dedup_path.parent.mkdir(parents=True, exist_ok=True)
+        dedup_path.write_text(json.dumps(dedup, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        exact = dedup["exact_duplicates"]
+        near = dedup["near_duplicates"]
+        print(f"\n  Duplicates among {dedup['provisions']} provisions parsed:")
+        print(f"    Exact: {exact['provisions']} provisions stored once "
+              f"({exact['content_bytes_saved'] / 1024:.1f} KB of {dedup['content_bytes'] / 1024:.1f} KB, "
+              f"{exact['fts_rows_saved']} FTS rows saved; {exact['laws_fully_duplicated']} laws entirely)")
+        print(f"    Near (similarity >= {near['similarity_threshold']}): "
+              f"{near['provision_pairs']} provision pairs, {near['law_pairs']} law pairs")
+
+    if shard is not None:
+        print(f"\n  Census slice: {slice_path}")
+    else:
+        print(f"\n  Census: {CENSUS_PATH}")
+        print(f"          {CENSUS_PATH.with_suffix('.parquet')}, {CENSUS_PATH.with_suffix('.sqlite')}")
+    if db is not None:
+        print(f"  Database: {args.sqlite}")
+    else:
+        print(f"  Seeds:  {SEED_DIR}")
+    if args.metrics_out:
+        print(f"  Metrics: {args.metrics_out}")
+    if args.dedup_report:
+        print(f"  Duplicates: {args.dedup_report}")
+    if args.profile:
+        print(f"  Profile: {args.profile}  (python3 -m pstats {args.profile})")
 
     ingestable = class_counts.get("ingestable", 0)
     if total_laws > 0 and total_laws >= ingestable:
@@ -584,8 +3441,14 @@ def main():
         print(f"\n  Coverage: {total_laws}/{ingestable} ({(total_laws/max(ingestable,1))*100:.1f}%)")
 
     print("\nNext steps:")
-    print("  1. npm run build:db     # Build SQLite database")
-    print("  2. npm test             # Run tests")
+    if shard is not None:
+        print(f"  1. Run the other shards of {shard[1]}, then: python3 scripts/ingest-ruslawod.py merge")
+        print("  2. npm run build:db     # Build SQLite database")
+    elif db is None:
+        print("  1. npm run build:db     # Build SQLite database")
+        print("  2. npm test             # Run tests")
+    else:
+        print("  1. npm test             # Run tests")
     print()
 
 
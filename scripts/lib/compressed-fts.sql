@@ -0,0 +1,30 @@
+-- provisions_fts of a compressed database (build-db.ts --compress, ingest-ruslawod.py --compress).
+-- Both load the provisions with the FTS sync triggers dropped, so schema.sql's provisions_fts
+-- stays empty, then run this once content_z and content_stemmed_z are stored.
+--
+-- The index reads the text through the provisions_text view, which decompresses it with
+-- provision_text(blob): a function every connection reading the text registers
+-- (registerProvisionText in src/utils/provision-text.ts, register_provision_text in
+-- ingest-ruslawod.py). snippet(), 'rebuild' and 'integrity-check' then work as on a plain
+-- database. To rebuild the index, register the function and run
+-- INSERT INTO provisions_fts(provisions_fts) VALUES('rebuild').
+-- Statements are split at each semicolon, so comments must not contain one.
+-- There are no sync triggers: a compressed database is only ever built in full.
+
+DROP TABLE provisions_fts;
+
+CREATE VIEW provisions_text AS
+    SELECT id, provision_text(content_z) AS content, title, article,
+           provision_text(content_stemmed_z) AS content_stemmed
+    FROM provisions
+    WHERE duplicate_of IS NULL;
+
+CREATE VIRTUAL TABLE provisions_fts USING fts5(
+    content, title, article, content_stemmed,
+    content='provisions_text',
+    content_rowid='id',
+    tokenize='unicode61'
+);
+
+INSERT INTO provisions_fts(provisions_fts) VALUES('rebuild');
+INSERT INTO provisions_fts(provisions_fts) VALUES('optimize');
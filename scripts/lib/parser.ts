@@ -42,12 +42,12 @@ export interface LawMetadata {
 // Russian article/section patterns
 // ─────────────────────────────────────────────────────────────────────────────
 
-// Match "Статья N." or "Статья N.N." (main article marker)
-// Allows multiple spaces between "Статья" and the number (pravo.gov.ru formatting)
-const ARTICLE_PATTERN = /^\s*Статья\s+(\d+(?:\.\d+)?)\.\s*(.*)/;
-
-// Match "Статья N" followed by a period or title text on the same line
-const ARTICLE_PATTERN_ALT = /^\s*Статья\s+(\d+(?:\.\d+)?)\b[\.\s]*(.*)/;
+// Match an article heading on a trimmed line. The first alternative is
+// "Статья N." / "Статья N.N." (main article marker), the second "Статья N"
+// followed by a period or title text; they are tried in that order.
+// Allows multiple spaces between "Статья" and the number (pravo.gov.ru formatting).
+// Mirrors ARTICLE_HEADING_PATTERN in ingest-ruslawod.py.
+const ARTICLE_HEADING_PATTERN = /^Статья\s+(?:(\d+(?:\.\d+)?)\.\s*(.*)|(\d+(?:\.\d+)?)\b[\.\s]*(.*))/;
 
 // Match chapter/section/part headings (for context, not provisions)
 const CHAPTER_PATTERN = /^\s*(Глава|Раздел|Часть|Подраздел)\s+[\dIVXLCDM]+/i;
@@ -55,6 +55,11 @@ const CHAPTER_PATTERN = /^\s*(Глава|Раздел|Часть|Подразд
 // Match "Приложение" (Appendix) — skip these
 const APPENDIX_PATTERN = /^\s*Приложение\b/i;
 
+// First characters (of a trimmed line) that can start an appendix or a
+// chapter heading; other lines skip those regexes entirely.
+const APPENDIX_FIRST_CHARS = new Set(['П', 'п']);
+const CHAPTER_FIRST_CHARS = new Set(['Г', 'г', 'Р', 'р', 'Ч', 'ч', 'П', 'п']);
+
 // ─────────────────────────────────────────────────────────────────────────────
 // HTML Parser
 // ─────────────────────────────────────────────────────────────────────────────
@@ -170,35 +175,35 @@ export function parseRussianText(text: string): ParsedProvision[] {
       continue;
     }
 
+    // Only lines starting with "С" can be article headings
+    const first = line[0];
+    const articleMatch = first === 'С' ? line.match(ARTICLE_HEADING_PATTERN) : null;
+
     // Skip appendices
-    if (APPENDIX_PATTERN.test(line)) {
+    if (!articleMatch && APPENDIX_FIRST_CHARS.has(first) && APPENDIX_PATTERN.test(line)) {
       inAppendix = true;
       flushArticle();
       continue;
     }
 
-    // Skip if we're in appendix section
+    // Skip if we're in appendix section, until a new article starts
+    // (could be in a different part after appendix)
     if (inAppendix) {
-      // Check if we hit a new article (could be in a different part after appendix)
-      const newArticle = line.match(ARTICLE_PATTERN) || line.match(ARTICLE_PATTERN_ALT);
-      if (newArticle) {
+      if (articleMatch) {
         inAppendix = false;
       } else {
         continue;
       }
     }
 
-    // Check for article start
-    const articleMatch = line.match(ARTICLE_PATTERN) || line.match(ARTICLE_PATTERN_ALT);
-
     if (articleMatch) {
       // Flush previous article
       flushArticle();
 
-      currentArticleNum = articleMatch[1];
+      currentArticleNum = articleMatch[1] ?? articleMatch[3];
 
       // The rest of the line after "Статья N." may be the title
-      const restOfLine = articleMatch[2].trim();
+      const restOfLine = (articleMatch[1] !== undefined ? articleMatch[2] : articleMatch[4]).trim();
       if (restOfLine) {
         // If the rest is short and doesn't look like body text, it's likely a title
         if (restOfLine.length < 200 && !restOfLine.match(/^\d+\.\s/)) {
@@ -212,7 +217,7 @@ export function parseRussianText(text: string): ParsedProvision[] {
     }
 
     // Skip chapter/section headings (they're structural, not article content)
-    if (CHAPTER_PATTERN.test(line)) {
+    if (CHAPTER_FIRST_CHARS.has(first) && CHAPTER_PATTERN.test(line)) {
       // Don't flush - the heading is just a structural marker
       continue;
     }
@@ -239,18 +244,22 @@ export function parseRussianText(text: string): ParsedProvision[] {
   flushArticle();
 
   // Deduplicate: if the same article number appears multiple times,
-  // merge them (keep the one with more content, or concatenate)
+  // merge them (concatenate, skipping verbatim repeats of text already merged)
   const seen = new Map<string, number>();
+  const chunks: Array<Set<string>> = [];
   const deduped: ParsedProvision[] = [];
 
   for (const prov of provisions) {
     const existing = seen.get(prov.article);
     if (existing !== undefined) {
       // Merge: append content of duplicate to the first occurrence
-      const existingProv = deduped[existing];
-      existingProv.content += '\n\n' + prov.content;
+      if (!chunks[existing].has(prov.content)) {
+        chunks[existing].add(prov.content);
+        deduped[existing].content += '\n\n' + prov.content;
+      }
     } else {
       seen.set(prov.article, deduped.length);
+      chunks.push(new Set([prov.content]));
       deduped.push({ ...prov });
     }
   }
@@ -0,0 +1,66 @@
+/**
+ * Compressed provision text, written by build-db.ts --compress.
+ *
+ * Each provision's content is stored as raw deflate against a preset
+ * dictionary trained on the corpus: the lines and words repeated most
+ * across provisions, best last (deflate only looks back 32 KB, and the
+ * end of the dictionary is closest to the data). Deflate rather than zstd,
+ * because the server reads the text with the zlib of any supported
+ * Node.js release (src/utils/provision-text.ts). scripts/ingest-ruslawod.py
+ * (train_dictionary, --sqlite --compress) trains the same way.
+ */
+
+import * as zlib from 'zlib';
+
+/** The deflate window: bytes of dictionary a compressed provision can refer to. */
+export const DICTIONARY_SIZE = 32 * 1024;
+/** Provision text read to train the dictionary; larger corpora are sampled evenly. */
+export const DICTIONARY_SAMPLE_BYTES = 16 * 1024 * 1024;
+
+const DICTIONARY_CANDIDATES = 20_000;
+const MIN_LINE_BYTES = 16;
+const MIN_WORD_LENGTH = 5;
+const WORD_PATTERN = /[\p{L}\p{N}]+/gu;
+
+/** The preset dictionary for a sample of provision contents. */
+export function trainDictionary(samples: Iterable<string>): Buffer {
+  const counts = new Map<string, number>();
+  const add = (segment: string) => counts.set(segment, (counts.get(segment) ?? 0) + 1);
+  for (const text of samples) {
+    for (const line of text.split('\n')) {
+      const trimmed = line.trim();
+      if (Buffer.byteLength(trimmed) >= MIN_LINE_BYTES) {
+        add(trimmed);
+      }
+    }
+    for (const word of text.match(WORD_PATTERN) ?? []) {
+      if (word.length >= MIN_WORD_LENGTH) {
+        add(word);
+      }
+    }
+  }
+
+  // A segment seen n times saves about (n - 1) copies of itself
+  const candidates = [...counts]
+    .filter(([, count]) => count > 1)
+    .map(([segment, count]) => ({ segment, bytes: Buffer.byteLength(segment), score: (count - 1) * Buffer.byteLength(segment) }))
+    .sort((a, b) => b.score - a.score || (a.segment < b.segment ? -1 : a.segment > b.segment ? 1 : 0))
+    .slice(0, DICTIONARY_CANDIDATES);
+
+  const chosen: string[] = [];
+  let chosenText = '';
+  let size = 0;
+  for (const { segment, bytes } of candidates) {
+    if (size + bytes + 1 > DICTIONARY_SIZE || chosenText.includes(segment)) {
+      continue;
+    }
+    chosen.push(segment);
+    chosenText = chosenText ? `${chosenText}\n${segment}` : segment;
+    size += bytes + 1;
+  }
+  return Buffer.from(chosen.reverse().join('\n'), 'utf-8');
+}
+
+export function compressProvisionText(text: string, dictionary: Buffer): Buffer {
+  return zlib.deflateRawSync(Buffer.from(text, 'utf-8'), { level: 9, dictionary });
+}
@@ -0,0 +1,18 @@
+/**
+ * Normalized provision fingerprint, shared by build-db.ts and drift-detect.ts.
+ *
+ * The text is whitespace-collapsed and lowercased before hashing, so
+ * formatting-only changes do not count as drift. scripts/ingest-ruslawod.py
+ * (normalized_sha256) computes the same hash for every provision it parses;
+ * it is stored in provisions.normalized_sha256 and indexed.
+ */
+
+import { createHash } from 'crypto';
+
+export function normalizeText(text: string): string {
+  return text.replace(/\s+/g, ' ').trim().toLowerCase();
+}
+
+export function normalizedSha256(text: string): string {
+  return createHash('sha256').update(normalizeText(text)).digest('hex');
+}
@@ -0,0 +1,139 @@
+-- Laws (federal laws, codes, presidential decrees, government resolutions)
+CREATE TABLE laws (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    title_en TEXT,
+    identifier TEXT NOT NULL,
+    law_type TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'in_force',
+    effective_date TEXT,
+    publication_date TEXT,
+    source_url TEXT,
+    last_amended TEXT,
+    last_updated TEXT,
+    description TEXT,
+    provision_count INTEGER DEFAULT 0
+);
+
+-- Individual provisions (articles, parts, paragraphs)
+CREATE TABLE provisions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    law_id TEXT NOT NULL REFERENCES laws(id),
+    article TEXT NOT NULL,
+    title TEXT,
+    content TEXT NOT NULL,
+    part TEXT,
+    paragraph TEXT,
+    provision_ref TEXT,
+    order_index INTEGER NOT NULL DEFAULT 0,
+    metadata TEXT,
+    -- SHA-256 of the whitespace-collapsed, lowercased content (drift-detect.ts normalizeText)
+    normalized_sha256 TEXT,
+    -- Snowball stems of title and content, space-separated (src/utils/stemmer-ru.ts)
+    content_stemmed TEXT,
+    -- Exact duplicates (same title and content as an earlier provision) are stored once:
+    -- the id of the provision holding the text, with content '' and no FTS row here
+    duplicate_of INTEGER REFERENCES provisions(id),
+    -- build-db.ts --compress / ingest-ruslawod.py --compress: content and content_stemmed,
+    -- raw deflate against content_dictionary, which are then empty (compressed-fts.sql)
+    content_z BLOB,
+    content_stemmed_z BLOB
+);
+
+-- Unique index for deduplication (expressions allowed in CREATE INDEX)
+CREATE UNIQUE INDEX idx_provisions_unique
+    ON provisions(law_id, article, COALESCE(part, ''), COALESCE(paragraph, ''));
+
+-- FTS5 for provision search; content_stemmed is matched with exact stemmed terms.
+-- Only provisions holding their own text are indexed (duplicate_of IS NULL).
+CREATE VIRTUAL TABLE provisions_fts USING fts5(
+    content, title, article, content_stemmed,
+    content='provisions',
+    content_rowid='rowid',
+    tokenize='unicode61'
+);
+
+-- FTS sync triggers
+CREATE TRIGGER provisions_ai AFTER INSERT ON provisions WHEN new.duplicate_of IS NULL BEGIN
+    INSERT INTO provisions_fts(rowid, content, title, article, content_stemmed)
+    VALUES (new.rowid, new.content, new.title, new.article, new.content_stemmed);
+END;
+CREATE TRIGGER provisions_ad AFTER DELETE ON provisions WHEN old.duplicate_of IS NULL BEGIN
+    INSERT INTO provisions_fts(provisions_fts, rowid, content, title, article, content_stemmed)
+    VALUES ('delete', old.rowid, old.content, old.title, old.article, old.content_stemmed);
+END;
+CREATE TRIGGER provisions_au AFTER UPDATE ON provisions BEGIN
+    INSERT INTO provisions_fts(provisions_fts, rowid, content, title, article, content_stemmed)
+    SELECT 'delete', old.rowid, old.content, old.title, old.article, old.content_stemmed
+    WHERE old.duplicate_of IS NULL;
+    INSERT INTO provisions_fts(rowid, content, title, article, content_stemmed)
+    SELECT new.rowid, new.content, new.title, new.article, new.content_stemmed
+    WHERE new.duplicate_of IS NULL;
+END;
+
+-- EU documents (directives and regulations referenced by Russian law)
+CREATE TABLE IF NOT EXISTS eu_documents (
+    id TEXT PRIMARY KEY,
+    document_type TEXT NOT NULL,
+    document_number TEXT,
+    title TEXT NOT NULL,
+    short_title TEXT,
+    celex TEXT,
+    year INTEGER,
+    community TEXT DEFAULT 'EU',
+    in_force INTEGER DEFAULT 1,
+    source_url TEXT
+);
+
+-- EU references linking Russian law provisions to EU directives/regulations
+CREATE TABLE eu_references (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    law_id TEXT NOT NULL REFERENCES laws(id),
+    provision_id INTEGER REFERENCES provisions(id),
+    eu_directive TEXT,
+    eu_regulation TEXT,
+    eu_article TEXT,
+    reference_type TEXT
+);
+
+-- Cross-references between provisions/laws
+CREATE TABLE cross_references (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_law_id TEXT NOT NULL REFERENCES laws(id),
+    source_provision_ref TEXT,
+    target_law_id TEXT NOT NULL,
+    target_provision_ref TEXT,
+    ref_type TEXT DEFAULT 'reference'
+);
+
+-- <ref> links whose target document is not in the census (yet), by its nd;
+-- build-db.ts --apply moves them to cross_references once the census has it
+CREATE TABLE unresolved_references (
+    source_law_id TEXT NOT NULL REFERENCES laws(id),
+    source_provision_ref TEXT,
+    nd TEXT NOT NULL
+);
+
+-- Preset dictionary for provisions.content_z, trained on the corpus (one row, compressed databases only)
+CREATE TABLE content_dictionary (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    dictionary BLOB NOT NULL
+);
+
+-- Build metadata (tier, schema version, build timestamp)
+CREATE TABLE db_metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Indexes
+CREATE INDEX idx_provisions_law_id ON provisions(law_id);
+CREATE INDEX idx_provisions_article ON provisions(article);
+CREATE INDEX idx_provisions_ref ON provisions(provision_ref);
+CREATE INDEX idx_provisions_normalized_sha256 ON provisions(normalized_sha256);
+CREATE INDEX idx_provisions_duplicate_of ON provisions(duplicate_of) WHERE duplicate_of IS NOT NULL;
+CREATE INDEX idx_eu_references_law_id ON eu_references(law_id);
+CREATE INDEX idx_cross_refs_source ON cross_references(source_law_id);
+CREATE INDEX idx_cross_refs_target ON cross_references(target_law_id);
+CREATE INDEX idx_unresolved_refs_source ON unresolved_references(source_law_id);
+CREATE INDEX idx_unresolved_refs_nd ON unresolved_references(nd);
@@ -6,8 +6,10 @@
  */
 
 import type { Database } from '@ansvar/mcp-sqlite';
-import { buildFtsQueryVariants } from '../utils/fts-query.js';
+import { buildFtsQueryVariants, hasStemmedSearch } from '../utils/fts-query.js';
 import { generateResponseMetadata, type ToolResponse } from '../utils/metadata.js';
+import { ftsHitJoins } from '../utils/provision-duplicates.js';
+import { useFtsText } from '../utils/provision-text.js';
 
 export interface BuildLegalStanceInput {
   query: string;
@@ -45,10 +47,20 @@ export async function buildLegalStance(
   }
 
   const limit = Math.min(Math.max(input.limit ?? DEFAULT_LIMIT, 1), MAX_LIMIT);
-  const queryVariants = buildFtsQueryVariants(input.query);
+  const queryVariants = buildFtsQueryVariants(input.query, { stemmed: hasStemmedSearch(db) });
+  // Compressed databases: snippet() reads the text through provision_text()
+  useFtsText(db);
+
+  const conditions: string[] = [];
+  const provParams: (string | number)[] = [];
+
+  if (input.document_id) {
+    conditions.push('p.law_id = ?');
+    provParams.push(input.document_id);
+  }
 
   // Search provisions
-  let provSql = `
+  const provSql = `
     SELECT
       p.law_id as document_id,
       l.title as document_title,
@@ -56,24 +68,13 @@ export async function buildLegalStance(
       p.title,
       snippet(provisions_fts, 0, '>>>', '<<<', '...', 32) as snippet,
       bm25(provisions_fts) as relevance
-    FROM provisions_fts
-    JOIN provisions p ON p.id = provisions_fts.rowid
-    JOIN laws l ON l.id = p.law_id
+    FROM provisions_fts${ftsHitJoins(db, conditions)}
     WHERE provisions_fts MATCH ?
+    ORDER BY relevance LIMIT ?
   `;
 
-  const provParams: (string | number)[] = [];
-
-  if (input.document_id) {
-    provSql += ` AND p.law_id = ?`;
-    provParams.push(input.document_id);
-  }
-
-  provSql += ` ORDER BY relevance LIMIT ?`;
-  provParams.push(limit);
-
   const runProvisionQuery = (ftsQuery: string): ProvisionHit[] => {
-    const bound = [ftsQuery, ...provParams];
+    const bound = [...provParams, ftsQuery, limit];
     return db.prepare(provSql).all(...bound) as ProvisionHit[];
   };
 
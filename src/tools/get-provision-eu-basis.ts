@@ -4,6 +4,7 @@
 
 import type { Database } from '@ansvar/mcp-sqlite';
 import { generateResponseMetadata, type ToolResponse } from '../utils/metadata.js';
+import { provisionTextColumns, withProvisionText } from '../utils/provision-text.js';
 
 export interface GetProvisionEUBasisInput {
   document_id: string;
@@ -47,13 +48,12 @@ export async function getProvisionEUBasis(
   }
 
   // Check if provision exists
-  const provision = db.prepare(`
-    SELECT id, content
-    FROM provisions
-    WHERE law_id = ? AND provision_ref = ?
-  `).get(input.document_id, input.provision_ref) as
-    | { id: number; content: string }
-    | undefined;
+  const [provision] = withProvisionText(db, db.prepare(`
+    SELECT p.id, ${provisionTextColumns(db)}
+    FROM provisions p
+    WHERE p.law_id = ? AND p.provision_ref = ?
+    LIMIT 1
+  `).all(input.document_id, input.provision_ref) as Array<{ id: number; content: string }>);
 
   if (!provision) {
     throw new Error(
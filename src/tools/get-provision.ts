@@ -4,12 +4,15 @@
 
 import type { Database } from '@ansvar/mcp-sqlite';
 import { generateResponseMetadata, type ToolResponse } from '../utils/metadata.js';
+import { provisionTextColumns, withProvisionText } from '../utils/provision-text.js';
 
 export interface GetProvisionInput {
   document_id: string;
   chapter?: string;
   section?: string;
   provision_ref?: string;
+  part?: string;
+  paragraph?: string;
 }
 
 export interface ProvisionResult {
@@ -19,9 +22,13 @@ export interface ProvisionResult {
   provision_ref: string;
   chapter: string | null;
   section: string;
+  part: string | null;
+  paragraph: string | null;
   title: string | null;
   content: string;
   metadata: Record<string, unknown> | null;
+  /** provision_refs of the rows joined into content (a split article or part); empty for a single row */
+  parts: string[];
   cross_references: CrossRefResult[];
 }
 
@@ -38,11 +45,30 @@ interface ProvisionRow {
   provision_ref: string;
   chapter: string | null;
   section: string;
+  part: string | null;
+  paragraph: string | null;
   title: string | null;
   content: string;
   metadata: string | null;
 }
 
+/**
+ * Exact duplicates get the text of the provision they duplicate; compressed
+ * text is filled in by withProvisionText().
+ */
+const provisionColumns = (db: Database): string => `
+      p.law_id as document_id,
+      l.title as document_title,
+      l.status as document_status,
+      p.provision_ref,
+      p.article as chapter,
+      p.article as section,
+      p.part,
+      p.paragraph,
+      p.title,
+      ${provisionTextColumns(db)},
+      p.metadata`;
+
 export async function getProvision(
   db: Database,
   input: GetProvisionInput
@@ -73,69 +99,144 @@ export async function getProvision(
     };
   }
 
-  const sql = `
-    SELECT
-      p.law_id as document_id,
-      l.title as document_title,
-      l.status as document_status,
-      p.provision_ref,
-      p.article as chapter,
-      p.article as section,
-      p.title,
-      p.content,
-      p.metadata
-    FROM provisions p
-    JOIN laws l ON l.id = p.law_id
-    WHERE p.law_id = ? AND p.provision_ref = ?
-  `;
-  const row = db.prepare(sql).get(input.document_id, provisionRef) as ProvisionRow | undefined;
+  const rows = withProvisionText(db, findProvisionRows(db, input.document_id, provisionRef, input.part, input.paragraph));
 
-  if (!row) {
+  if (rows.length === 0) {
     return {
       results: null,
       _metadata: generateResponseMetadata(db)
     };
   }
 
-  const crossRefs = db.prepare(`
-    SELECT target_law_id as target_document_id, target_provision_ref, ref_type
-    FROM cross_references
-    WHERE source_law_id = ? AND (source_provision_ref = ? OR source_provision_ref IS NULL)
-  `).all(input.document_id, provisionRef) as CrossRefResult[];
-
+  const row = joinProvisionRows(rows);
   return {
     results: {
       ...row,
       metadata: row.metadata ? JSON.parse(row.metadata) : null,
-      cross_references: crossRefs,
+      parts: rows.length > 1 ? rows.map(r => r.provision_ref) : [],
+      cross_references: getCrossReferences(db, input.document_id, row),
     },
     _metadata: generateResponseMetadata(db)
   };
 }
 
+/**
+ * One provision from the rows of a split article or part, in document order.
+ *
+ * The parts and items of a --split-parts article are the article's lines
+ * cut at their markers, so joining them with newlines gives the article
+ * text back; provision_ref, part and paragraph name what was looked up.
+ */
+function joinProvisionRows(rows: ProvisionRow[]): ProvisionRow {
+  const [first] = rows;
+  if (rows.length === 1) {
+    return first;
+  }
+  const part = rows.every(r => r.part !== null && r.part === first.part) ? first.part : null;
+  return {
+    ...first,
+    provision_ref: part === null ? first.section : `${first.section}.${part.replace(/\./g, '-')}`,
+    part,
+    paragraph: null,
+    content: rows.map(r => r.content).join('\n'),
+  };
+}
+
+/**
+ * Resolve a provision lookup to rows in document order.
+ *
+ * Databases built with --split-parts hold an article as several rows (its
+ * parts and items, provision_ref like "149.3.2"). part/paragraph select
+ * within the article given by section or provision_ref; an article number
+ * alone resolves to every row of the article, and a part (by part or by
+ * its provision_ref) to the part with its items. getProvision() joins them
+ * into one provision.
+ */
+function findProvisionRows(
+  db: Database,
+  documentId: string,
+  provisionRef: string,
+  part?: string,
+  paragraph?: string
+): ProvisionRow[] {
+  const from = `
+    FROM provisions p
+    JOIN laws l ON l.id = p.law_id`;
+
+  if (part || paragraph) {
+    const conditions = ['p.law_id = ?', 'p.article = ?'];
+    const params: string[] = [documentId, provisionRef];
+    if (part) {
+      conditions.push('p.part = ?');
+      params.push(part);
+    }
+    if (paragraph) {
+      conditions.push(part ? 'p.paragraph = ?' : 'p.part IS NULL AND p.paragraph = ?');
+      params.push(paragraph);
+    }
+    return db.prepare(`
+      SELECT ${provisionColumns(db)} ${from}
+      WHERE ${conditions.join(' AND ')}
+      ORDER BY p.order_index
+    `).all(...params) as ProvisionRow[];
+  }
+
+  const articleRows = db.prepare(`
+    SELECT ${provisionColumns(db)} ${from}
+    WHERE p.law_id = ? AND p.article = ?
+    ORDER BY p.order_index
+  `).all(documentId, provisionRef) as ProvisionRow[];
+  if (articleRows.length > 0) {
+    return articleRows;
+  }
+
+  // A dotted ref can name an article ("5.1") or a part of one; prefer the
+  // longest article number, as whole articles are matched above.
+  const row = db.prepare(`
+    SELECT ${provisionColumns(db)} ${from}
+    WHERE p.law_id = ? AND p.provision_ref = ?
+    ORDER BY length(p.article) DESC
+    LIMIT 1
+  `).get(documentId, provisionRef) as ProvisionRow | undefined;
+  if (!row) {
+    return [];
+  }
+  if (row.part === null || row.paragraph !== null) {
+    return [row];
+  }
+
+  return db.prepare(`
+    SELECT ${provisionColumns(db)} ${from}
+    WHERE p.law_id = ? AND p.article = ? AND p.part = ?
+    ORDER BY p.order_index
+  `).all(documentId, row.section, row.part) as ProvisionRow[];
+}
+
+/** References made by a provision; those of a split article are recorded against the article. */
+function getCrossReferences(db: Database, documentId: string, row: ProvisionRow): CrossRefResult[] {
+  return db.prepare(`
+    SELECT target_law_id as target_document_id, target_provision_ref, ref_type
+    FROM cross_references
+    WHERE source_law_id = ? AND (source_provision_ref IN (?, ?) OR source_provision_ref IS NULL)
+    ORDER BY id
+  `).all(documentId, row.provision_ref, row.section) as CrossRefResult[];
+}
+
 function getAllProvisions(db: Database, documentId: string, limit?: number): ProvisionResult[] {
   const sql = `
-    SELECT
-      p.law_id as document_id,
-      l.title as document_title,
-      l.status as document_status,
-      p.provision_ref,
-      p.article as chapter,
-      p.article as section,
-      p.title,
-      p.content,
-      p.metadata
+    SELECT ${provisionColumns(db)}
     FROM provisions p
     JOIN laws l ON l.id = p.law_id
     WHERE p.law_id = ?
     ORDER BY p.id
     ${limit ? 'LIMIT ?' : ''}
   `;
-  const rows = db.prepare(sql).all(...[documentId, ...(limit ? [limit] : [])]) as ProvisionRow[];
+  const rows = withProvisionText(db, db.prepare(sql).all(...[documentId, ...(limit ? [limit] : [])]) as ProvisionRow[]);
 
   return rows.map(row => ({
     ...row,
     metadata: row.metadata ? JSON.parse(row.metadata) : null,
+    parts: [],
     cross_references: [],
   }));
 }
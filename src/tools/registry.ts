@@ -73,6 +73,8 @@ export const TOOLS: Tool[] = [
         chapter: { type: 'string', description: 'Chapter number (e.g., "3").' },
         section: { type: 'string', description: 'Section/article number (e.g., "5")' },
         provision_ref: { type: 'string', description: 'Direct provision reference. Alternative to chapter+section.' },
+        part: { type: 'string', description: 'Part number within the article (e.g., "3"). Needs section or provision_ref.' },
+        paragraph: { type: 'string', description: 'Item number or letter within the part (e.g., "2" or "а"). Needs section or provision_ref.' },
       },
       required: ['document_id'],
     },
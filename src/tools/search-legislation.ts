@@ -3,8 +3,10 @@
  */
 
 import type { Database } from '@ansvar/mcp-sqlite';
-import { buildFtsQueryVariants } from '../utils/fts-query.js';
+import { buildFtsQueryVariants, hasStemmedSearch } from '../utils/fts-query.js';
 import { generateResponseMetadata, type ToolResponse } from '../utils/metadata.js';
+import { ftsHitJoins } from '../utils/provision-duplicates.js';
+import { useFtsText } from '../utils/provision-text.js';
 
 export interface SearchLegislationInput {
   query: string;
@@ -39,11 +41,24 @@ export async function searchLegislation(
   }
 
   const limit = Math.min(Math.max(input.limit ?? DEFAULT_LIMIT, 1), MAX_LIMIT);
-  const queryVariants = buildFtsQueryVariants(input.query);
+  const queryVariants = buildFtsQueryVariants(input.query, { stemmed: hasStemmedSearch(db) });
+  // Compressed databases: snippet() reads the text through provision_text()
+  useFtsText(db);
 
+  const conditions: string[] = [];
   const params: (string | number)[] = [];
 
-  let sql = `
+  if (input.document_id) {
+    conditions.push('p.law_id = ?');
+    params.push(input.document_id);
+  }
+
+  if (input.status) {
+    conditions.push('l.status = ?');
+    params.push(input.status);
+  }
+
+  const sql = `
     SELECT
       p.law_id as document_id,
       l.title as document_title,
@@ -53,27 +68,13 @@ export async function searchLegislation(
       p.title,
       snippet(provisions_fts, 0, '>>>', '<<<', '...', 32) as snippet,
       bm25(provisions_fts) as relevance
-    FROM provisions_fts
-    JOIN provisions p ON p.id = provisions_fts.rowid
-    JOIN laws l ON l.id = p.law_id
+    FROM provisions_fts${ftsHitJoins(db, conditions)}
     WHERE provisions_fts MATCH ?
+    ORDER BY relevance LIMIT ?
   `;
 
-  if (input.document_id) {
-    sql += ` AND p.law_id = ?`;
-    params.push(input.document_id);
-  }
-
-  if (input.status) {
-    sql += ` AND l.status = ?`;
-    params.push(input.status);
-  }
-
-  sql += ` ORDER BY relevance LIMIT ?`;
-  params.push(limit);
-
   const runQuery = (ftsQuery: string): SearchLegislationResult[] => {
-    const bound = [ftsQuery, ...params];
+    const bound = [...params, ftsQuery, limit];
     return db.prepare(sql).all(...bound) as SearchLegislationResult[];
   };
 
@@ -2,10 +2,15 @@
  * Utilities for building robust FTS5 queries from natural-language input.
  *
  * If the user provides explicit FTS syntax (quotes, boolean operators, wildcards),
- * we preserve it. Otherwise we convert tokens to prefix terms so inflections like
- * "make" -> "maken" can match.
+ * we preserve it. Otherwise, on databases with the provisions_fts.content_stemmed
+ * column, each token is stemmed the way the ingester stemmed the provision text
+ * and matched as an exact term. Older databases fall back to prefix terms so
+ * inflections like "make" -> "maken" can match.
  */
 
+import type { Database } from '@ansvar/mcp-sqlite';
+import { stemText } from './stemmer-ru.js';
+
 const EXPLICIT_FTS_SYNTAX_PATTERN = /["*():^]|\bAND\b|\bOR\b|\bNOT\b/iu;
 
 function sanitizeToken(token: string): string {
@@ -31,12 +36,27 @@ function buildPrefixOrQuery(tokens: string[]): string {
   return tokens.map(token => `${token}*`).join(' OR ');
 }
 
+/**
+ * Stemmed term for one token. The exact form is ORed in against the content
+ * column so snippet() still highlights the words the user typed.
+ */
+function buildStemmedTerm(token: string): string {
+  const stems = stemText(token).split(' ').map(stem => `"${stem}"`);
+  const stemmed = stems.length === 1 ? stems[0] : `(${stems.join(' ')})`;
+  return `(content_stemmed : ${stemmed} OR content : "${token}")`;
+}
+
 export interface FtsQueryVariants {
   primary: string;
   fallback?: string;
 }
 
-export function buildFtsQueryVariants(query: string): FtsQueryVariants {
+export interface FtsQueryOptions {
+  /** Match stems against provisions_fts.content_stemmed instead of prefix terms. */
+  stemmed?: boolean;
+}
+
+export function buildFtsQueryVariants(query: string, options: FtsQueryOptions = {}): FtsQueryVariants {
   const trimmed = query.trim();
   if (!trimmed) {
     return { primary: '' };
@@ -51,6 +71,16 @@ export function buildFtsQueryVariants(query: string): FtsQueryVariants {
     return { primary: escapeExplicitQuery(trimmed) };
   }
 
+  if (options.stemmed) {
+    const terms = tokens.filter(token => stemText(token)).map(buildStemmedTerm);
+    if (terms.length === 0) {
+      return { primary: escapeExplicitQuery(trimmed) };
+    }
+    return terms.length === 1
+      ? { primary: terms[0] }
+      : { primary: terms.join(' AND '), fallback: terms.join(' OR ') };
+  }
+
   const primary = buildPrefixAndQuery(tokens);
   if (tokens.length === 1) {
     return { primary };
@@ -61,3 +91,20 @@ export function buildFtsQueryVariants(query: string): FtsQueryVariants {
     fallback: buildPrefixOrQuery(tokens),
   };
 }
+
+const stemmedSearchSupport = new WeakMap<Database, boolean>();
+
+/**
+ * Whether provisions_fts has the content_stemmed column (databases built from
+ * ingest-ruslawod.py seeds since it started stemming). Cached per connection.
+ */
+export function hasStemmedSearch(db: Database): boolean {
+  let supported = stemmedSearchSupport.get(db);
+  if (supported === undefined) {
+    supported = db.prepare(
+      "SELECT 1 FROM pragma_table_info('provisions_fts') WHERE name = 'content_stemmed'"
+    ).get() !== undefined;
+    stemmedSearchSupport.set(db, supported);
+  }
+  return supported;
+}
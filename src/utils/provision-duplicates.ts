@@ -0,0 +1,54 @@
+/**
+ * SQL for databases that store exact duplicate provisions once.
+ *
+ * scripts/build-db.ts stores a provision with the same title and content as
+ * an earlier one with content '' and provisions.duplicate_of pointing at the
+ * provision holding the text; only that provision has a provisions_fts row.
+ * Databases built before the column existed get the plain SQL.
+ */
+
+import type { Database } from '@ansvar/mcp-sqlite';
+
+const duplicateLinkSupport = new WeakMap<Database, boolean>();
+
+/** Whether provisions has the duplicate_of column. Cached per connection. */
+export function hasDuplicateLinks(db: Database): boolean {
+  let supported = duplicateLinkSupport.get(db);
+  if (supported === undefined) {
+    supported = db.prepare(
+      "SELECT 1 FROM pragma_table_info('provisions') WHERE name = 'duplicate_of'"
+    ).get() !== undefined;
+    duplicateLinkSupport.set(db, supported);
+  }
+  return supported;
+}
+
+/** Expression for the text of provision alias: its own, or that of the provision it duplicates. */
+export function provisionContentSql(db: Database, alias = 'p'): string {
+  return hasDuplicateLinks(db)
+    ? `COALESCE((SELECT o.content FROM provisions o WHERE o.id = ${alias}.duplicate_of), ${alias}.content)`
+    : `${alias}.content`;
+}
+
+/**
+ * Joins from provisions_fts to the provision (p) and law (l) of each hit.
+ *
+ * conditions are filters on p and l; their parameters come before the
+ * MATCH parameter. A hit on a provision with duplicates stands for all of
+ * them: it is reported once, as the first of them that passes conditions,
+ * so the same article is not returned once per law restating it.
+ */
+export function ftsHitJoins(db: Database, conditions: string[] = []): string {
+  if (!hasDuplicateLinks(db)) {
+    return `
+    JOIN provisions p ON p.id = provisions_fts.rowid
+    JOIN laws l ON l.id = p.law_id${conditions.map(condition => ` AND ${condition}`).join('')}`;
+  }
+  return `
+    JOIN provisions p ON p.id = (
+      SELECT p.id FROM provisions p JOIN laws l ON l.id = p.law_id
+      WHERE (p.id = provisions_fts.rowid OR p.duplicate_of = provisions_fts.rowid)${conditions.map(condition => ` AND ${condition}`).join('')}
+      ORDER BY p.id LIMIT 1
+    )
+    JOIN laws l ON l.id = p.law_id`;
+}
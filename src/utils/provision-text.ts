@@ -0,0 +1,150 @@
+/**
+ * Provision text of databases built with build-db.ts --compress.
+ *
+ * Those keep each provision's content and content_stemmed as raw deflate
+ * against the preset dictionary in content_dictionary (provisions.content_z,
+ * content_stemmed_z), with the plain columns left empty. provisions_fts reads
+ * the text through the provisions_text view (scripts/lib/compressed-fts.sql),
+ * which decompresses it with the provision_text() SQL function: a connection
+ * searching the index registers it with useFtsText(), and snippet() works as
+ * usual. get_provision decompresses here, keeping a small LRU cache of texts
+ * per connection. Uncompressed databases get the plain SQL.
+ */
+
+import type { Database } from '@ansvar/mcp-sqlite';
+import { inflateRawSync } from 'zlib';
+import { provisionContentSql } from './provision-duplicates.js';
+
+/** Decompressed provision texts kept per connection. */
+export const PROVISION_TEXT_CACHE_SIZE = 256;
+
+interface TextStore {
+  dictionary: Uint8Array;
+  cache: Map<number, string>;
+}
+
+const textStores = new WeakMap<Database, TextStore | null>();
+
+function textStore(db: Database): TextStore | null {
+  let store = textStores.get(db);
+  if (store === undefined) {
+    store = null;
+    const hasTable = db.prepare(
+      "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'content_dictionary'"
+    ).get() !== undefined;
+    if (hasTable) {
+      const row = db.prepare('SELECT dictionary FROM content_dictionary WHERE id = 1').get() as
+        { dictionary: Uint8Array } | undefined;
+      if (row) {
+        store = { dictionary: row.dictionary, cache: new Map() };
+      }
+    }
+    textStores.set(db, store);
+  }
+  return store;
+}
+
+/** Whether provision content is stored compressed. Cached per connection. */
+export function hasCompressedText(db: Database): boolean {
+  return textStore(db) !== null;
+}
+
+export function inflateProvisionText(compressed: Uint8Array, dictionary: Uint8Array): string {
+  return inflateRawSync(compressed, { dictionary }).toString('utf-8');
+}
+
+/**
+ * Columns for the text of provision alias: its content, or in compressed
+ * databases an empty content and the id of the provision holding the text
+ * (text_id), which withProvisionText() turns into the content.
+ */
+export function provisionTextColumns(db: Database, alias = 'p'): string {
+  if (!hasCompressedText(db)) {
+    return `${provisionContentSql(db, alias)} as content`;
+  }
+  return `'' as content, COALESCE(${alias}.duplicate_of, ${alias}.id) as text_id`;
+}
+
+/** The decompressed content of the provision with id, which must hold its text. */
+export function provisionText(db: Database, id: number): string {
+  const store = textStore(db);
+  if (!store) {
+    throw new Error('provision text is not compressed in this database');
+  }
+  const cached = store.cache.get(id);
+  if (cached !== undefined) {
+    // Most recently used last
+    store.cache.delete(id);
+    store.cache.set(id, cached);
+    return cached;
+  }
+
+  const row = db.prepare('SELECT content, content_z FROM provisions WHERE id = ?').get(id) as
+    { content: string; content_z: Uint8Array | null } | undefined;
+  const text = row?.content_z ? inflateProvisionText(row.content_z, store.dictionary) : row?.content ?? '';
+  store.cache.set(id, text);
+  if (store.cache.size > PROVISION_TEXT_CACHE_SIZE) {
+    store.cache.delete(store.cache.keys().next().value as number);
+  }
+  return text;
+}
+
+/** Rows selected with provisionTextColumns(), with their content filled in and text_id dropped. */
+export function withProvisionText<T extends { content: string }>(db: Database, rows: T[]): T[] {
+  if (!hasCompressedText(db)) {
+    return rows;
+  }
+  return rows.map(row => {
+    const { text_id: textId, ...rest } = row as T & { text_id: number };
+    return { ...rest, content: provisionText(db, textId) } as unknown as T;
+  });
+}
+
+/** The SQL function the provisions_text view decompresses with. */
+export const PROVISION_TEXT_FUNCTION = 'provision_text';
+
+/**
+ * A connection that can register SQL functions. db.function(name, fn) is
+ * the call both better-sqlite3 (the builders) and node-sqlite3-wasm (under
+ * @ansvar/mcp-sqlite, the server) take: the options argument sits before fn
+ * in one and after it in the other, so it is left out. The argument count
+ * is taken from fn.length in both.
+ */
+interface FunctionRegistry {
+  function(name: string, fn: (data: Uint8Array | null) => string | null): unknown;
+}
+
+/**
+ * Register provision_text(blob) on a connection: the text of a content_z or
+ * content_stemmed_z value, NULL for NULL. Throws when the SQLite driver
+ * cannot register functions.
+ */
+export function registerProvisionText(db: object, dictionary: Uint8Array): void {
+  const registry = db as Partial<FunctionRegistry>;
+  if (typeof registry.function !== 'function') {
+    throw new Error(
+      `Searching a database built with --compress needs the SQL function ${PROVISION_TEXT_FUNCTION}(), ` +
+      'and this SQLite driver cannot register functions. Build the database without --compress.'
+    );
+  }
+  registry.function(PROVISION_TEXT_FUNCTION, (data: Uint8Array | null) =>
+    data === null ? null : inflateProvisionText(data, dictionary)
+  );
+}
+
+const ftsTextReady = new WeakSet<Database>();
+
+/**
+ * Make provisions_fts readable on this connection before snippet() is
+ * used: in compressed databases, registers provision_text() once.
+ */
+export function useFtsText(db: Database): void {
+  if (ftsTextReady.has(db)) {
+    return;
+  }
+  const store = textStore(db);
+  if (store) {
+    registerProvisionText(db, store.dictionary);
+  }
+  ftsTextReady.add(db);
+}
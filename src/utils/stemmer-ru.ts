@@ -0,0 +1,125 @@
+/**
+ * Snowball Russian stemmer (snowballstem.org/algorithms/russian).
+ *
+ * A port of stem_ru/stem_text in scripts/ingest-ruslawod.py, which fills
+ * provisions.content_stemmed at ingest time. Search queries must be stemmed
+ * exactly the same way or stemmed terms stop matching; both sides are tested
+ * against fixtures/stemmer-ru.json.
+ */
+
+const VOWELS = new Set('аеиоуыэюя');
+
+/** Ending -> group: 1 needs а or я before it, 2 does not. */
+interface EndingTable {
+  endings: Map<string, number>;
+  lengths: number[];
+}
+
+function endingTable(group1: string, group2 = ''): EndingTable {
+  const endings = new Map<string, number>();
+  for (const ending of group1.split(' ').filter(Boolean)) endings.set(ending, 1);
+  for (const ending of group2.split(' ').filter(Boolean)) endings.set(ending, 2);
+  const lengths = [...new Set([...endings.keys()].map(e => e.length))].sort((a, b) => b - a);
+  return { endings, lengths };
+}
+
+const PERFECTIVE_GERUND = endingTable('в вши вшись', 'ив ивши ившись ыв ывши ывшись');
+const ADJECTIVE = endingTable('', 'ее ие ые ое ими ыми ей ий ый ой ем им ым ом его ого ему ому их ых ую юю ая яя ою ею');
+const PARTICIPLE = endingTable('ем нн вш ющ щ', 'ивш ывш ующ');
+const REFLEXIVE = endingTable('', 'ся сь');
+const VERB = endingTable(
+  'ла на ете йте ли й л ем н ло но ет ют ны ть ешь нно',
+  'ила ыла ена ейте уйте ите или ыли ей уй ил ыл им ым ен ило ыло ено ят ует уют ит ыт ены ить ыть ишь ую ю',
+);
+const NOUN = endingTable(
+  '',
+  'а ев ов ие ье е иями ями ами еи ии и ией ей ой ий й иям ям ием ем ам ом о у ах иях ях ы ь ию ью ю ия ья я',
+);
+const DERIVATIONAL = endingTable('', 'ост ость');
+const TIDY_UP = endingTable('', 'ейш ейше н ь');
+
+/** Length of the longest ending of word inside RV, or 0. */
+function findEnding(word: string, rv: number, table: EndingTable): number {
+  for (const n of table.lengths) {
+    const start = word.length - n;
+    if (start < rv) continue;
+    const group = table.endings.get(word.slice(start));
+    if (group !== undefined) {
+      if (group === 1 && (start - 1 < rv || !'ая'.includes(word[start - 1]))) {
+        return 0;
+      }
+      return n;
+    }
+  }
+  return 0;
+}
+
+/** Snowball Russian stem of a lowercase word; other words come back unchanged. */
+export function stemRu(input: string): string {
+  let word = input.replace(/ё/g, 'е');
+  // RV: after the first vowel. R2: after the second vowel/non-vowel pair past RV's start.
+  let r2 = word.length;
+  let i = 0;
+  while (i < word.length && !VOWELS.has(word[i])) i++;
+  if (i === word.length) return word;
+  const rv = i + 1;
+  let state = 0;
+  for (i = rv; i < word.length; i++) {
+    if (VOWELS.has(word[i]) === (state === 1)) {
+      state++;
+      if (state === 3) {
+        r2 = i + 1;
+        break;
+      }
+    }
+  }
+
+  // Step 1
+  let n = findEnding(word, rv, PERFECTIVE_GERUND);
+  if (n) {
+    word = word.slice(0, -n);
+  } else {
+    n = findEnding(word, rv, REFLEXIVE);
+    if (n) word = word.slice(0, -n);
+    n = findEnding(word, rv, ADJECTIVE);
+    if (n) {
+      word = word.slice(0, -n);
+      n = findEnding(word, rv, PARTICIPLE);
+      if (n) word = word.slice(0, -n);
+    } else {
+      n = findEnding(word, rv, VERB) || findEnding(word, rv, NOUN);
+      if (n) word = word.slice(0, -n);
+    }
+  }
+
+  // Step 2
+  if (word.endsWith('и') && word.length - 1 >= rv) {
+    word = word.slice(0, -1);
+  }
+
+  // Step 3
+  n = findEnding(word, rv, DERIVATIONAL);
+  if (n && word.length - n >= r2) {
+    word = word.slice(0, -n);
+  }
+
+  // Step 4
+  n = findEnding(word, rv, TIDY_UP);
+  if (n === 1 && word.endsWith('ь')) {
+    word = word.slice(0, -1);
+  } else if (n) {
+    if (n > 1) word = word.slice(0, -n);
+    if (word.endsWith('нн') && word.length - 2 >= rv) {
+      word = word.slice(0, -1);
+    }
+  }
+  return word;
+}
+
+/** Tokens as the FTS5 unicode61 tokenizer sees them: runs of letters and digits. */
+const TOKEN_PATTERN = /[\p{L}\p{N}]+/gu;
+
+/** text as space-separated, lowercased stems, like provisions.content_stemmed. */
+export function stemText(text: string): string {
+  return (text.toLowerCase().match(TOKEN_PATTERN) ?? []).map(stemRu).join(' ');
+}